@@ -0,0 +1,84 @@
+"""Measure the normalization stage on mostly-normalized text.
+
+Before the stage was unified, a text could be normalized twice (by the caller
+and by the word tokenizer). Now it is normalized once by ``normalize_nfkc``,
+which skips ASCII-only texts. The corpus is normalized beforehand except for
+``--raw-ratio`` of the texts, and ASCII-only texts are mixed in.
+
+    $ python benchmarks/bench_normalize.py
+    $ python benchmarks/bench_normalize.py --raw-ratio 0.5 --repeat 10
+"""
+import argparse
+import os
+import random
+import sys
+import time
+import unicodedata
+from typing import Callable, Dict, List
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), os.pardir, "src"))
+
+from jptranstokenizer.mainword.base import normalize_nfkc  # noqa: E402
+
+DEFAULT_CORPUS: str = os.path.join(os.path.dirname(__file__), "data", "corpus.txt")
+
+
+def make_texts(corpus: str, raw_ratio: float, ascii_ratio: float) -> List[str]:
+    """Mix normalized, raw and ASCII-only texts with a fixed seed."""
+    rng: random.Random = random.Random(0)
+    with open(corpus, "r", encoding="utf-8") as f:
+        lines: List[str] = [line.rstrip("\n") for line in f if line.strip()]
+    texts: List[str] = []
+    for line in lines:
+        value: float = rng.random()
+        if value < ascii_ratio:
+            texts.append(f"GET /api/v2/items?id={rng.randrange(10**6)} HTTP/1.1 200")
+        elif value < ascii_ratio + raw_ratio:
+            texts.append(line)
+        else:
+            texts.append(unicodedata.normalize("NFKC", line))
+    return texts
+
+
+def measure(func: Callable[[str], str], texts: List[str], repeat: int) -> float:
+    """Return the best seconds of normalizing all the texts."""
+    best: float = float("inf")
+    for _ in range(repeat):
+        start: float = time.perf_counter()
+        for text in texts:
+            func(text)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--corpus", default=DEFAULT_CORPUS)
+    parser.add_argument("--raw-ratio", type=float, default=0.1)
+    parser.add_argument("--ascii-ratio", type=float, default=0.3)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    texts: List[str] = make_texts(args.corpus, args.raw_ratio, args.ascii_ratio)
+    funcs: Dict[str, Callable[[str], str]] = {
+        "twice (before)": lambda text: unicodedata.normalize(
+            "NFKC", unicodedata.normalize("NFKC", text)
+        ),
+        "unicodedata.normalize": lambda text: unicodedata.normalize("NFKC", text),
+        "normalize_nfkc": normalize_nfkc,
+    }
+    results: Dict[str, float] = {
+        name: measure(func, texts, args.repeat) for name, func in funcs.items()
+    }
+    baseline: float = results["twice (before)"]
+    print(f"{len(texts)} texts, raw {args.raw_ratio:.0%}, ascii {args.ascii_ratio:.0%}")
+    for name, seconds in results.items():
+        print(
+            f"{name:<24}{seconds * 1e6 / len(texts):8.2f} us/text"
+            f"{baseline / seconds:8.2f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
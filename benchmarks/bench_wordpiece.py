@@ -0,0 +1,90 @@
+"""Compare WordPiece of transformers and the trie-based one of jptranstokenizer.
+
+Words are the whitespace-separated pieces of the corpus, random katakana
+loanwords and random alphanumeric runs, where the greedy longest-match loop
+of transformers is slowest. Both give the same tokens.
+
+    $ python benchmarks/bench_wordpiece.py --vocab path/to/vocab.txt
+"""
+import argparse
+import os
+import random
+import sys
+import time
+from typing import Callable, Dict, List
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), os.pardir, "src"))
+
+from transformers.models.bert.tokenization_bert import load_vocab  # noqa: E402
+from transformers.models.bert_japanese import tokenization_bert_japanese  # noqa: E402
+
+from jptranstokenizer.subword import WordpieceTokenizer  # noqa: E402
+
+DEFAULT_CORPUS: str = os.path.join(os.path.dirname(__file__), "data", "corpus.txt")
+DEFAULT_VOCAB: str = os.path.join(
+    os.path.dirname(__file__), os.pardir, "tests", "data", "wordpiece", "vocab.txt"
+)
+KATAKANA: str = "アイウエオカキクケコサシスセソタチツテトナニヌネノハヒフヘホマミムメモヤユヨラリルレロワンー"
+ALNUM: str = "abcdefghijklmnopqrstuvwxyz0123456789"
+
+
+def make_words(corpus: str, num_random: int) -> Dict[str, List[str]]:
+    """Return words of each kind with a fixed seed."""
+    rng: random.Random = random.Random(0)
+    with open(corpus, "r", encoding="utf-8") as f:
+        words: List[str] = f.read().split()
+    return {
+        "corpus": words,
+        "katakana": [
+            "".join(rng.choice(KATAKANA) for _ in range(rng.randint(5, 30)))
+            for _ in range(num_random)
+        ],
+        "alnum": [
+            "".join(rng.choice(ALNUM) for _ in range(rng.randint(10, 90)))
+            for _ in range(num_random)
+        ],
+    }
+
+
+def measure(func: Callable[[str], List[str]], words: List[str], repeat: int) -> float:
+    """Return the best seconds of tokenizing all the words."""
+    best: float = float("inf")
+    for _ in range(repeat):
+        start: float = time.perf_counter()
+        for word in words:
+            func(word)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--corpus", default=DEFAULT_CORPUS)
+    parser.add_argument("--vocab", default=DEFAULT_VOCAB)
+    parser.add_argument("--num-random", type=int, default=2000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+    vocab: Dict[str, int] = load_vocab(args.vocab)
+    start: float = time.perf_counter()
+    tokenizer = WordpieceTokenizer(vocab=vocab, unk_token="[UNK]")
+    print(f"Built tries of {len(vocab)} tokens in {time.perf_counter() - start:.3f}s")
+    original = tokenization_bert_japanese.WordpieceTokenizer(
+        vocab=vocab, unk_token="[UNK]"
+    )
+    for kind, words in make_words(args.corpus, args.num_random).items():
+        assert [tokenizer.tokenize(word) for word in words] == [
+            original.tokenize(word) for word in words
+        ]
+        before: float = measure(original.tokenize, words, args.repeat)
+        after: float = measure(tokenizer.tokenize, words, args.repeat)
+        print(
+            f"{kind:<10}{len(words):8d} words"
+            f"{before * 1e6 / len(words):10.2f} us{after * 1e6 / len(words):10.2f} us"
+            f"{before / after:8.2f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+"""Load test of ``jptranstokenizer serve``.
+
+Each of ``--concurrency`` clients keeps a connection alive and sends texts of
+the corpus one by one (or ``--texts-per-request`` at once) to the server, and
+the throughput and the latency of the requests are reported.
+
+    $ jptranstokenizer serve cl-tohoku/bert-base-japanese --unix-socket /tmp/jtt.sock
+    $ python benchmarks/load_test.py --unix-socket /tmp/jtt.sock --concurrency 64
+    $ python benchmarks/load_test.py --port 8000 --endpoint tokenize --deadline-ms 100
+"""
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+DEFAULT_CORPUS: str = os.path.join(os.path.dirname(__file__), "data", "corpus.txt")
+
+
+async def open_connection(
+    args: argparse.Namespace,
+) -> Tuple[asyncio.StreamReader, asyncio.StreamWriter]:
+    if args.unix_socket is not None:
+        return await asyncio.open_unix_connection(args.unix_socket)
+    return await asyncio.open_connection(args.host, args.port)
+
+
+async def post(
+    reader: asyncio.StreamReader,
+    writer: asyncio.StreamWriter,
+    path: str,
+    body: Dict[str, Any],
+) -> int:
+    """Send a request on the kept-alive connection and return the status."""
+    data: bytes = json.dumps(body, ensure_ascii=False).encode("utf-8")
+    writer.write(
+        f"POST {path} HTTP/1.1\r\nContent-Length: {len(data)}\r\n\r\n".encode("latin-1")
+        + data
+    )
+    await writer.drain()
+    status: int = int((await reader.readline()).split(b" ")[1])
+    length: int = 0
+    while True:
+        line: bytes = await reader.readline()
+        if line in (b"\r\n", b""):
+            break
+        name, _, value = line.decode("latin-1").partition(":")
+        if name.lower() == "content-length":
+            length = int(value)
+    await reader.readexactly(length)
+    return status
+
+
+async def client(
+    args: argparse.Namespace,
+    requests: "asyncio.Queue[List[str]]",
+    latencies: List[float],
+    statuses: Dict[int, int],
+) -> None:
+    reader, writer = await open_connection(args)
+    try:
+        while not requests.empty():
+            texts: List[str] = requests.get_nowait()
+            body: Dict[str, Any] = {"texts": texts}
+            if args.deadline_ms is not None:
+                body["deadline_ms"] = args.deadline_ms
+            start: float = time.perf_counter()
+            status: int = await post(reader, writer, f"/{args.endpoint}", body)
+            latencies.append(time.perf_counter() - start)
+            statuses[status] = statuses.get(status, 0) + 1
+    finally:
+        writer.close()
+
+
+async def run(args: argparse.Namespace, texts: List[str]) -> Dict[str, Any]:
+    requests: "asyncio.Queue[List[str]]" = asyncio.Queue()
+    for i in range(
+        0, args.num_requests * args.texts_per_request, args.texts_per_request
+    ):
+        requests.put_nowait(
+            [texts[(i + j) % len(texts)] for j in range(args.texts_per_request)]
+        )
+    latencies: List[float] = []
+    statuses: Dict[int, int] = {}
+    start: float = time.perf_counter()
+    await asyncio.gather(
+        *[client(args, requests, latencies, statuses) for _ in range(args.concurrency)]
+    )
+    seconds: float = time.perf_counter() - start
+    latencies.sort()
+    return {
+        "requests_per_sec": len(latencies) / seconds,
+        "texts_per_sec": len(latencies) * args.texts_per_request / seconds,
+        "latency_ms": {
+            "p50": latencies[len(latencies) // 2] * 1000,
+            "p99": latencies[min(int(len(latencies) * 0.99), len(latencies) - 1)]
+            * 1000,
+            "mean": statistics.mean(latencies) * 1000,
+        },
+        "statuses": statuses,
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--unix-socket")
+    parser.add_argument("--endpoint", choices=["encode", "tokenize"], default="encode")
+    parser.add_argument("--corpus", default=DEFAULT_CORPUS)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--num-requests", type=int, default=2000)
+    parser.add_argument("--texts-per-request", type=int, default=1)
+    parser.add_argument("--deadline-ms", type=float)
+    args = parser.parse_args(argv)
+    with open(args.corpus, "r", encoding="utf-8") as f:
+        texts: List[str] = [line.rstrip("\n") for line in f if line.strip()]
+    print(json.dumps(asyncio.run(run(args, texts)), indent=2))
+
+
+if __name__ == "__main__":
+    main()
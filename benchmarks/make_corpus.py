@@ -0,0 +1,111 @@
+"""Generate the synthetic Japanese corpus bundled for benchmarks.
+
+The corpus is made from templates with a fixed seed, so it is reproducible
+and free of licensing issues. It mixes kanji, hiragana, katakana, half-width
+katakana, full-width and ASCII alphanumerics, and numbers with commas, and
+the lengths of documents range from a phrase to a few paragraphs.
+
+    $ python benchmarks/make_corpus.py -o benchmarks/data/corpus.txt
+"""
+import argparse
+import random
+from typing import List
+
+SUBJECTS: List[str] = [
+    "私",
+    "彼女",
+    "日本銀行",
+    "東京都",
+    "研究チーム",
+    "外国人観光客",
+    "政府",
+    "新しい委員会",
+    "その会社",
+    "地元の住民",
+    "ソフトウェアエンジニア",
+    "ｶｽﾀﾏｰｻﾎﾟｰﾄ",
+    "ＡＩ研究所",
+]
+OBJECTS: List[str] = [
+    "自然言語処理のモデル",
+    "金融政策",
+    "参政権",
+    "新しいスマートフォン",
+    "天気予報",
+    "データベース",
+    "トークナイザー",
+    "ﾃﾞｰﾀｾﾝﾀｰ",
+    "国際会議の資料",
+    "形態素解析",
+    "京都の寺院",
+    "Pythonのライブラリ",
+    "ＧＰＵクラスタ",
+]
+PLACES: List[str] = ["東京", "大阪の本社", "北海道", "オンライン", "会議室", "ニューヨーク", "研究所", "駅前の喫茶店"]
+VERBS: List[str] = [
+    "発表しました",
+    "検討している",
+    "利用する予定です",
+    "評価した",
+    "公開されました",
+    "改善しなければならない",
+    "導入したいと考えています",
+    "分析している",
+]
+CONNECTIVES: List[str] = ["また、", "しかし、", "さらに、", "一方で、", "その結果、", ""]
+ASCII_WORDS: List[str] = [
+    "BERT",
+    "tokenizer",
+    "API",
+    "GitHub",
+    "version 2.0",
+    "https://example.com",
+    "CPU",
+]
+
+
+def make_sentence(rng: random.Random) -> str:
+    """Make a sentence from templates."""
+    template: int = rng.randrange(6)
+    subject: str = rng.choice(SUBJECTS)
+    obj: str = rng.choice(OBJECTS)
+    place: str = rng.choice(PLACES)
+    verb: str = rng.choice(VERBS)
+    number: str = f"{rng.randrange(1, 10**rng.randrange(2, 9)):,}"
+    if template == 0:
+        sentence = f"{subject}は{place}で{obj}を{verb}。"
+    elif template == 1:
+        sentence = f"{rng.randrange(1990, 2030)}年{rng.randrange(1, 13)}月{rng.randrange(1, 29)}日、{subject}が{obj}について{verb}。"
+    elif template == 2:
+        sentence = f"{obj}の市場規模は{number}円に達し、{subject}も{verb}。"
+    elif template == 3:
+        sentence = f"「{obj}は{rng.choice(ASCII_WORDS)}を使って{verb}」と{subject}は述べた。"
+    elif template == 4:
+        sentence = f"{subject}によると、{place}では約{number}人が{obj}を{verb}という。"
+    else:
+        sentence = f"{obj}（{rng.choice(ASCII_WORDS)}）を{place}で{verb}か？"
+    return rng.choice(CONNECTIVES) + sentence
+
+
+def make_document(rng: random.Random) -> str:
+    """Make a document whose length follows a long-tailed distribution.
+    Documents are kept within the input limit of Juman++ (4,096 bytes).
+    """
+    num_sentences: int = min(int(rng.paretovariate(1.2)), 12)
+    return "".join(make_sentence(rng) for _ in range(num_sentences))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("-o", "--output", required=True)
+    parser.add_argument("-n", "--num-documents", type=int, default=1000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    rng: random.Random = random.Random(args.seed)
+    with open(args.output, "w", encoding="utf-8") as f:
+        for _ in range(args.num_documents):
+            f.write(make_document(rng) + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,423 @@
+"""Benchmark tokenizers for every combination of word and subword tokenizers offline.
+
+Vocabularies (WordPiece, character and sentencepiece) are generated from the corpus,
+and the configurations in ``PUBLIC_AVAILABLE_SETTING_MAP`` are reproduced with them,
+so no file is downloaded. Each case runs in a fresh process and reports
+tokens/sec, p50/p99 latency per call, peak RSS and startup time.
+
+    $ python benchmarks/run_benchmarks.py -o results.json
+    $ python benchmarks/run_benchmarks.py -o new.json --compare results.json
+"""
+import argparse
+import collections
+import hashlib
+import itertools
+import json
+import os
+import platform
+import resource
+import statistics
+import subprocess
+import sys
+import time
+import unicodedata
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+BENCHMARK_DIR: str = os.path.dirname(os.path.abspath(__file__))
+SRC_DIR: str = os.path.join(os.path.dirname(BENCHMARK_DIR), "src")
+DEFAULT_CORPUS: str = os.path.join(BENCHMARK_DIR, "data", "corpus.txt")
+
+WORD_TOKENIZER_TYPES: List[str] = ["mecab", "juman", "sudachi", "none"]
+SUBWORD_TOKENIZER_TYPES: List[str] = ["wordpiece", "sentencepiece", "character"]
+SPECIAL_TOKENS: List[str] = ["[PAD]", "[UNK]", "[CLS]", "[SEP]", "[MASK]"]
+
+
+def read_corpus(path: str, num_texts: Optional[int] = None) -> List[str]:
+    with open(path, encoding="utf-8") as f:
+        texts: List[str] = [line.rstrip("\n") for line in f if line.strip()]
+    return texts if num_texts is None else texts[:num_texts]
+
+
+def build_resources(corpus: str, work_dir: str, vocab_size: int) -> Dict[str, str]:
+    """Generate vocabulary files from the corpus.
+    Files are reused while the corpus and *vocab_size* are unchanged.
+
+    Returns:
+        ``Dict[str, str]``: Paths of ``"wordpiece"``, ``"character"`` and ``"sentencepiece"``.
+    """
+    with open(corpus, "rb") as f:
+        digest: str = hashlib.sha1(f.read()).hexdigest()[:12]
+    resource_dir: str = os.path.join(work_dir, f"{digest}-{vocab_size}")
+    paths: Dict[str, str] = {
+        "wordpiece": os.path.join(resource_dir, "wordpiece", "vocab.txt"),
+        "character": os.path.join(resource_dir, "character", "vocab.txt"),
+        "sentencepiece": os.path.join(resource_dir, "sentencepiece", "spiece.model"),
+    }
+    if all(os.path.isfile(path) for path in paths.values()):
+        return paths
+    for path in paths.values():
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+
+    # Vocabularies cover both the raw and normalized texts
+    texts: List[str] = read_corpus(corpus)
+    texts += [unicodedata.normalize("NFKC", text) for text in texts]
+    char_counts: collections.Counter = collections.Counter(
+        char for text in texts for char in text if not char.isspace()
+    )
+    chars: List[str] = [char for char, _ in char_counts.most_common()]
+    with open(paths["character"], "w", encoding="utf-8") as f:
+        f.write("\n".join(SPECIAL_TOKENS + chars) + "\n")
+
+    # WordPiece: characters and frequent character n-grams with their "##" forms
+    ngram_counts: collections.Counter = collections.Counter()
+    for text in texts:
+        for n in range(2, 7):
+            ngram_counts.update(
+                text[i : i + n]
+                for i in range(len(text) - n + 1)
+                if not any(char.isspace() for char in text[i : i + n])
+            )
+    num_ngrams: int = max((vocab_size - len(SPECIAL_TOKENS)) // 2 - len(chars), 0)
+    pieces: List[str] = chars + [
+        ngram for ngram, _ in ngram_counts.most_common(num_ngrams)
+    ]
+    with open(paths["wordpiece"], "w", encoding="utf-8") as f:
+        f.write(
+            "\n".join(SPECIAL_TOKENS + pieces + ["##" + piece for piece in pieces])
+            + "\n"
+        )
+
+    import sentencepiece as spm
+
+    spm.SentencePieceTrainer.train(
+        input=corpus,
+        model_prefix=paths["sentencepiece"][: -len(".model")],
+        vocab_size=vocab_size,
+        hard_vocab_limit=False,
+        character_coverage=0.9995,
+        pad_id=0,
+        unk_id=1,
+        bos_id=2,
+        eos_id=3,
+        pad_piece="[PAD]",
+        unk_piece="[UNK]",
+        bos_piece="[CLS]",
+        eos_piece="[SEP]",
+        control_symbols=["[MASK]"],
+        minloglevel=2,
+    )
+    return paths
+
+
+def matrix_cases() -> List[Dict[str, Any]]:
+    """Cases of every word tokenizer and subword tokenizer."""
+    return [
+        {
+            "name": f"{word_tokenizer_type}-{subword_tokenizer_type}",
+            "subword_tokenizer_type": subword_tokenizer_type,
+            "kwargs": {"word_tokenizer_type": word_tokenizer_type},
+        }
+        for word_tokenizer_type, subword_tokenizer_type in itertools.product(
+            WORD_TOKENIZER_TYPES, SUBWORD_TOKENIZER_TYPES
+        )
+    ]
+
+
+def public_cases() -> List[Dict[str, Any]]:
+    """Cases reproducing the configurations of ``PUBLIC_AVAILABLE_SETTING_MAP`` with local vocabularies.
+    Models sharing a configuration are merged into one case.
+    """
+    sys.path.insert(0, SRC_DIR)
+    from jptranstokenizer.model_list import PUBLIC_AVAILABLE_SETTING_MAP
+
+    cases: Dict[str, Dict[str, Any]] = {}
+    for model_name, setting in PUBLIC_AVAILABLE_SETTING_MAP.items():
+        kwargs: Dict[str, Any] = {
+            k: v
+            for k, v in setting.items()
+            if k not in ["tokenizer_class", "subword_tokenizer_type"]
+        }
+        kwargs["word_tokenizer_type"] = kwargs.get("word_tokenizer_type") or "none"
+        subword_tokenizer_type: Any = setting.get(
+            "subword_tokenizer_type",
+            "wordpiece"
+            if setting["tokenizer_class"] == "BertJapaneseTokenizer"
+            else "sentencepiece",
+        )
+        key: str = json.dumps([subword_tokenizer_type, kwargs], sort_keys=True)
+        if key not in cases:
+            cases[key] = {
+                "name": model_name,
+                "subword_tokenizer_type": subword_tokenizer_type,
+                "kwargs": kwargs,
+                "models": [],
+            }
+        cases[key]["models"].append(model_name)
+    return list(cases.values())
+
+
+def batched(texts: List[str], batch_size: int) -> Iterator[List[str]]:
+    for i in range(0, len(texts), batch_size):
+        yield texts[i : i + batch_size]
+
+
+def percentile(values: List[float], q: float) -> float:
+    values = sorted(values)
+    return values[min(int(len(values) * q), len(values) - 1)]
+
+
+def peak_rss_mb() -> float:
+    peak: int = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Bytes on macOS and kilobytes on Linux
+    return peak / 2**20 if sys.platform == "darwin" else peak / 2**10
+
+
+def run_case(case: Dict[str, Any]) -> Dict[str, Any]:
+    """Run a case in this process, which should be a fresh one."""
+    start: float = time.perf_counter()
+    from jptranstokenizer import JapaneseTransformerTokenizer
+
+    import_sec: float = time.perf_counter() - start
+    texts: List[str] = read_corpus(case["corpus"], case["num_texts"])
+    start = time.perf_counter()
+    tokenizer = JapaneseTransformerTokenizer(
+        vocab_file=case["vocab_file"],
+        subword_tokenizer_type=case["subword_tokenizer_type"],
+        **case["kwargs"],
+    )
+    init_sec: float = time.perf_counter() - start
+    start = time.perf_counter()
+    tokenizer(texts[0])
+    first_call_sec: float = time.perf_counter() - start
+
+    latencies: List[float] = []
+    for text in texts:
+        start = time.perf_counter()
+        tokenizer(text, add_special_tokens=False)
+        latencies.append(time.perf_counter() - start)
+
+    elapsed: List[float] = []
+    num_tokens: int = 0
+    for _ in range(case["repeat"]):
+        num_tokens = 0
+        start = time.perf_counter()
+        for batch in batched(texts, case["batch_size"]):
+            num_tokens += sum(
+                len(ids)
+                for ids in tokenizer(batch, add_special_tokens=False)["input_ids"]
+            )
+        elapsed.append(time.perf_counter() - start)
+    return {
+        "num_texts": len(texts),
+        "num_chars": sum(len(text) for text in texts),
+        "num_tokens": num_tokens,
+        "tokens_per_sec": num_tokens / min(elapsed),
+        "texts_per_sec": len(texts) / min(elapsed),
+        "latency_ms": {
+            "p50": percentile(latencies, 0.5) * 1000,
+            "p99": percentile(latencies, 0.99) * 1000,
+            "mean": statistics.mean(latencies) * 1000,
+        },
+        "startup_sec": {
+            "import": import_sec,
+            "init": init_sec,
+            "first_call": first_call_sec,
+            "total": import_sec + init_sec + first_call_sec,
+        },
+        "peak_rss_mb": peak_rss_mb(),
+    }
+
+
+def run_case_in_subprocess(case: Dict[str, Any], timeout: float) -> Dict[str, Any]:
+    env: Dict[str, str] = dict(os.environ, HF_HUB_OFFLINE="1", TRANSFORMERS_OFFLINE="1")
+    env["PYTHONPATH"] = os.pathsep.join(
+        [SRC_DIR] + ([env["PYTHONPATH"]] if env.get("PYTHONPATH") else [])
+    )
+    start: float = time.perf_counter()
+    try:
+        process = subprocess.run(
+            [sys.executable, __file__, "--run-case", json.dumps(case)],
+            env=env,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            timeout=timeout,
+        )
+    except subprocess.TimeoutExpired:
+        return {"status": "error", "error": f"Timed out after {timeout} seconds"}
+    wall_sec: float = time.perf_counter() - start
+    lines: List[str] = process.stdout.decode("utf-8").strip().splitlines()
+    if process.returncode != 0 or not lines:
+        stderr: List[str] = process.stderr.decode("utf-8").strip().splitlines()
+        return {"status": "error", "error": stderr[-1] if stderr else "No output"}
+    result: Dict[str, Any] = json.loads(lines[-1])
+    if result.get("status") == "ok":
+        result["process_wall_sec"] = wall_sec
+    return result
+
+
+def metadata(args: argparse.Namespace) -> Dict[str, Any]:
+    sys.path.insert(0, SRC_DIR)
+    from jptranstokenizer.version import __version__
+
+    versions: Dict[str, Optional[str]] = {"jptranstokenizer": __version__}
+    for package in ["transformers", "tokenizers", "sentencepiece", "fugashi"]:
+        try:
+            from importlib.metadata import version
+
+            versions[package] = version(package)
+        except Exception:
+            versions[package] = None
+    return {
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "processor": platform.processor(),
+        "cpu_count": os.cpu_count(),
+        "versions": versions,
+        "corpus": os.path.relpath(args.corpus),
+        "num_texts": args.num_texts,
+        "batch_size": args.batch_size,
+        "repeat": args.repeat,
+        "vocab_size": args.vocab_size,
+    }
+
+
+def compare(
+    results: List[Dict[str, Any]], baseline: List[Dict[str, Any]], threshold: float
+) -> List[Tuple[str, float]]:
+    """Return the cases whose throughput decreased by more than *threshold* from the baseline."""
+    baseline_map: Dict[str, Dict[str, Any]] = {
+        result["name"]: result for result in baseline if result["status"] == "ok"
+    }
+    regressions: List[Tuple[str, float]] = []
+    for result in results:
+        base: Optional[Dict[str, Any]] = baseline_map.get(result["name"])
+        if result["status"] != "ok" or base is None:
+            continue
+        ratio: float = result["tokens_per_sec"] / base["tokens_per_sec"]
+        if ratio < 1 - threshold:
+            regressions.append((result["name"], ratio))
+    return regressions
+
+
+def print_table(results: List[Dict[str, Any]]) -> None:
+    header: str = f"{'case':<56} {'tokens/s':>10} {'p50 ms':>8} {'p99 ms':>8} {'RSS MB':>8} {'start s':>8}"
+    print(header, file=sys.stderr)
+    for result in results:
+        if result["status"] != "ok":
+            print(
+                f"{result['name']:<56} {result['status']}: {result['error']}",
+                file=sys.stderr,
+            )
+            continue
+        print(
+            f"{result['name']:<56} {result['tokens_per_sec']:>10.0f}"
+            f" {result['latency_ms']['p50']:>8.3f} {result['latency_ms']['p99']:>8.3f}"
+            f" {result['peak_rss_mb']:>8.1f} {result['startup_sec']['total']:>8.3f}",
+            file=sys.stderr,
+        )
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("-o", "--output", help="Path to write the results in JSON")
+    parser.add_argument("--corpus", default=DEFAULT_CORPUS)
+    parser.add_argument(
+        "--work-dir",
+        default=os.path.join(BENCHMARK_DIR, ".work"),
+        help="Directory of the generated vocabularies",
+    )
+    parser.add_argument("--vocab-size", type=int, default=8000)
+    parser.add_argument("--num-texts", type=int, help="Use the first N texts")
+    parser.add_argument("--batch-size", type=int, default=64)
+    parser.add_argument(
+        "--repeat", type=int, default=3, help="Passes of batch encoding (best is used)"
+    )
+    parser.add_argument(
+        "--suite",
+        choices=["all", "matrix", "public"],
+        default="all",
+        help="matrix: word x subword tokenizers, public: PUBLIC_AVAILABLE_SETTING_MAP",
+    )
+    parser.add_argument("-k", "--filter", help="Run cases whose name contains it")
+    parser.add_argument("--timeout", type=float, default=1800)
+    parser.add_argument("--compare", help="Results of the baseline in JSON")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.1,
+        help="Allowed decrease of tokens/sec from the baseline",
+    )
+    parser.add_argument("--run-case", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.run_case is not None:
+        try:
+            result: Dict[str, Any] = {
+                "status": "ok",
+                **run_case(json.loads(args.run_case)),
+            }
+        except Exception as error:
+            result = {
+                "status": "error",
+                "error": f"{error.__class__.__name__}: {error}",
+            }
+        print(json.dumps(result, ensure_ascii=False))
+        return 0
+
+    vocab_files: Dict[str, str] = build_resources(
+        args.corpus, args.work_dir, args.vocab_size
+    )
+    cases: List[Dict[str, Any]] = []
+    if args.suite in ["all", "matrix"]:
+        cases += [dict(case, suite="matrix") for case in matrix_cases()]
+    if args.suite in ["all", "public"]:
+        cases += [dict(case, suite="public") for case in public_cases()]
+    if args.filter:
+        cases = [case for case in cases if args.filter in case["name"]]
+
+    results: List[Dict[str, Any]] = []
+    for case in cases:
+        case.update(
+            vocab_file=vocab_files[case["subword_tokenizer_type"]],
+            corpus=os.path.abspath(args.corpus),
+            num_texts=args.num_texts,
+            batch_size=args.batch_size,
+            repeat=args.repeat,
+        )
+        print(f"Running {case['name']}", file=sys.stderr)
+        result = run_case_in_subprocess(case, args.timeout)
+        results.append(
+            {
+                "name": case["name"],
+                "suite": case["suite"],
+                "subword_tokenizer_type": case["subword_tokenizer_type"],
+                "kwargs": case["kwargs"],
+                **({"models": case["models"]} if "models" in case else {}),
+                **result,
+            }
+        )
+    print_table(results)
+
+    if args.output is not None:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(
+                {"metadata": metadata(args), "results": results},
+                f,
+                ensure_ascii=False,
+                indent=2,
+            )
+    if args.compare is not None:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline: List[Dict[str, Any]] = json.load(f)["results"]
+        regressions = compare(results, baseline, args.threshold)
+        for name, ratio in regressions:
+            print(f"Regression: {name} ({ratio:.2%} of the baseline)", file=sys.stderr)
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
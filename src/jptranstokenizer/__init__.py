@@ -1,2 +1,35 @@
-from .tokenization_utils import JapaneseTransformerTokenizer, get_word_tokenizer
+from typing import TYPE_CHECKING, Any, Dict, List
+
 from .version import __version__
+
+# Submodules depending on transformers are imported when their attributes are first accessed
+_import_structure: Dict[str, List[str]] = {
+    "tokenization_utils": ["JapaneseTransformerTokenizer", "get_word_tokenizer"],
+    "tokenization_utils_fast": ["JapaneseTransformerTokenizerFast"],
+}
+_attr_to_module: Dict[str, str] = {
+    attr: module for module, attrs in _import_structure.items() for attr in attrs
+}
+
+if TYPE_CHECKING:
+    from .tokenization_utils import JapaneseTransformerTokenizer, get_word_tokenizer
+    from .tokenization_utils_fast import JapaneseTransformerTokenizerFast
+
+
+def __getattr__(name: str) -> Any:
+    if name not in _attr_to_module:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    import importlib
+
+    value: Any = getattr(
+        importlib.import_module(f".{_attr_to_module[name]}", __name__), name
+    )
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> List[str]:
+    return sorted(list(globals().keys()) + list(_attr_to_module.keys()))
+
+
+__all__: List[str] = ["__version__", *_attr_to_module.keys()]
@@ -0,0 +1,125 @@
+import unicodedata
+from typing import TYPE_CHECKING, List, Optional, Tuple
+
+if TYPE_CHECKING:
+    from typing import Literal
+
+    # typing.Literal is not available in Python 3.7
+    _Form = Literal["NFC", "NFD", "NFKC", "NFKD"]
+
+Span = Tuple[int, int]
+
+# Characters which are composed with the preceding one by NFKC but are not combining characters
+_COMPOSING_CHARS: str = "゙゚ﾞﾟ"
+
+
+def normalize_with_alignment(
+    text: str, form: "_Form" = "NFKC"
+) -> Tuple[str, Optional[List[Span]]]:
+    """Normalize a text keeping the span in the original text of each normalized character.
+
+    Args:
+        text (``str``): A text.
+        form (``str``, *optional*, defaults to ``"NFKC"``): The form of unicode normalization.
+
+    Returns:
+        ``Tuple[str, Optional[List[Tuple[int, int]]]]``: The normalized text and the spans.
+        The spans are ``None`` when the text is already normalized.
+    """
+    if unicodedata.is_normalized(form, text):
+        return text, None
+    chars: List[str] = []
+    spans: List[Span] = []
+    start: int = 0
+    while start < len(text):
+        end: int = start + 1
+        # A base character and the following marks are normalized together
+        while end < len(text) and (
+            unicodedata.combining(text[end]) or text[end] in _COMPOSING_CHARS
+        ):
+            end += 1
+        normalized: str = unicodedata.normalize(form, text[start:end])
+        chars.append(normalized)
+        spans.extend([(start, end)] * len(normalized))
+        start = end
+    normalized_text: str = unicodedata.normalize(form, text)
+    if "".join(chars) != normalized_text:  # pragma: no cover
+        # Normalization across segments such as Hangul jamo
+        spans = [(0, len(text))] * len(normalized_text)
+    return normalized_text, spans
+
+
+def align_words(text: str, words: List[str]) -> List[Span]:
+    """Locate words in the text from the beginning.
+    Words whose surface differs from the text (such as ``"＃"`` by Juman)
+    are assigned the span of the same length at the current position.
+
+    Args:
+        text (``str``): The text which is split into words.
+        words (``List[str]``): Words of the text in order.
+
+    Returns:
+        ``List[Tuple[int, int]]``: The span of each word.
+    """
+    spans: List[Span] = []
+    cursor: int = 0
+    for word in words:
+        start: int = text.find(word, cursor) if word else -1
+        if start >= 0 and not text[cursor:start].strip():
+            end: int = start + len(word)
+        else:
+            start = cursor
+            while start < len(text) and text[start].isspace() and not word.isspace():
+                start += 1
+            end = min(start + len(word), len(text))
+        spans.append((start, end))
+        cursor = end
+    return spans
+
+
+def align_subwords(
+    word: str, subwords: List[str], unk_token: str, prefix: str = ""
+) -> List[Span]:
+    """Locate subwords in the word.
+    An unknown token spans until the next subword.
+
+    Args:
+        word (``str``): The word.
+        subwords (``List[str]``): Subwords of the word.
+        unk_token (``str``): The unknown token.
+        prefix (``str``, *optional*, defaults to ``""``):
+            The marker removed from subwords, such as ``"##"`` (WordPiece) or ``"▁"`` (sentencepiece).
+
+    Returns:
+        ``List[Tuple[int, int]]``: The span of each subword.
+    """
+    surfaces: List[Optional[str]] = [
+        None
+        if subword == unk_token
+        else (subword.replace(prefix, "") if prefix else subword)
+        for subword in subwords
+    ]
+    spans: List[Span] = []
+    cursor: int = 0
+    for i, surface in enumerate(surfaces):
+        start: int = -1 if surface is None else word.find(surface, cursor)
+        if surface is not None and start >= 0 and not word[cursor:start].strip():
+            end: int = start + len(surface)
+        else:
+            start = cursor
+            while start < len(word) and word[start].isspace():
+                start += 1
+            if surface is None:
+                end = len(word)
+                for next_surface in surfaces[i + 1 :]:
+                    if next_surface:
+                        found: int = word.find(next_surface, start + 1)
+                        if found >= 0:
+                            end = found
+                        break
+            else:
+                # The surface is changed by normalization of the subword tokenizer
+                end = min(start + len(surface), len(word))
+        spans.append((start, end))
+        cursor = end
+    return spans
@@ -0,0 +1,149 @@
+import argparse
+import json
+from typing import Any, Dict, List, Optional
+
+
+def _load_tokenizer(args: argparse.Namespace) -> Any:
+    from .tokenization_utils import JapaneseTransformerTokenizer
+
+    kwargs: Dict[str, Any] = json.loads(args.tokenizer_kwargs)
+    if args.word_tokenizer_type is not None:
+        kwargs["word_tokenizer_type"] = args.word_tokenizer_type
+    if args.tokenizer_class is not None:
+        kwargs["tokenizer_class"] = args.tokenizer_class
+    return JapaneseTransformerTokenizer.from_pretrained(args.tokenizer, **kwargs)
+
+
+def _add_tokenizer_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument(
+        "tokenizer", help="Model name on the Hugging Face Hub or a local directory"
+    )
+    parser.add_argument(
+        "--word-tokenizer-type",
+        help="basic, mecab, juman, sudachi or none (required for a local directory)",
+    )
+    parser.add_argument(
+        "--tokenizer-class",
+        help="BertJapaneseTokenizer, AlbertTokenizer and so on (required for a local directory)",
+    )
+    parser.add_argument(
+        "--tokenizer-kwargs",
+        default="{}",
+        help="Other arguments of from_pretrained as a JSON object",
+    )
+
+
+def _pretokenize(args: argparse.Namespace) -> None:
+    from .pretokenize import pretokenize
+
+    checkpoint: Dict[str, Any] = pretokenize(
+        _load_tokenizer(args),
+        args.inputs,
+        args.output_dir,
+        input_format=args.format,
+        text_key=args.text_key,
+        shard_size=args.shard_size,
+        batch_size=args.batch_size,
+        rank=args.rank,
+        world_size=args.world_size,
+        add_special_tokens=args.add_special_tokens,
+        n_jobs=args.n_jobs,
+    )
+    print(
+        f"{len(checkpoint['shards'])} shards, "
+        f"{sum(shard['num_documents'] for shard in checkpoint['shards'])} documents, "
+        f"{sum(shard['num_tokens'] for shard in checkpoint['shards'])} tokens "
+        f"({checkpoint['dtype']}) in {args.output_dir}"
+    )
+
+
+def _serve(args: argparse.Namespace) -> None:
+    from concurrent.futures import ThreadPoolExecutor
+
+    from .serve import serve
+
+    tokenizer: Any = _load_tokenizer(args)
+    with ThreadPoolExecutor(max_workers=args.num_threads) as executor:
+        tokenizer.async_executor = executor
+        serve(
+            tokenizer,
+            host=args.host,
+            port=args.port,
+            unix_socket=args.unix_socket,
+            max_batch_size=args.max_batch_size,
+            max_wait_ms=args.max_wait_ms,
+            default_deadline_ms=args.default_deadline_ms,
+        )
+
+
+def get_parser() -> argparse.ArgumentParser:
+    """Return the parser of the ``jptranstokenizer`` command."""
+    parser = argparse.ArgumentParser(prog="jptranstokenizer")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    parser_pretokenize = subparsers.add_parser(
+        "pretokenize",
+        help="Tokenize corpora into memory-mapped shards of token ids",
+        description=(
+            "Tokenize corpora into memory-mapped shards of token ids. "
+            "Run again with the same arguments to resume from the checkpoint."
+        ),
+    )
+    _add_tokenizer_arguments(parser_pretokenize)
+    parser_pretokenize.add_argument(
+        "inputs", nargs="+", help="Corpus files (JSONL or one document per line)"
+    )
+    parser_pretokenize.add_argument("-o", "--output-dir", required=True)
+    parser_pretokenize.add_argument("--format", choices=["jsonl", "text"])
+    parser_pretokenize.add_argument("--text-key", default="text")
+    parser_pretokenize.add_argument(
+        "--shard-size", type=int, default=2**26, help="Number of tokens in a shard"
+    )
+    parser_pretokenize.add_argument("--batch-size", type=int, default=1000)
+    parser_pretokenize.add_argument("--rank", type=int, default=0)
+    parser_pretokenize.add_argument("--world-size", type=int, default=1)
+    parser_pretokenize.add_argument("--add-special-tokens", action="store_true")
+    parser_pretokenize.add_argument("--n-jobs", type=int)
+    parser_pretokenize.set_defaults(func=_pretokenize)
+
+    parser_serve = subparsers.add_parser(
+        "serve",
+        help="Serve tokenization over HTTP with dynamic micro-batching",
+        description=(
+            "Serve tokenization over HTTP with dynamic micro-batching. "
+            'POST /encode or /tokenize with {"text": ...} or {"texts": [...]}.'
+        ),
+    )
+    _add_tokenizer_arguments(parser_serve)
+    parser_serve.add_argument("--host", default="127.0.0.1")
+    parser_serve.add_argument("--port", type=int, default=8000)
+    parser_serve.add_argument(
+        "--unix-socket", help="Path of a Unix socket to listen on instead of TCP"
+    )
+    parser_serve.add_argument("--max-batch-size", type=int, default=64)
+    parser_serve.add_argument(
+        "--max-wait-ms",
+        type=float,
+        default=5,
+        help="Milliseconds to wait for other requests to fill a batch",
+    )
+    parser_serve.add_argument(
+        "--default-deadline-ms",
+        type=float,
+        help="Respond with 504 to requests not processed in time",
+    )
+    parser_serve.add_argument(
+        "--num-threads", type=int, default=4, help="Threads running batches"
+    )
+    parser_serve.set_defaults(func=_serve)
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Entry point of the ``jptranstokenizer`` command."""
+    args: argparse.Namespace = get_parser().parse_args(argv)
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
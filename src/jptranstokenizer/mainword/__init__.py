@@ -1,3 +1,4 @@
 from .base import Normalizer
-from .juman import JumanTokenizer
+from .juman import JumanError, JumanTokenizer
+from .mecab import MecabTokenizer
 from .sudachi import SudachiTokenizer
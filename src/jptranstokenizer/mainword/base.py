@@ -1,6 +1,78 @@
+import re
 import unicodedata
 from abc import ABC, abstractmethod
-from typing import Any, Dict, List
+from typing import Any, Iterator, List
+
+# Boundaries to split a long text, tried in order: sentences, clauses and whitespaces
+_CHUNK_BOUNDARIES: List["re.Pattern[str]"] = [
+    re.compile(r"[^。．.！？!?\n]*(?:[。．.！？!?\n]+[」』）)】］\]”’]*|$)"),
+    re.compile(r"[^、，,；;：:]*(?:[、，,；;：:]+|$)"),
+    re.compile(r"\S*(?:\s+|$)"),
+]
+
+
+def normalize_nfkc(text: str) -> str:
+    """Apply NFKC normalization to a text.
+    ASCII-only texts are returned as they are without looking up the unicode database.
+    ``unicodedata.normalize`` returns already normalized texts as they are after its quick check,
+    so ``unicodedata.is_normalized`` is not called in advance.
+
+    Args:
+        text (``str``): A text.
+
+    Returns:
+        ``str``: The normalized text.
+    """
+    if text.isascii():
+        return text
+    return unicodedata.normalize("NFKC", text)
+
+
+def _split_units(text: str, max_bytes: int, level: int = 0) -> Iterator[str]:
+    if len(text.encode("utf-8")) <= max_bytes:
+        yield text
+    elif level < len(_CHUNK_BOUNDARIES):
+        for unit in _CHUNK_BOUNDARIES[level].findall(text):
+            if unit:
+                yield from _split_units(unit, max_bytes, level + 1)
+    else:
+        # No boundary is found, so the text is split between characters
+        start: int = 0
+        size: int = 0
+        for i, char in enumerate(text):
+            char_size: int = len(char.encode("utf-8"))
+            if size + char_size > max_bytes:
+                yield text[start:i]
+                start, size = i, 0
+            size += char_size
+        yield text[start:]
+
+
+def split_into_chunks(text: str, max_bytes: int) -> List[str]:
+    """Split a text into chunks within *max_bytes* in UTF-8.
+    The text is split at the ends of sentences if possible, otherwise at punctuations or whitespaces,
+    and consecutive pieces are packed into a chunk. Joining the chunks restores the text.
+
+    Args:
+        text (``str``): A text.
+        max_bytes (``int``): The maximum number of bytes of a chunk.
+
+    Returns:
+        ``List[str]``: Chunks of the text.
+    """
+    chunks: List[str] = []
+    current: List[str] = []
+    size: int = 0
+    for unit in _split_units(text, max_bytes):
+        unit_size: int = len(unit.encode("utf-8"))
+        if current and size + unit_size > max_bytes:
+            chunks.append("".join(current))
+            current, size = [], 0
+        current.append(unit)
+        size += unit_size
+    if current:
+        chunks.append("".join(current))
+    return chunks
 
 
 class MainTokenizerABC(ABC):
@@ -19,10 +91,45 @@ class MainTokenizerABC(ABC):
         self.do_lower_case = do_lower_case
         self.normalize_text = normalize_text
 
+    def normalize_batch(
+        self, texts: List[str], is_normalized: bool = False
+    ) -> List[str]:
+        """Apply unicode normalization to texts if *normalize_text* is valid.
+        This is the only place where the tokenizer normalizes texts.
+
+        Args:
+            texts (``List[str]``): Sequences to be normalized.
+            is_normalized (``bool``, *optional*, defaults to ``False``):
+                Whether the caller has already normalized the texts, in which case they are returned as they are.
+
+        Returns:
+            ``List[str]``: The normalized texts.
+        """
+        if not self.normalize_text or is_normalized:
+            return texts
+        return [normalize_nfkc(text) for text in texts]
+
     @abstractmethod
-    def tokenize(self, text: str, **kwargs: Dict[str, Any]) -> List[str]:
+    def tokenize(self, text: str, **kwargs: Any) -> List[str]:
         """Devide the sequence into words."""
 
+    def tokenize_batch(
+        self, texts: List[str], is_normalized: bool = False, **kwargs: Any
+    ) -> List[List[str]]:
+        """Devide each sequence of the batch into words.
+        Tokenizers which can analyze multiple texts at once override this.
+
+        Args:
+            texts (``List[str]``): Sequences to be encoded.
+            is_normalized (``bool``, *optional*, defaults to ``False``):
+                Whether the texts are already normalized by ``normalize_batch``.
+                This default leaves normalization to ``tokenize``.
+
+        Returns:
+            ``List[List[str]]``: A list of words for each sequence.
+        """
+        return [self.tokenize(text, **kwargs) for text in texts]
+
 
 class Normalizer(MainTokenizerABC):
     """A main word tokenizer, which only normalize and make lower case.
@@ -35,7 +142,7 @@ class Normalizer(MainTokenizerABC):
     def __init__(self, do_lower_case: bool = False, normalize_text: bool = True):
         super().__init__(do_lower_case=do_lower_case, normalize_text=normalize_text)
 
-    def tokenize(self, text: str, **kwargs: Dict[str, Any]) -> List[str]:
+    def tokenize(self, text: str, **kwargs: Any) -> List[str]:
         """Only normalize and make lower case tokenizer.
         Maybe called for dummy main tokenizer.
         Other kwargs (such as *never_split*) are ignored.
@@ -46,8 +153,22 @@ class Normalizer(MainTokenizerABC):
         Returns:
             ``List[str]``: A list of a sentence.
         """
-        if self.normalize_text:
-            text = unicodedata.normalize("NFKC", text)
+        return self.tokenize_batch([text], **kwargs)[0]
+
+    def tokenize_batch(
+        self, texts: List[str], is_normalized: bool = False, **kwargs: Any
+    ) -> List[List[str]]:
+        """Batch version of ``tokenize``.
+
+        Args:
+            texts (``List[str]``): Sequences to be encoded.
+            is_normalized (``bool``, *optional*, defaults to ``False``):
+                Whether the texts are already normalized by ``normalize_batch``.
+
+        Returns:
+            ``List[List[str]]``: A list of a sentence for each sequence.
+        """
+        texts = self.normalize_batch(texts, is_normalized=is_normalized)
         if self.do_lower_case:
-            text = text.lower()
-        return [text]
+            texts = [text.lower() for text in texts]
+        return [[text] for text in texts]
@@ -0,0 +1,140 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+from typing import Any, Dict, List, Optional, Union
+
+from .base import MainTokenizerABC
+
+
+class CachedWordTokenizer(MainTokenizerABC):
+    """Word tokenizer which stores its results in a SQLite database on disk.
+    Results are keyed by the (normalized) text and the hash of *config*,
+    so a database can be shared among tokenizers of different settings.
+    Multiple processes and threads can read and write the same database.
+
+    Args:
+        word_tokenizer:
+            A main word tokenizer whose results are cached.
+        path (``str`` or ``os.PathLike``):
+            Path to the SQLite database, created if it does not exist.
+        config (``Dict[str, Any]``):
+            The whole configuration of *word_tokenizer*, such as the backend, dictionary and split mode.
+            This must be JSON serializable.
+    """
+
+    def __init__(
+        self, word_tokenizer: Any, path: Union[str, os.PathLike], config: Dict[str, Any]
+    ):
+        super().__init__(
+            do_lower_case=getattr(word_tokenizer, "do_lower_case", False),
+            normalize_text=getattr(word_tokenizer, "normalize_text", False),
+        )
+        self.word_tokenizer = word_tokenizer
+        self.path = os.fspath(path)
+        self.config = config
+        self.config_hash: str = hashlib.sha1(
+            json.dumps(config, sort_keys=True).encode("utf-8")
+        ).hexdigest()
+        # Connections of each thread
+        self._local = threading.local()
+        self._connect()
+
+    def __getstate__(self) -> Dict[str, Any]:
+        state: Dict[str, Any] = self.__dict__.copy()
+        del state["_local"]
+        return state
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.__dict__.update(state)
+        self._local = threading.local()
+
+    def _connect(self) -> sqlite3.Connection:
+        # A connection must not be shared with forked processes or other threads
+        local = self._local
+        if getattr(local, "connection", None) is None or local.pid != os.getpid():
+            connection = sqlite3.connect(self.path, timeout=60)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS segmentation ("
+                "config TEXT NOT NULL, text TEXT NOT NULL, tokens TEXT NOT NULL, "
+                "PRIMARY KEY (config, text)) WITHOUT ROWID"
+            )
+            connection.commit()
+            local.connection = connection
+            local.pid = os.getpid()
+        return local.connection
+
+    def _key(self, never_split: Optional[List[str]]) -> str:
+        # never_split changes the results of some tokenizers when lowercasing
+        if self.do_lower_case and never_split:
+            return (
+                self.config_hash
+                + ":"
+                + hashlib.sha1("\n".join(sorted(never_split)).encode()).hexdigest()
+            )
+        return self.config_hash
+
+    def _word_tokenize_batch(self, texts: List[str], **kwargs: Any) -> List[List[str]]:
+        if isinstance(self.word_tokenizer, MainTokenizerABC):
+            # The texts have been normalized in tokenize_batch
+            return self.word_tokenizer.tokenize_batch(
+                texts, is_normalized=True, **kwargs
+            )
+        return [self.word_tokenizer.tokenize(text, **kwargs) for text in texts]
+
+    def tokenize(self, text: str, **kwargs: Any) -> List[str]:
+        """Return cached words of the text, tokenizing it if not cached.
+
+        Args:
+            text (``str``): A sequence to be encoded.
+
+        Returns:
+            ``List[str]``: A list of words.
+        """
+        return self.tokenize_batch([text], **kwargs)[0]
+
+    def tokenize_batch(
+        self, texts: List[str], is_normalized: bool = False, **kwargs: Any
+    ) -> List[List[str]]:
+        """Return cached words of the texts.
+        Texts not in the cache are tokenized at once and stored.
+
+        Args:
+            texts (``List[str]``): Sequences to be encoded.
+            is_normalized (``bool``, *optional*, defaults to ``False``):
+                Whether the texts are already normalized by ``normalize_batch``.
+
+        Returns:
+            ``List[List[str]]``: A list of words for each sequence.
+        """
+        texts = self.normalize_batch(texts, is_normalized=is_normalized)
+        key: str = self._key(kwargs.get("never_split"))
+        connection: sqlite3.Connection = self._connect()
+        cached: Dict[str, List[str]] = {}
+        unique_texts: List[str] = list(dict.fromkeys(texts))
+        # Keep the number of parameters under the limit of SQLite
+        for i in range(0, len(unique_texts), 500):
+            chunk: List[str] = unique_texts[i : i + 500]
+            rows = connection.execute(
+                "SELECT text, tokens FROM segmentation WHERE config = ? AND text IN "
+                f"({','.join('?' * len(chunk))})",
+                [key, *chunk],
+            )
+            cached.update((text, json.loads(tokens)) for text, tokens in rows)
+
+        missing: List[str] = [text for text in unique_texts if text not in cached]
+        if missing:
+            results: List[List[str]] = self._word_tokenize_batch(missing, **kwargs)
+            cached.update(zip(missing, results))
+            with connection:
+                connection.executemany(
+                    "INSERT OR IGNORE INTO segmentation (config, text, tokens) VALUES (?, ?, ?)",
+                    [
+                        (key, text, json.dumps(tokens, ensure_ascii=False))
+                        for text, tokens in zip(missing, results)
+                    ],
+                )
+        return [list(cached[text]) for text in texts]
@@ -1,8 +1,540 @@
-import re
-import unicodedata
-from typing import Any, Dict, List
+import asyncio
+import os
+import selectors
+import shutil
+import subprocess
+import threading
+import time
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import IO, Any, Dict, Iterator, List, Optional, Sequence, Tuple, cast
 
-from .base import MainTokenizerABC
+from .base import MainTokenizerABC, split_into_chunks
+
+# The maximum bytes of an input of Juman++
+JUMAN_MAX_BYTES: int = 4096
+# Spaces are analyzed as "\u3000", and other whitespaces and quotes break the output of Juman++
+JUMAN_ESCAPE_TABLE: Dict[int, str] = {
+    **{i: "\u3000" for i in range(0x3000) if chr(i).isspace() and chr(i) != "\n"},
+    ord('"'): "”",
+}
+# "#" and "@" at the beginning of a sentence causes timeout error
+_HEAD_ESCAPES: Dict[str, str] = {"#": "＃", "@": "＠"}
+
+
+class JumanError(Exception):
+    """Raised when Juman++ fails to analyze a text."""
+
+
+def _escape_head(text: str) -> str:
+    # Juman++ receives the sentence without leading whitespaces
+    start: int = len(text) - len(text.lstrip())
+    head: Optional[str] = _HEAD_ESCAPES.get(text[start : start + 1])
+    if head is None:
+        return text
+    return text[:start] + head + text[start + 1 :]
+
+
+class JumanppProcess:
+    """A long-lived Juman++ child process which analyzes sentences through pipes.
+    Unlike ``pyknp.Juman``, this can analyze several sentences in one round-trip
+    and can be used from any thread.
+
+    Args:
+        command (``str``, *optional*, defaults to ``"jumanpp"``):
+            The command of Juman++.
+        option (``str``, *optional*, defaults to ``""``):
+            Options passed to Juman++.
+        timeout (``float``, *optional*, defaults to ``30``):
+            Seconds to wait for the result of one sentence.
+    """
+
+    pattern: str = "EOS"
+
+    def __init__(self, command: str = "jumanpp", option: str = "", timeout: float = 30):
+        if shutil.which(command) is None:
+            raise Exception(f"Can't find JUMAN command: {command}")
+        self.command: List[str] = [command] + option.split()
+        self.timeout = timeout
+        self.process: Optional[subprocess.Popen] = None
+        self._buffer: bytes = b""
+
+    def __del__(self) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Terminate the child process if it is running."""
+        process = getattr(self, "process", None)
+        if process is None:
+            return
+        self.process = None
+        self._buffer = b""
+        for stream in (process.stdin, process.stdout):
+            try:
+                stream.close()
+            except OSError:
+                pass
+        try:
+            process.kill()
+            process.wait()
+        except OSError:
+            pass
+
+    def _start(self) -> subprocess.Popen:
+        if self.process is None or self.process.poll() is not None:
+            self.close()
+            self.process = subprocess.Popen(
+                self.command,
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                close_fds=os.name != "nt",
+            )
+        return self.process
+
+    def _readline(self, fd: int, deadline: float) -> bytes:
+        with selectors.DefaultSelector() as selector:
+            selector.register(fd, selectors.EVENT_READ)
+            while b"\n" not in self._buffer:
+                remaining: float = deadline - time.monotonic()
+                if remaining <= 0 or not selector.select(remaining):
+                    raise subprocess.TimeoutExpired(self.command, self.timeout)
+                data: bytes = os.read(fd, 65536)
+                if not data:
+                    raise EOFError("Juman++ process terminated unexpectedly")
+                self._buffer += data
+        line, self._buffer = self._buffer.split(b"\n", 1)
+        return line
+
+    def query_batch(self, sentences: List[str]) -> List[str]:
+        """Analyze sentences and return the raw output of Juman++ for each one.
+        All the sentences are written to Juman++ at once while the results are read.
+
+        Args:
+            sentences (``List[str]``): Sentences to be analyzed.
+
+        Returns:
+            ``List[str]``: Juman++ output (without ``EOS``) for each sentence.
+        """
+        if len(sentences) == 0:
+            return []
+        process: subprocess.Popen = self._start()
+        # The pipes are opened in _start
+        stdin: IO[bytes] = cast(IO[bytes], process.stdin)
+        fd: int = cast(IO[bytes], process.stdout).fileno()
+        # Same as pyknp: a newline works as the sentence delimiter of Juman++
+        payload: bytes = "".join(
+            sentence.replace("\n", "").strip() + "\n" for sentence in sentences
+        ).encode("utf-8")
+
+        # Writing in another thread avoids the deadlock of filled pipes
+        def write() -> None:
+            try:
+                stdin.write(payload)
+                stdin.flush()
+            except (BrokenPipeError, ValueError):
+                pass
+
+        writer = threading.Thread(target=write, daemon=True)
+        writer.start()
+        results: List[str] = []
+        try:
+            for _ in sentences:
+                lines: List[str] = []
+                deadline: float = time.monotonic() + self.timeout
+                while True:
+                    line: str = self._readline(fd, deadline).decode("utf-8").rstrip()
+                    if line == self.pattern:
+                        break
+                    lines.append(line + "\n")
+                results.append("".join(lines))
+        except BaseException:
+            # The state of the pipes is unknown, so restart at the next query
+            self.close()
+            raise
+        finally:
+            writer.join()
+        return results
+
+    def query(self, sentence: str) -> str:
+        """Analyze a sentence and return the raw output of Juman++.
+
+        Args:
+            sentence (``str``): A sentence to be analyzed.
+
+        Returns:
+            ``str``: Juman++ output (without ``EOS``).
+        """
+        return self.query_batch([sentence])[0]
+
+
+def _reap_idle(pool_ref: "weakref.ReferenceType[JumanppPool]") -> None:
+    # Run in a timer thread, which doesn't keep the pool alive
+    pool: Optional[JumanppPool] = pool_ref()
+    if pool is not None:
+        pool._reap()
+
+
+class JumanppPool:
+    """A pool of long-lived Juman++ processes.
+    Each call is dispatched to an idle process, and at most *max_workers* processes run at once.
+    The pool grows on demand and processes idle longer than *idle_timeout* are terminated
+    by a background timer even when no call comes (the most recently used *min_workers* processes are kept).
+
+    Args:
+        max_workers (``int``, *optional*, defaults to ``1``):
+            The maximum number of Juman++ processes.
+        min_workers (``int``, *optional*, defaults to ``1``):
+            The number of processes kept even when idle.
+        idle_timeout (``float``, *optional*, defaults to ``60``):
+            Seconds after which an idle process is terminated.
+        command (``str``, *optional*, defaults to ``"jumanpp"``):
+            The command of Juman++.
+        option (``str``, *optional*, defaults to ``""``):
+            Options passed to Juman++.
+        timeout (``float``, *optional*, defaults to ``30``):
+            Seconds to wait for the result of one sentence.
+    """
+
+    def __init__(
+        self,
+        max_workers: int = 1,
+        min_workers: int = 1,
+        idle_timeout: float = 60,
+        command: str = "jumanpp",
+        option: str = "",
+        timeout: float = 30,
+    ):
+        if max_workers < 1:
+            raise ValueError("max_workers must be positive")
+        self.max_workers = max_workers
+        self.min_workers = min(min_workers, max_workers)
+        self.idle_timeout = idle_timeout
+        self.command = command
+        self.option = option
+        self.timeout = timeout
+        self._condition = threading.Condition()
+        # Idle processes with the time they were released, the newest at the end
+        self._idle: List[Tuple[JumanppProcess, float]] = []
+        self._num_workers: int = 0
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._reaper: Optional[threading.Timer] = None
+        # Check the command here to raise an error at initialization
+        self._idle.append((self._new_process(), time.monotonic()))
+        self._num_workers += 1
+
+    def __del__(self) -> None:
+        self.close()
+
+    @property
+    def num_workers(self) -> int:
+        """The number of processes in the pool."""
+        return self._num_workers
+
+    def _new_process(self) -> JumanppProcess:
+        return JumanppProcess(
+            command=self.command, option=self.option, timeout=self.timeout
+        )
+
+    def close(self) -> None:
+        """Terminate all the idle processes."""
+        with self._condition:
+            for process, _ in self._idle:
+                process.close()
+            self._num_workers -= len(self._idle)
+            self._idle = []
+            if self._reaper is not None:
+                self._reaper.cancel()
+                self._reaper = None
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+
+    def _shrink(self) -> None:
+        now: float = time.monotonic()
+        while (
+            len(self._idle) > self.min_workers
+            and now - self._idle[0][1] >= self.idle_timeout
+        ):
+            process, _ = self._idle.pop(0)
+            process.close()
+            self._num_workers -= 1
+
+    def _schedule_reaper(self) -> None:
+        # Called with the lock held, when the oldest idle process expires
+        if self._reaper is not None or len(self._idle) <= self.min_workers:
+            return
+        delay: float = self._idle[0][1] + self.idle_timeout - time.monotonic()
+        self._reaper = threading.Timer(
+            max(delay, 0), _reap_idle, args=(weakref.ref(self),)
+        )
+        self._reaper.daemon = True
+        self._reaper.start()
+
+    def _reap(self) -> None:
+        with self._condition:
+            self._reaper = None
+            self._shrink()
+            self._schedule_reaper()
+
+    @contextmanager
+    def acquire(self) -> Iterator[JumanppProcess]:
+        """Take an idle process, starting a new one if the pool can grow.
+        This blocks while *max_workers* processes are in use.
+        """
+        with self._condition:
+            while not self._idle and self._num_workers >= self.max_workers:
+                self._condition.wait()
+            self._shrink()
+            if self._idle:
+                process: JumanppProcess = self._idle.pop()[0]
+            else:
+                process = self._new_process()
+                self._num_workers += 1
+        try:
+            yield process
+        finally:
+            with self._condition:
+                self._idle.append((process, time.monotonic()))
+                self._shrink()
+                self._schedule_reaper()
+                self._condition.notify()
+
+    def query(self, sentence: str) -> str:
+        """Analyze a sentence with an idle process.
+
+        Args:
+            sentence (``str``): A sentence to be analyzed.
+
+        Returns:
+            ``str``: Juman++ output (without ``EOS``).
+        """
+        with self.acquire() as process:
+            return process.query(sentence)
+
+    def _query_chunk(self, sentences: List[str]) -> List[str]:
+        with self.acquire() as process:
+            return process.query_batch(sentences)
+
+    def query_batch(self, sentences: List[str]) -> List[str]:
+        """Analyze sentences, dividing them among up to *max_workers* processes.
+
+        Args:
+            sentences (``List[str]``): Sentences to be analyzed.
+
+        Returns:
+            ``List[str]``: Juman++ output (without ``EOS``) for each sentence.
+        """
+        num_chunks: int = min(self.max_workers, len(sentences))
+        if num_chunks <= 1:
+            return self._query_chunk(sentences)
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.max_workers)
+        chunk_size: int = -(-len(sentences) // num_chunks)
+        chunks: List[List[str]] = [
+            sentences[i : i + chunk_size] for i in range(0, len(sentences), chunk_size)
+        ]
+        return [
+            spec
+            for specs in self._executor.map(self._query_chunk, chunks)
+            for spec in specs
+        ]
+
+
+class AsyncJumanppProcess:
+    """A long-lived Juman++ child process for asyncio, which talks with Juman++ through streams.
+    It must be used in the event loop where it is created.
+
+    Args:
+        command (``str``, *optional*, defaults to ``"jumanpp"``):
+            The command of Juman++.
+        option (``str``, *optional*, defaults to ``""``):
+            Options passed to Juman++.
+        timeout (``float``, *optional*, defaults to ``30``):
+            Seconds to wait for the result of one sentence.
+    """
+
+    pattern: str = "EOS"
+
+    def __init__(self, command: str = "jumanpp", option: str = "", timeout: float = 30):
+        if shutil.which(command) is None:
+            raise Exception(f"Can't find JUMAN command: {command}")
+        self.command: List[str] = [command] + option.split()
+        self.timeout = timeout
+        self.process: Optional[asyncio.subprocess.Process] = None
+
+    def __del__(self) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Terminate the child process if it is running."""
+        process = self.process
+        if process is None:
+            return
+        self.process = None
+        if process.returncode is None:
+            try:
+                process.kill()
+            except ProcessLookupError:
+                pass
+
+    async def aclose(self) -> None:
+        """Terminate the child process and wait for it."""
+        process = self.process
+        self.close()
+        if process is not None:
+            await process.wait()
+
+    async def _start(self) -> asyncio.subprocess.Process:
+        if self.process is None or self.process.returncode is not None:
+            self.close()
+            self.process = await asyncio.create_subprocess_exec(
+                *self.command,
+                stdin=asyncio.subprocess.PIPE,
+                stdout=asyncio.subprocess.PIPE,
+                # Long outputs of Juman++ exceed the default limit of a line
+                limit=2**20,
+            )
+        return self.process
+
+    async def query_batch(self, sentences: List[str]) -> List[str]:
+        """Analyze sentences and return the raw output of Juman++ for each one.
+        Same as ``JumanppProcess.query_batch`` but the event loop runs while waiting for Juman++.
+
+        Args:
+            sentences (``List[str]``): Sentences to be analyzed.
+
+        Returns:
+            ``List[str]``: Juman++ output (without ``EOS``) for each sentence.
+        """
+        if len(sentences) == 0:
+            return []
+        process: asyncio.subprocess.Process = await self._start()
+        # The pipes are opened in _start
+        stdin: asyncio.StreamWriter = cast(asyncio.StreamWriter, process.stdin)
+        stdout: asyncio.StreamReader = cast(asyncio.StreamReader, process.stdout)
+        payload: bytes = "".join(
+            sentence.replace("\n", "").strip() + "\n" for sentence in sentences
+        ).encode("utf-8")
+        stdin.write(payload)
+        # Draining concurrently avoids the deadlock of filled pipes
+        drain: asyncio.Task = asyncio.ensure_future(stdin.drain())
+        results: List[str] = []
+        try:
+            for _ in sentences:
+                lines: List[str] = []
+                while True:
+                    data: bytes = await asyncio.wait_for(
+                        stdout.readline(), self.timeout
+                    )
+                    if not data:
+                        raise EOFError("Juman++ process terminated unexpectedly")
+                    line: str = data.decode("utf-8").rstrip()
+                    if line == self.pattern:
+                        break
+                    lines.append(line + "\n")
+                results.append("".join(lines))
+            await drain
+        except BaseException:
+            # The state of the pipes is unknown, so restart at the next query
+            drain.cancel()
+            self.close()
+            raise
+        return results
+
+
+class AsyncJumanppPool:
+    """A pool of ``AsyncJumanppProcess`` which runs at most *max_workers* processes at once.
+    Processes are started on demand. It must be used in one event loop.
+
+    Args:
+        max_workers (``int``, *optional*, defaults to ``1``):
+            The maximum number of Juman++ processes.
+        command (``str``, *optional*, defaults to ``"jumanpp"``):
+            The command of Juman++.
+        option (``str``, *optional*, defaults to ``""``):
+            Options passed to Juman++.
+        timeout (``float``, *optional*, defaults to ``30``):
+            Seconds to wait for the result of one sentence.
+    """
+
+    def __init__(
+        self,
+        max_workers: int = 1,
+        command: str = "jumanpp",
+        option: str = "",
+        timeout: float = 30,
+    ):
+        if max_workers < 1:
+            raise ValueError("max_workers must be positive")
+        self.max_workers = max_workers
+        self.command = command
+        self.option = option
+        self.timeout = timeout
+        self._idle: List[AsyncJumanppProcess] = []
+        self._num_workers: int = 0
+        self._condition: Optional[asyncio.Condition] = None
+
+    @property
+    def num_workers(self) -> int:
+        """The number of processes in the pool."""
+        return self._num_workers
+
+    def close(self) -> None:
+        """Terminate all the idle processes."""
+        for process in self._idle:
+            process.close()
+        self._num_workers -= len(self._idle)
+        self._idle = []
+
+    async def aclose(self) -> None:
+        """Terminate all the idle processes and wait for them."""
+        idle, self._idle = self._idle, []
+        self._num_workers -= len(idle)
+        for process in idle:
+            await process.aclose()
+
+    async def _query_chunk(self, sentences: List[str]) -> List[str]:
+        if self._condition is None:
+            self._condition = asyncio.Condition()
+        async with self._condition:
+            await self._condition.wait_for(
+                lambda: self._idle or self._num_workers < self.max_workers
+            )
+            if self._idle:
+                process: AsyncJumanppProcess = self._idle.pop()
+            else:
+                process = AsyncJumanppProcess(
+                    command=self.command, option=self.option, timeout=self.timeout
+                )
+                self._num_workers += 1
+        try:
+            return await process.query_batch(sentences)
+        finally:
+            async with self._condition:
+                self._idle.append(process)
+                self._condition.notify()
+
+    async def query_batch(self, sentences: List[str]) -> List[str]:
+        """Analyze sentences, dividing them among up to *max_workers* processes.
+
+        Args:
+            sentences (``List[str]``): Sentences to be analyzed.
+
+        Returns:
+            ``List[str]``: Juman++ output (without ``EOS``) for each sentence.
+        """
+        num_chunks: int = min(self.max_workers, len(sentences))
+        if num_chunks <= 1:
+            return await self._query_chunk(sentences)
+        chunk_size: int = -(-len(sentences) // num_chunks)
+        results: List[List[str]] = await asyncio.gather(
+            *[
+                self._query_chunk(sentences[i : i + chunk_size])
+                for i in range(0, len(sentences), chunk_size)
+            ]
+        )
+        return [spec for specs in results for spec in specs]
 
 
 class JumanTokenizer(MainTokenizerABC):
@@ -22,6 +554,15 @@ class JumanTokenizer(MainTokenizerABC):
         ignore_max_byte_error (``bool``, *optional*, defaults to ``False``):
             Whether or not to ignore error of max bytes (only valid with Juman and Sudachi).
             If valid, the tokenizer return empty list.
+        chunk_long_text (``bool``, *optional*, defaults to ``False``):
+            Whether to split a text over the max bytes into chunks at the ends of sentences or punctuations
+            and join the words of the chunks, instead of an error or an empty list.
+            The chunks are analyzed in parallel if *max_workers* is more than 1.
+        max_workers (``int``, *optional*, defaults to ``1``):
+            The maximum number of Juman++ processes running in parallel.
+            Calls from multiple threads and a batch are divided among the processes.
+        idle_timeout (``float``, *optional*, defaults to ``60``):
+            Seconds after which an idle Juman++ process (except one) is terminated.
 
     .. seealso::
         - Juman++ https://github.com/ku-nlp/jumanpp
@@ -33,19 +574,78 @@ class JumanTokenizer(MainTokenizerABC):
         do_lower_case: bool = False,
         normalize_text: bool = True,
         ignore_max_byte_error: bool = False,
+        chunk_long_text: bool = False,
+        max_workers: int = 1,
+        idle_timeout: float = 60,
     ):
         super().__init__(do_lower_case=do_lower_case, normalize_text=normalize_text)
         self.ignore_max_byte_error = ignore_max_byte_error
+        self.chunk_long_text = chunk_long_text
         try:
-            from pyknp import Juman
+            from pyknp import MList
         except ModuleNotFoundError as error:
             raise error.__class__(
                 "You need to install pyknp to use JumanTokenizer."
                 "See https://github.com/ku-nlp/pyknp for installation."
             )
-        self.juman = Juman()
+        self._mlist_class = MList
+        self.juman = JumanppPool(max_workers=max_workers, idle_timeout=idle_timeout)
+        # Pools for atokenize_batch, since asyncio subprocesses belong to an event loop
+        self._async_pools: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+
+    def _split(self, text: str) -> List[Tuple[str, str]]:
+        """Split a text into sentences passed to Juman++.
+
+        Returns:
+            ``List[Tuple[str, str]]``: Each sentence and its escaped one.
+        """
+        escaped: str = text.translate(JUMAN_ESCAPE_TABLE)
+        if len(escaped.encode()) <= JUMAN_MAX_BYTES:
+            return [(text, _escape_head(escaped))]
+        if self.chunk_long_text:
+            sentences: List[Tuple[str, str]] = []
+            start: int = 0
+            # Leave room for escaping the first character
+            for chunk in split_into_chunks(escaped, JUMAN_MAX_BYTES - 2):
+                end: int = start + len(chunk)
+                # Juman++ cannot analyze an empty line
+                if chunk.strip():
+                    sentences.append((text[start:end], _escape_head(chunk)))
+                start = end
+            return sentences
+        if self.ignore_max_byte_error:
+            return []
+        return [(text, _escape_head(escaped))]
+
+    def _postprocess(self, text: str, escaped: str, spec: Optional[str]) -> List[str]:
+        """Convert the output of Juman++ into words with the surfaces in *text*.
+
+        Raises:
+            JumanError: If Juman++ fails or its output cannot be parsed.
+        """
+        try:
+            if spec is None:
+                spec = self.juman.query(escaped)
+            result = self._mlist_class(spec)
+        except Exception as error:
+            raise JumanError(f"Juman++ failed to analyze the text: {text!r}") from error
+        tokens: List[str] = [mrph.midasi for mrph in result]
+        if escaped != text:
+            # Restore the escaped characters except whitespaces,
+            # which Juman++ outputs as "\u3000" as it does for spaces without escaping
+            position: int = 0
+            for i, token in enumerate(tokens):
+                index: int = escaped.find(token, position)
+                if index >= 0:
+                    position = index + len(token)
+                    surface: str = text[index:position]
+                    if not surface.isspace():
+                        tokens[i] = surface
+        if self.do_lower_case:
+            tokens = [token.lower() for token in tokens]
+        return tokens
 
-    def tokenize(self, text: str, **kwargs: Dict[str, Any]) -> List[str]:
+    def tokenize(self, text: str, **kwargs: Any) -> List[str]:
         """Converts a string in a sequence of words.
         Other kwargs (such as *never_split*) are ignored.
 
@@ -55,48 +655,108 @@ class JumanTokenizer(MainTokenizerABC):
         Returns:
             ``List[str]``: A list of words.
         """
-        if self.normalize_text:
-            text = unicodedata.normalize("NFKC", text)
-        # "#" and "@" at the beginning of a sentence causes timeout error
-        text = re.sub("^#", "＃", text)
-        text = re.sub("^@", "＠", text)
-        tokens = []
-        if not self.ignore_max_byte_error or len(text.encode()) <= 4096:
-            try:
-                result = self.juman.analysis(text)
-                use_underscore = False
-                use_quote = False
-            except ValueError:
-                # This error is occured because of the Juman's matter about space
-                if '"' in text:
-                    text = text.replace('"', "”")
-                    use_quote = True
-                else:
-                    use_quote = False
-                if re.search(r"\s", text):
-                    text = re.sub(r"\s", "_", text)
-                    use_underscore = True
-                else:
-                    use_underscore = False
+        return self.tokenize_batch([text], **kwargs)[0]
+
+    def _split_batch(
+        self, texts: List[str], is_normalized: bool = False
+    ) -> Tuple[List[Tuple[str, str]], List[int]]:
+        """Return sentences passed to Juman++ and the indices of their texts."""
+        sentences: List[Tuple[str, str]] = []
+        targets: List[int] = []
+        for i, text in enumerate(
+            self.normalize_batch(texts, is_normalized=is_normalized)
+        ):
+            for sentence in self._split(text):
+                sentences.append(sentence)
+                targets.append(i)
+        return sentences, targets
+
+    def _join_batch(
+        self,
+        num_texts: int,
+        sentences: List[Tuple[str, str]],
+        targets: List[int],
+        specs: Sequence[Optional[str]],
+    ) -> List[List[str]]:
+        batch_tokens: List[List[str]] = [[] for _ in range(num_texts)]
+        for i, (sentence, escaped), spec in zip(targets, sentences, specs):
+            batch_tokens[i].extend(self._postprocess(sentence, escaped, spec))
+        return batch_tokens
+
+    def tokenize_batch(
+        self, texts: List[str], is_normalized: bool = False, **kwargs: Any
+    ) -> List[List[str]]:
+        """Converts strings in sequences of words.
+        The texts are divided among Juman++ processes and sent in one round-trip each.
+        With *chunk_long_text*, the chunks of long texts are divided as well.
+        Other kwargs (such as *never_split*) are ignored.
+
+        Args:
+            texts (``List[str]``): Sequences to be encoded.
+            is_normalized (``bool``, *optional*, defaults to ``False``):
+                Whether the texts are already normalized by ``normalize_batch``.
+
+        Returns:
+            ``List[List[str]]``: A list of words for each sequence.
+
+        Raises:
+            JumanError: If Juman++ fails to analyze a text.
+        """
+        sentences, targets = self._split_batch(texts, is_normalized=is_normalized)
+        specs: Sequence[Optional[str]]
+        try:
+            specs = self.juman.query_batch([escaped for _, escaped in sentences])
+        except Exception:
+            # Find the erroneous text by analyzing one by one
+            specs = [None] * len(sentences)
+        return self._join_batch(len(texts), sentences, targets, specs)
+
+    async def aclose(self) -> None:
+        """Terminate Juman++ processes used by ``atokenize_batch`` in the running event loop.
+        Call this before the event loop is closed.
+        """
+        pool: Optional[AsyncJumanppPool] = self._async_pools.pop(
+            asyncio.get_running_loop(), None
+        )
+        if pool is not None:
+            await pool.aclose()
+
+    async def atokenize_batch(
+        self, texts: List[str], is_normalized: bool = False, **kwargs: Any
+    ) -> List[List[str]]:
+        """Asynchronous version of ``tokenize_batch``.
+        Juman++ processes for the running event loop are used through asyncio streams,
+        so the event loop is not blocked and concurrent calls are analyzed in parallel up to *max_workers*.
+
+        Args:
+            texts (``List[str]``): Sequences to be encoded.
+            is_normalized (``bool``, *optional*, defaults to ``False``):
+                Whether the texts are already normalized by ``normalize_batch``.
+
+        Returns:
+            ``List[List[str]]``: A list of words for each sequence.
+
+        Raises:
+            JumanError: If Juman++ fails to analyze a text.
+        """
+        loop: asyncio.AbstractEventLoop = asyncio.get_running_loop()
+        pool: Optional[AsyncJumanppPool] = self._async_pools.get(loop)
+        if pool is None:
+            pool = AsyncJumanppPool(max_workers=self.juman.max_workers)
+            self._async_pools[loop] = pool
+        sentences, targets = self._split_batch(texts, is_normalized=is_normalized)
+        escaped_sentences: List[str] = [escaped for _, escaped in sentences]
+        specs: List[str]
+        try:
+            specs = await pool.query_batch(escaped_sentences)
+        except Exception:
+            # Find the erroneous text by analyzing one by one
+            specs = []
+            for (sentence, _), escaped in zip(sentences, escaped_sentences):
                 try:
-                    result = self.juman.analysis(text)
-                except Exception:
-                    print(text)
-                    import sys
-
-                    sys.exit(1)
-            except Exception:
-                print(text)
-                import sys
-
-                sys.exit(1)
-            for mrph in result:
-                token = mrph.midasi
-                if self.do_lower_case:
-                    token = token.lower()
-                tokens.append(token)
-            if use_underscore:
-                tokens = list(filter(lambda x: x != "_", tokens))
-            if use_quote:
-                tokens = list(map(lambda x: x.replace("”", '"'), tokens))
-        return tokens
+                    specs.extend(await pool.query_batch([escaped]))
+                except Exception as error:
+                    raise JumanError(
+                        f"Juman++ failed to analyze the text: {sentence!r}"
+                    ) from error
+        return self._join_batch(len(texts), sentences, targets, specs)
@@ -0,0 +1,185 @@
+import os
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+
+from .base import MainTokenizerABC
+
+# Taggers of each thread keyed by the option, shared among tokenizers
+_local = threading.local()
+
+
+def get_taggers(mecab_option: str) -> Tuple[Any, Any]:
+    """Return the taggers of the current thread for the option, creating them at the first call.
+    A MeCab tagger must not be used by multiple threads at once,
+    so each thread has its own taggers, which are shared among tokenizers with the same option.
+
+    Args:
+        mecab_option (``str``): String passed to MeCab constructor.
+
+    Returns:
+        ``Tuple[fugashi.GenericTagger, fugashi.GenericTagger]``:
+        The tagger building nodes and the one writing surfaces separated by spaces.
+    """
+    taggers: Dict[str, Tuple[Any, Any]] = _local.__dict__.setdefault("taggers", {})
+    if mecab_option not in taggers:
+        import fugashi
+
+        taggers[mecab_option] = (
+            fugashi.GenericTagger(mecab_option),
+            fugashi.GenericTagger(mecab_option + " -Owakati"),
+        )
+    return taggers[mecab_option]
+
+
+class MecabTokenizer(MainTokenizerABC):
+    """Tokenizer to split into words using MeCab.
+    fugashi and a dictionary (ipadic, unidic-lite or unidic) are required to use.
+    Tokens are the same as ``transformers.models.bert_japanese.MecabTokenizer``.
+    Taggers are created for each thread and reused among tokenizers with the same dictionary and option,
+    so a tokenizer can be shared among threads.
+    You can import this module shortly:
+
+    .. code-block:: none
+
+       >> from jptranstokenizer.mainword import MecabTokenizer
+
+    Args:
+        do_lower_case (``bool``, *optional*, defaults to ``False``):
+            Whether or not to lowercase the input when tokenizing.
+        normalize_text (``bool``, *optional*, defaults to ``True``):
+            Whether to apply unicode normalization to text before tokenization.
+        mecab_dic (``str``, *optional*, defaults to ``"ipadic"``):
+            Name of dictionary to be used for MeCab initialization.
+            Maybe ``"ipadic"``, ``"unidic"``, or ``"unidic_lite"`` is used.
+            If you are using a system-installed dictionary, set this option to ``None`` and modify *mecab_option*.
+        mecab_option (``str``, *optional*):
+            String passed to MeCab constructor.
+
+    .. seealso::
+        - fugashi https://github.com/polm/fugashi
+    """
+
+    def __init__(
+        self,
+        do_lower_case: bool = False,
+        normalize_text: bool = True,
+        mecab_dic: Optional[str] = "ipadic",
+        mecab_option: Optional[str] = None,
+    ):
+        super().__init__(do_lower_case=do_lower_case, normalize_text=normalize_text)
+        try:
+            import fugashi  # noqa: F401
+        except ModuleNotFoundError as error:
+            raise error.__class__(
+                "You need to install fugashi to use MecabTokenizer."
+                "See https://pypi.org/project/fugashi/ for installation."
+            )
+
+        mecab_option = mecab_option or ""
+        if mecab_dic is not None:
+            dic_dir: str = get_mecab_dic_dir(mecab_dic)
+            mecabrc: str = os.path.join(dic_dir, "mecabrc")
+            mecab_option = f'-d "{dic_dir}" -r "{mecabrc}" ' + mecab_option
+        self.mecab_dic = mecab_dic
+        self.mecab_option = mecab_option
+        # Check the option here to raise an error at initialization
+        get_taggers(mecab_option)
+
+    @property
+    def mecab(self) -> Any:
+        """The ``fugashi.GenericTagger`` of the current thread."""
+        return get_taggers(self.mecab_option)[0]
+
+    def tokenize(self, text: str, **kwargs: Any) -> List[str]:
+        """Converts a string in a sequence of words.
+
+        Args:
+            text (``str``): A sequence to be encoded.
+            never_split (``List[str]``, *optional*):
+                Tokens which are not lowercased.
+
+        Returns:
+            ``List[str]``: A list of words.
+        """
+        return self.tokenize_batch([text], never_split=kwargs.get("never_split"))[0]
+
+    def tokenize_batch(
+        self, texts: List[str], is_normalized: bool = False, **kwargs: Any
+    ) -> List[List[str]]:
+        """Converts strings in sequences of words.
+
+        Args:
+            texts (``List[str]``): Sequences to be encoded.
+            is_normalized (``bool``, *optional*, defaults to ``False``):
+                Whether the texts are already normalized by ``normalize_batch``.
+            never_split (``List[str]``, *optional*):
+                Tokens which are not lowercased.
+
+        Returns:
+            ``List[List[str]]``: A list of words for each sequence.
+        """
+        texts = self.normalize_batch(texts, is_normalized=is_normalized)
+        mecab, wakati = get_taggers(self.mecab_option)
+        batch_tokens: List[List[str]] = []
+        for text in texts:
+            if text and (text[0].isspace() or text[-1].isspace()):
+                # The output of wakati is stripped, so it loses words of whitespaces at the ends
+                batch_tokens.append([word.surface for word in mecab(text)])
+            else:
+                # Surfaces never contain spaces, which MeCab skips
+                output: str = wakati.parse(text)
+                batch_tokens.append(output.split(" ") if output else [])
+        if self.do_lower_case:
+            never_split: Optional[List[str]] = kwargs.get("never_split")
+            no_lower = set(never_split) if never_split is not None else set()
+            batch_tokens = [
+                [token if token in no_lower else token.lower() for token in tokens]
+                for tokens in batch_tokens
+            ]
+        return batch_tokens
+
+
+def get_mecab_dic_dir(mecab_dic: str) -> str:
+    """Return the directory of the MeCab dictionary installed as a python package.
+
+    Args:
+        mecab_dic (``str``): ``"ipadic"``, ``"unidic_lite"``, or ``"unidic"``.
+
+    Returns:
+        ``str``: The path to the dictionary directory.
+    """
+    if mecab_dic == "ipadic":
+        try:
+            import ipadic
+        except ModuleNotFoundError as error:
+            raise error.__class__(
+                "The ipadic dictionary is not installed. "
+                "See https://github.com/polm/ipadic-py for installation."
+            )
+        dic_dir = ipadic.DICDIR
+    elif mecab_dic == "unidic_lite":
+        try:
+            import unidic_lite
+        except ModuleNotFoundError as error:
+            raise error.__class__(
+                "The unidic_lite dictionary is not installed. "
+                "See https://github.com/polm/unidic-lite for installation."
+            )
+        dic_dir = unidic_lite.DICDIR
+    elif mecab_dic == "unidic":
+        try:
+            import unidic
+        except ModuleNotFoundError as error:
+            raise error.__class__(
+                "The unidic dictionary is not installed. "
+                "See https://github.com/polm/unidic-py for installation."
+            )
+        dic_dir = unidic.DICDIR
+        if not os.path.isdir(dic_dir):
+            raise RuntimeError(
+                "The unidic dictionary itself is not found. "
+                "See https://github.com/polm/unidic-py for installation."
+            )
+    else:
+        raise ValueError("Invalid mecab_dic is specified.")
+    return dic_dir
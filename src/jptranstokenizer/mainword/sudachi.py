@@ -1,7 +1,10 @@
-import unicodedata
-from typing import Any, Dict, List, Optional
+import threading
+from typing import Any, List, Optional
 
-from .base import MainTokenizerABC
+from .base import MainTokenizerABC, split_into_chunks
+
+# The maximum bytes of an input of Sudachi
+SUDACHI_MAX_BYTES: int = 49149
 
 # cf. https://pypi.org/project/SudachiTra/
 # cf. https://github.com/WorksApplications/SudachiTra/blob/main/sudachitra/tokenization_bert_sudachipy.py
@@ -12,6 +15,7 @@ class SudachiTokenizer(MainTokenizerABC):
     """Tokenizer to split into words using Sudachi.
     SudachiTra is required to use.
     For installation of SudachiTra, see https://pypi.org/project/SudachiTra/
+    The dictionary is shared and each thread analyzes texts with its own tokenizer of SudachiPy.
     You can import this module shortly:
 
     .. code-block:: none
@@ -37,6 +41,9 @@ class SudachiTokenizer(MainTokenizerABC):
         ignore_max_byte_error (``bool``, *optional*, defaults to ``False``):
             Whether or not to ignore error of max bytes (only valid with Juman and Sudachi).
             If valid, the tokenizer return empty list.
+        chunk_long_text (``bool``, *optional*, defaults to ``False``):
+            Whether to split a text over the max bytes into chunks at the ends of sentences or punctuations
+            and join the words of the chunks, instead of an error or an empty list.
 
     .. seealso::
         - SudachiTra https://github.com/WorksApplications/SudachiTra
@@ -52,10 +59,12 @@ class SudachiTokenizer(MainTokenizerABC):
         do_lower_case: bool = False,
         normalize_text: bool = True,
         ignore_max_byte_error: bool = False,
+        chunk_long_text: bool = False,
     ):
 
         super().__init__(do_lower_case=do_lower_case, normalize_text=normalize_text)
         self.ignore_max_byte_error = ignore_max_byte_error
+        self.chunk_long_text = chunk_long_text
         try:
             from sudachitra.sudachipy_word_tokenizer import SudachipyWordTokenizer
             from sudachitra.word_formatter import word_formatter
@@ -73,8 +82,23 @@ class SudachiTokenizer(MainTokenizerABC):
         self.word_formatter = word_formatter(
             "surface", self.sudachi_tokenizer.sudachi_dict
         )
+        # A tokenizer of Sudachi must not be used by multiple threads at once,
+        # so each thread creates its own from the shared dictionary
+        self._local = threading.local()
+        self._local.sudachi = self.sudachi_tokenizer.sudachi
+
+    @property
+    def sudachi(self) -> Any:
+        """The tokenizer of SudachiPy for the current thread."""
+        sudachi = getattr(self._local, "sudachi", None)
+        if sudachi is None:
+            sudachi = self.sudachi_tokenizer.sudachi_dict.create(
+                self.sudachi_tokenizer.split_mode
+            )
+            self._local.sudachi = sudachi
+        return sudachi
 
-    def tokenize(self, text: str, **kwargs: Dict[str, Any]) -> List[str]:
+    def tokenize(self, text: str, **kwargs: Any) -> List[str]:
         """Converts a string in a sequence of words.
         Other kwargs (such as *never_split*) are ignored.
 
@@ -84,16 +108,40 @@ class SudachiTokenizer(MainTokenizerABC):
         Returns:
             ``List[str]``: A list of words.
         """
-        if self.normalize_text:
-            text = unicodedata.normalize("NFKC", text)
-        tokens: List[str]
-        if self.ignore_max_byte_error and len(text.encode()) > 49149:
-            tokens = []
-        else:
-            tokens = [
-                self.word_formatter(token)
-                for token in self.sudachi_tokenizer.tokenize(text)
-            ]
+        return self.tokenize_batch([text])[0]
+
+    def tokenize_batch(
+        self, texts: List[str], is_normalized: bool = False, **kwargs: Any
+    ) -> List[List[str]]:
+        """Converts strings in sequences of words.
+        The morpheme list of Sudachi is reused over the batch.
+        Other kwargs (such as *never_split*) are ignored.
+
+        Args:
+            texts (``List[str]``): Sequences to be encoded.
+            is_normalized (``bool``, *optional*, defaults to ``False``):
+                Whether the texts are already normalized by ``normalize_batch``.
+
+        Returns:
+            ``List[List[str]]``: A list of words for each sequence.
+        """
+        texts = self.normalize_batch(texts, is_normalized=is_normalized)
+        sudachi = self.sudachi
+        word_formatter = self.word_formatter
+        morphemes = None
+        batch_tokens: List[List[str]] = []
+        for text in texts:
+            chunks: List[str] = [text]
+            if len(text.encode()) > SUDACHI_MAX_BYTES:
+                if self.chunk_long_text:
+                    chunks = split_into_chunks(text, SUDACHI_MAX_BYTES)
+                elif self.ignore_max_byte_error:
+                    chunks = []
+            tokens: List[str] = []
+            for chunk in chunks:
+                morphemes = sudachi.tokenize(chunk, out=morphemes)
+                tokens.extend(word_formatter(token) for token in morphemes)
             if self.do_lower_case:
                 tokens = [token.lower() for token in tokens]
-        return tokens
+            batch_tokens.append(tokens)
+        return batch_tokens
@@ -83,7 +83,7 @@ PUBLIC_AVAILABLE_SETTING_MAP: Dict[str, Dict[str, Union[str, bool]]] = {
     },
 }
 
-IZUMILAB_SETTING_MAP: Dict[str, Dict[str, str]] = {
+IZUMILAB_SETTING_MAP: Dict[str, Dict[str, Union[str, bool]]] = {
     f"izumi-lab/{model_name}": {
         "word_tokenizer_type": "mecab",
         "tokenizer_class": "BertJapaneseTokenizer",
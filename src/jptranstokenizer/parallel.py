@@ -0,0 +1,167 @@
+import hashlib
+import math
+import os
+import pickle
+from concurrent.futures import Executor, Future, ProcessPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+
+# Tokenizer replicas in a worker process, keyed by the digest of the pickled tokenizer
+_worker_tokenizers: Dict[str, Any] = {}
+
+
+def _init_worker(digest: str, state: bytes) -> None:
+    _worker_tokenizers[digest] = pickle.loads(state)
+
+
+class _TokenizerNotLoaded(Exception):
+    """Raised in a worker which has no replica of the tokenizer yet."""
+
+
+def _encode_chunk(
+    digest: str, state: Optional[bytes], texts: List[str], kwargs: Dict[str, Any]
+) -> List[List[int]]:
+    tokenizer = _worker_tokenizers.get(digest)
+    if tokenizer is None:
+        if state is None:
+            raise _TokenizerNotLoaded(digest)
+        tokenizer = pickle.loads(state)
+        _worker_tokenizers[digest] = tokenizer
+    return tokenizer.encode_batch(texts, add_special_tokens=False, **kwargs)
+
+
+def resolve_n_jobs(n_jobs: Optional[int]) -> int:
+    """Convert ``n_jobs`` into the number of processes.
+    ``None`` means 1, and a negative value counts back from the number of CPUs
+    (``-1`` means all CPUs) like joblib.
+    """
+    if n_jobs is None or n_jobs == 0:
+        return 1
+    elif n_jobs < 0:
+        return max((os.cpu_count() or 1) + 1 + n_jobs, 1)
+    else:
+        return n_jobs
+
+
+def config_key(obj: Any) -> Tuple[Any, ...]:
+    """Return a cheap fingerprint of the attributes of an object.
+    Scalar values are compared themselves, and the other values by their identities
+    (and sizes for ``dict``, ``list`` and ``set``, which grow in place such as added tokens).
+    """
+    key: List[Tuple[Any, ...]] = []
+    for name, value in vars(obj).items():
+        if value is None or isinstance(value, (str, int, float, bool)):
+            key.append((name, value))
+        elif type(value) in (dict, list, set):
+            key.append((name, id(value), len(value)))
+        else:
+            key.append((name, id(value)))
+    return tuple(key)
+
+
+def split_chunks(texts: List[str], chunk_size: int) -> List[List[str]]:
+    """Split texts into chunks of ``chunk_size`` keeping the order."""
+    return [texts[i : i + chunk_size] for i in range(0, len(texts), chunk_size)]
+
+
+class ParallelEncoder:
+    """Encodes texts into ids with replicas of a tokenizer in worker processes.
+    A replica is unpickled from the tokenizer once per worker, so the tokenizer
+    must rebuild unpicklable members (such as a Juman++ process) in ``__setstate__``.
+    The pickled tokenizer and the process pool are kept while the attributes of the tokenizer
+    are unchanged and reused over calls. Call ``invalidate`` after modifying its members in place.
+    Workers of a given *executor* receive the pickled tokenizer only when they don't have it.
+
+    Args:
+        tokenizer: The tokenizer to be replicated.
+            ``encode_batch`` is called in workers.
+    """
+
+    def __init__(self, tokenizer: Any):
+        self.tokenizer = tokenizer
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._pool_key: Optional[Tuple[str, int]] = None
+        self._state: Optional[Tuple[str, bytes]] = None
+        self._state_key: Optional[Tuple[Any, ...]] = None
+
+    def __del__(self) -> None:
+        self.shutdown()
+
+    def shutdown(self) -> None:
+        """Shut down the process pool if it is running."""
+        pool = getattr(self, "_pool", None)
+        if pool is not None:
+            pool.shutdown(wait=False)
+        self._pool = None
+        self._pool_key = None
+
+    def invalidate(self) -> None:
+        """Discard the pickled tokenizer so that it is pickled again in the next call."""
+        self._state = None
+        self._state_key = None
+
+    def _get_state(self) -> Tuple[str, bytes]:
+        # The digest and the pickled tokenizer, which are reused while the attributes are unchanged
+        key: Tuple[Any, ...] = config_key(self.tokenizer)
+        if self._state is None or self._state_key != key:
+            state: bytes = pickle.dumps(self.tokenizer)
+            self._state = (hashlib.sha1(state).hexdigest(), state)
+            self._state_key = key
+        return self._state
+
+    def encode(
+        self,
+        texts: List[str],
+        n_jobs: Optional[int] = None,
+        executor: Optional[Executor] = None,
+        chunk_size: Optional[int] = None,
+        **kwargs: Any,
+    ) -> List[List[int]]:
+        """Encode texts into ids in parallel.
+        Texts are split into small chunks which are scheduled to idle workers,
+        and results are returned in the input order.
+
+        Args:
+            texts (``List[str]``): Sequences to be encoded.
+            n_jobs (``int``, *optional*):
+                The number of worker processes. ``-1`` means all CPUs.
+                Ignored when *executor* is specified.
+            executor (``concurrent.futures.Executor``, *optional*):
+                An executor running workers in other processes, such as ``ProcessPoolExecutor``.
+            chunk_size (``int``, *optional*):
+                The number of texts sent to a worker at once.
+                By default, texts are split into four chunks per worker (at most 1024 texts each).
+
+        Returns:
+            ``List[List[int]]``: Ids for each sequence.
+        """
+        digest, state = self._get_state()
+        num_workers: int = resolve_n_jobs(n_jobs)
+        if executor is None:
+            if self._pool is None or self._pool_key != (digest, num_workers):
+                self.shutdown()
+                self._pool = ProcessPoolExecutor(
+                    max_workers=num_workers,
+                    initializer=_init_worker,
+                    initargs=(digest, state),
+                )
+                self._pool_key = (digest, num_workers)
+            executor = self._pool
+        else:
+            num_workers = getattr(executor, "_max_workers", num_workers)
+        if chunk_size is None:
+            chunk_size = min(max(math.ceil(len(texts) / (num_workers * 4)), 1), 1024)
+        chunks: List[List[str]] = split_chunks(texts, chunk_size)
+        # The tokenizer is sent only for chunks scheduled to workers which don't have it
+        futures: List[Future] = [
+            executor.submit(_encode_chunk, digest, None, chunk, kwargs)
+            for chunk in chunks
+        ]
+        retries: Dict[int, Future] = {}
+        for i, future in enumerate(futures):
+            if isinstance(future.exception(), _TokenizerNotLoaded):
+                retries[i] = executor.submit(
+                    _encode_chunk, digest, state, chunks[i], kwargs
+                )
+        for i, future in retries.items():
+            futures[i] = future
+        return [ids for future in futures for ids in future.result()]
@@ -0,0 +1,288 @@
+import itertools
+import json
+import os
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    Union,
+)
+
+if TYPE_CHECKING:
+    import numpy as np
+
+CHECKPOINT_FILE: str = "checkpoint_{rank:05d}.json"
+SHARD_FILE: str = "shard_{rank:05d}_{index:05d}"
+
+
+def get_dtype(vocab_size: int) -> str:
+    """Return the smallest unsigned integer type which can hold all the token ids.
+
+    Args:
+        vocab_size (``int``): The number of tokens including added tokens.
+
+    Returns:
+        ``str``: ``"uint8"``, ``"uint16"``, ``"uint32"``, or ``"uint64"``.
+    """
+    for bits in [8, 16, 32]:
+        if vocab_size <= 2**bits:
+            return f"uint{bits}"
+    return "uint64"
+
+
+def read_texts(
+    input_files: List[Union[str, os.PathLike]],
+    input_format: Optional[str] = None,
+    text_key: str = "text",
+) -> Iterator[str]:
+    """Yield texts from files one by one.
+
+    Args:
+        input_files (``List[str]``): Paths to the corpus files.
+        input_format (``str``, *optional*):
+            ``"jsonl"`` or ``"text"`` (one document per line).
+            If ``None``, files ending with ``.jsonl`` or ``.json`` are read as JSONL.
+        text_key (``str``, *optional*, defaults to ``"text"``):
+            The key of texts in JSONL.
+    """
+    for input_file in input_files:
+        file_format: Optional[str] = input_format
+        if file_format is None:
+            file_format = (
+                "jsonl"
+                if os.fspath(input_file).endswith((".jsonl", ".json"))
+                else "text"
+            )
+        if file_format not in ["jsonl", "text"]:
+            raise ValueError(f"Invalid input format '{file_format}' is specified.")
+        with open(input_file, encoding="utf-8") as f:
+            for line in f:
+                line = line.rstrip("\n")
+                if file_format == "jsonl":
+                    yield json.loads(line)[text_key] if line.strip() else ""
+                else:
+                    yield line
+
+
+def batched(iterable: Iterable[Any], batch_size: int) -> Iterator[List[Any]]:
+    """Yield lists of *batch_size* items (the last one may be shorter)."""
+    iterator: Iterator[Any] = iter(iterable)
+    while True:
+        batch: List[Any] = list(itertools.islice(iterator, batch_size))
+        if not batch:
+            return
+        yield batch
+
+
+class ShardWriter:
+    """Writes token ids of documents into fixed-size memory-mapped shards.
+    Each shard consists of ``{name}.bin`` (token ids) and ``{name}.idx.npy``
+    (int64 offsets of documents, whose length is the number of documents + 1).
+    A document is not split across shards, so a shard is larger than
+    *shard_size* only if it consists of one long document.
+
+    Args:
+        output_dir (``str``): The output directory.
+        shard_size (``int``): The number of tokens in a shard.
+        dtype (``str``): The type of token ids.
+        rank (``int``, *optional*, defaults to ``0``): Used in the file names.
+        shard_index (``int``, *optional*, defaults to ``0``): The index of the first shard.
+    """
+
+    def __init__(
+        self,
+        output_dir: Union[str, os.PathLike],
+        shard_size: int,
+        dtype: str,
+        rank: int = 0,
+        shard_index: int = 0,
+    ):
+        try:
+            import numpy as np
+        except ModuleNotFoundError as error:
+            raise error.__class__(
+                "You need to install numpy to write shards."
+                "See https://numpy.org/install/ for installation."
+            )
+        self.np = np
+        self.output_dir = output_dir
+        self.shard_size = shard_size
+        self.dtype = dtype
+        self.rank = rank
+        self.shard_index = shard_index
+        self._memmap: Optional["np.memmap"] = None
+        self._offsets: List[int] = [0]
+
+    def _name(self) -> str:
+        return SHARD_FILE.format(rank=self.rank, index=self.shard_index)
+
+    def _open(self, size: int) -> "np.memmap":
+        path: str = os.path.join(self.output_dir, self._name() + ".bin")
+        self._memmap = self.np.memmap(path, dtype=self.dtype, mode="w+", shape=(size,))
+        self._offsets = [0]
+        return self._memmap
+
+    @property
+    def num_tokens(self) -> int:
+        """The number of tokens written in the current shard."""
+        return self._offsets[-1]
+
+    def write(self, ids: List[int]) -> Optional[Dict[str, Any]]:
+        """Write a document.
+
+        Returns:
+            ``Dict[str, Any]``: Information of the shard if it is closed because it is full.
+        """
+        closed: Optional[Dict[str, Any]] = None
+        if self._memmap is not None and self.num_tokens + len(ids) > len(self._memmap):
+            closed = self.close()
+        # Bound after closing, so that no reference keeps the map of the closed shard
+        memmap: "np.memmap" = (
+            self._open(max(self.shard_size, len(ids)))
+            if self._memmap is None
+            else self._memmap
+        )
+        end: int = self.num_tokens + len(ids)
+        memmap[self.num_tokens : end] = ids
+        self._offsets.append(end)
+        return closed
+
+    def close(self) -> Optional[Dict[str, Any]]:
+        """Flush the current shard, cutting off the unused region.
+
+        Returns:
+            ``Dict[str, Any]``: Information of the shard, or ``None`` if no shard is open.
+        """
+        if self._memmap is None:
+            return None
+        name: str = self._name()
+        num_tokens: int = self.num_tokens
+        self._memmap.flush()
+        # The map is released with the last reference before the file is cut off
+        del self._memmap
+        os.truncate(
+            os.path.join(self.output_dir, name + ".bin"),
+            num_tokens * self.np.dtype(self.dtype).itemsize,
+        )
+        self._memmap = None
+        self.np.save(
+            os.path.join(self.output_dir, name + ".idx.npy"),
+            self.np.asarray(self._offsets, dtype=self.np.int64),
+        )
+        shard: Dict[str, Any] = {
+            "name": name,
+            "num_tokens": num_tokens,
+            "num_documents": len(self._offsets) - 1,
+        }
+        self.shard_index += 1
+        self._offsets = [0]
+        return shard
+
+
+def load_checkpoint(output_dir: Union[str, os.PathLike], rank: int) -> Dict[str, Any]:
+    """Load the checkpoint of the rank, or return the initial state."""
+    path: str = os.path.join(output_dir, CHECKPOINT_FILE.format(rank=rank))
+    if os.path.isfile(path):
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    return {"num_lines": 0, "shards": [], "done": False}
+
+
+def save_checkpoint(
+    output_dir: Union[str, os.PathLike], rank: int, checkpoint: Dict[str, Any]
+) -> None:
+    """Save the checkpoint atomically."""
+    path: str = os.path.join(output_dir, CHECKPOINT_FILE.format(rank=rank))
+    with open(path + ".tmp", "w", encoding="utf-8") as f:
+        json.dump(checkpoint, f, ensure_ascii=False, indent=2)
+    os.replace(path + ".tmp", path)
+
+
+def pretokenize(
+    tokenizer: Any,
+    input_files: List[Union[str, os.PathLike]],
+    output_dir: Union[str, os.PathLike],
+    input_format: Optional[str] = None,
+    text_key: str = "text",
+    shard_size: int = 2**26,
+    batch_size: int = 1000,
+    rank: int = 0,
+    world_size: int = 1,
+    add_special_tokens: bool = False,
+    n_jobs: Optional[int] = None,
+) -> Dict[str, Any]:
+    """Tokenize corpora into memory-mapped shards of token ids.
+    Documents are streamed, so the memory usage is bounded by *batch_size* and *shard_size*.
+    Line ``i`` of the whole input is processed by the rank ``i % world_size``.
+    A checkpoint is saved whenever a shard is completed,
+    and the processing resumes from it when called again with the same arguments.
+
+    Args:
+        tokenizer (``JapaneseTransformerTokenizer``): The tokenizer.
+        input_files (``List[str]``): Paths to the corpus files.
+        output_dir (``str``): The output directory.
+        input_format (``str``, *optional*):
+            ``"jsonl"`` or ``"text"``. If ``None``, detected from the extension.
+        text_key (``str``, *optional*, defaults to ``"text"``): The key of texts in JSONL.
+        shard_size (``int``, *optional*, defaults to ``2**26``): The number of tokens in a shard.
+        batch_size (``int``, *optional*, defaults to ``1000``): The number of documents encoded at once.
+        rank (``int``, *optional*, defaults to ``0``): The rank of this process.
+        world_size (``int``, *optional*, defaults to ``1``): The number of processes.
+        add_special_tokens (``bool``, *optional*, defaults to ``False``):
+            Whether to add special tokens such as ``[CLS]`` and ``[SEP]`` to each document.
+        n_jobs (``int``, *optional*): The number of processes to encode texts.
+
+    Returns:
+        ``Dict[str, Any]``: The final checkpoint, listing the shards.
+    """
+    if not 0 <= rank < world_size:
+        raise ValueError("rank must be in [0, world_size)")
+    os.makedirs(output_dir, exist_ok=True)
+    checkpoint: Dict[str, Any] = load_checkpoint(output_dir, rank)
+    if checkpoint["done"]:
+        return checkpoint
+    dtype: str = get_dtype(len(tokenizer))
+    checkpoint.update(dtype=dtype, vocab_size=len(tokenizer), world_size=world_size)
+    writer: ShardWriter = ShardWriter(
+        output_dir,
+        shard_size=shard_size,
+        dtype=dtype,
+        rank=rank,
+        shard_index=len(checkpoint["shards"]),
+    )
+
+    lines: Iterator[Tuple[int, str]] = (
+        (i, text)
+        for i, text in itertools.islice(
+            enumerate(read_texts(input_files, input_format, text_key)),
+            checkpoint["num_lines"],
+            None,
+        )
+        if i % world_size == rank
+    )
+    for batch in batched(lines, batch_size):
+        batch_ids: List[List[int]] = tokenizer(
+            [text for _, text in batch],
+            add_special_tokens=add_special_tokens,
+            n_jobs=n_jobs,
+            return_attention_mask=False,
+            return_token_type_ids=False,
+        )["input_ids"]
+        for (line_index, _), ids in zip(batch, batch_ids):
+            shard: Optional[Dict[str, Any]] = writer.write(ids)
+            if shard is not None:
+                # Lines before the current document are all in the closed shards
+                checkpoint["shards"].append(shard)
+                checkpoint["num_lines"] = line_index
+                save_checkpoint(output_dir, rank, checkpoint)
+    shard = writer.close()
+    if shard is not None:
+        checkpoint["shards"].append(shard)
+    checkpoint["done"] = True
+    save_checkpoint(output_dir, rank, checkpoint)
+    return checkpoint
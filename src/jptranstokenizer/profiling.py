@@ -0,0 +1,188 @@
+import heapq
+import itertools
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, List, NamedTuple, Optional, Set, Tuple
+
+# Stages in the order of processing
+STAGES: List[str] = ["normalize", "word", "subword", "convert", "prepare", "total"]
+
+
+class SlowInput(NamedTuple):
+    """An input whose processing exceeded the threshold or raised an error."""
+
+    text: str
+    stage: str
+    seconds: float
+    error: Optional[str] = None
+
+
+class TokenizerProfiler:
+    """Collects cumulative time of each stage of tokenization and captures slow inputs.
+    Enable it with ``JapaneseTransformerTokenizer.enable_profiling``.
+
+    The stages are:
+
+    - ``"normalize"``: Unicode normalization before word tokenization.
+    - ``"word"``: The main word tokenizer (MeCab, Juman++, Sudachi and so on).
+    - ``"subword"``: WordPiece, sentencepiece or character tokenization.
+    - ``"convert"``: Conversion of tokens into ids.
+    - ``"prepare"``: Adding special tokens, truncation and padding.
+    - ``"total"``: The whole call of the tokenizer.
+
+    You can import this module shortly:
+
+    .. code-block:: none
+
+       >> from jptranstokenizer.profiling import TokenizerProfiler
+
+    Args:
+        slow_threshold (``float``, *optional*):
+            Seconds of the word and subword tokenization of a text over which the text is recorded.
+            If specified, texts are analyzed one by one so that each of them is timed.
+        max_slow_inputs (``int``, *optional*, defaults to ``100``):
+            The number of recorded inputs. The slowest ones are kept.
+    """
+
+    def __init__(
+        self, slow_threshold: Optional[float] = None, max_slow_inputs: int = 100
+    ):
+        self.slow_threshold = slow_threshold
+        self.max_slow_inputs = max_slow_inputs
+        self._lock = threading.Lock()
+        self._seconds: Dict[str, float] = {}
+        self._calls: Dict[str, int] = {}
+        self._items: Dict[str, int] = {}
+        self._slow_inputs: List[Tuple[float, int, SlowInput]] = []
+        self._counter = itertools.count()
+        self._in_flight: Dict[int, Tuple[str, List[str], float]] = {}
+        self._hooks: List[Callable[[str, float, int], None]] = []
+        self._slow_input_hooks: List[Callable[[SlowInput], None]] = []
+        # Stages running in each thread, so that nested calls are counted once
+        self._local = threading.local()
+
+    def add_hook(self, hook: Callable[[str, float, int], None]) -> None:
+        """Register a function called with ``(stage, seconds, num_items)`` whenever a stage finishes."""
+        self._hooks.append(hook)
+
+    def add_slow_input_hook(self, hook: Callable[[SlowInput], None]) -> None:
+        """Register a function called with ``SlowInput`` whenever a slow or failed input is recorded."""
+        self._slow_input_hooks.append(hook)
+
+    def record(self, stage: str, seconds: float, num_items: int = 1) -> None:
+        """Add the time of a stage.
+
+        Args:
+            stage (``str``): The name of the stage.
+            seconds (``float``): Elapsed seconds.
+            num_items (``int``, *optional*, defaults to ``1``): The number of processed texts.
+        """
+        with self._lock:
+            self._seconds[stage] = self._seconds.get(stage, 0.0) + seconds
+            self._calls[stage] = self._calls.get(stage, 0) + 1
+            self._items[stage] = self._items.get(stage, 0) + num_items
+        for hook in self._hooks:
+            hook(stage, seconds, num_items)
+
+    def record_input(
+        self, text: str, stage: str, seconds: float, error: Optional[str] = None
+    ) -> None:
+        """Record the input if it is slower than the threshold or it failed."""
+        if error is None and (
+            self.slow_threshold is None or seconds < self.slow_threshold
+        ):
+            return
+        slow_input: SlowInput = SlowInput(text, stage, seconds, error)
+        # Failed inputs are kept in preference to slow ones
+        priority: float = float("inf") if error is not None else seconds
+        with self._lock:
+            item = (priority, next(self._counter), slow_input)
+            if len(self._slow_inputs) < self.max_slow_inputs:
+                heapq.heappush(self._slow_inputs, item)
+            else:
+                heapq.heappushpop(self._slow_inputs, item)
+        for hook in self._slow_input_hooks:
+            hook(slow_input)
+
+    @contextmanager
+    def timer(self, stage: str, texts: Optional[List[str]] = None) -> Iterator[None]:
+        """Time the block as the stage.
+        While the block runs, *texts* are listed by ``in_flight``,
+        and they are recorded as failed inputs if the block raises an error.
+
+        Args:
+            stage (``str``): The name of the stage.
+            texts (``List[str]``, *optional*): The texts processed in the block.
+        """
+        active: Set[str] = self._local.__dict__.setdefault("active", set())
+        if stage in active:
+            yield
+            return
+        active.add(stage)
+        key: int = next(self._counter)
+        start: float = time.perf_counter()
+        if texts is not None:
+            with self._lock:
+                self._in_flight[key] = (stage, texts, start)
+        try:
+            yield
+        except BaseException as error:
+            seconds: float = time.perf_counter() - start
+            for text in texts or []:
+                self.record_input(text, stage, seconds, error=repr(error))
+            raise
+        finally:
+            active.discard(stage)
+            if texts is not None:
+                with self._lock:
+                    self._in_flight.pop(key, None)
+        self.record(
+            stage, time.perf_counter() - start, 1 if texts is None else len(texts)
+        )
+
+    def in_flight(self) -> List[Tuple[str, List[str], float]]:
+        """Texts being processed now, which helps to find inputs making a backend hang.
+
+        Returns:
+            ``List[Tuple[str, List[str], float]]``: The stage, the texts and the elapsed seconds.
+        """
+        now: float = time.perf_counter()
+        with self._lock:
+            return [
+                (stage, texts, now - start)
+                for stage, texts, start in self._in_flight.values()
+            ]
+
+    @property
+    def slow_inputs(self) -> List[SlowInput]:
+        """Recorded inputs from the slowest (failed ones first)."""
+        with self._lock:
+            items = sorted(self._slow_inputs, key=lambda item: (-item[0], item[1]))
+        return [slow_input for _, _, slow_input in items]
+
+    def stats(self) -> Dict[str, Dict[str, float]]:
+        """Cumulative statistics of each stage.
+
+        Returns:
+            ``Dict[str, Dict[str, float]]``: ``seconds``, ``calls`` and ``items`` of each stage.
+        """
+        with self._lock:
+            stages: List[str] = [stage for stage in STAGES if stage in self._seconds]
+            stages += [stage for stage in self._seconds if stage not in STAGES]
+            return {
+                stage: {
+                    "seconds": self._seconds[stage],
+                    "calls": self._calls[stage],
+                    "items": self._items[stage],
+                }
+                for stage in stages
+            }
+
+    def reset(self) -> None:
+        """Clear the statistics and the recorded inputs."""
+        with self._lock:
+            self._seconds.clear()
+            self._calls.clear()
+            self._items.clear()
+            self._slow_inputs.clear()
@@ -0,0 +1,391 @@
+import asyncio
+import contextlib
+import json
+import os
+import signal
+import time
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple, Union
+
+# Kinds of requests and their keys in responses
+KINDS: Dict[str, str] = {"encode": "input_ids", "tokenize": "tokens"}
+REASONS: Dict[int, str] = {
+    200: "OK",
+    400: "Bad Request",
+    404: "Not Found",
+    405: "Method Not Allowed",
+    413: "Payload Too Large",
+    500: "Internal Server Error",
+    504: "Gateway Timeout",
+}
+
+
+class DeadlineExceeded(Exception):
+    """Raised when a request is not processed before its deadline."""
+
+
+class _Request(NamedTuple):
+    key: Tuple[str, bool]
+    text: str
+    future: "asyncio.Future[Any]"
+    deadline: Optional[float]
+
+
+class MicroBatcher:
+    """Group texts of concurrent requests into batches of the tokenizer.
+    A batch is processed when it has *max_batch_size* texts or *max_wait_ms* has passed since its first text,
+    and batches are processed concurrently with the asynchronous methods of the tokenizer.
+    It must be used in one event loop.
+    You can import this module shortly:
+
+    .. code-block:: none
+
+       >> from jptranstokenizer.serve import MicroBatcher
+
+    Args:
+        tokenizer (``JapaneseTransformerTokenizer``): The tokenizer.
+        max_batch_size (``int``, *optional*, defaults to ``64``): The maximum number of texts in a batch.
+        max_wait_ms (``float``, *optional*, defaults to ``5``):
+            Milliseconds to wait for other texts after the first text of a batch arrives.
+    """
+
+    def __init__(
+        self, tokenizer: Any, max_batch_size: int = 64, max_wait_ms: float = 5
+    ):
+        if max_batch_size < 1:
+            raise ValueError("max_batch_size must be positive")
+        self.tokenizer = tokenizer
+        self.max_batch_size = max_batch_size
+        self.max_wait_ms = max_wait_ms
+        self.stats: Dict[str, int] = {"texts": 0, "batches": 0, "expired": 0}
+        self._pending: List[_Request] = []
+        self._arrived: Optional[asyncio.Event] = None
+        self._collector: Optional[asyncio.Task] = None
+        self._tasks: set = set()
+
+    async def submit(
+        self,
+        kind: str,
+        text: str,
+        add_special_tokens: bool = True,
+        deadline: Optional[float] = None,
+    ) -> List[Any]:
+        """Tokenize or encode a text in a batch with texts of other requests.
+
+        Args:
+            kind (``str``): ``"encode"`` (token ids) or ``"tokenize"`` (tokens).
+            text (``str``): A text.
+            add_special_tokens (``bool``, *optional*, defaults to ``True``): (For encode) Whether to add special tokens.
+            deadline (``float``, *optional*): The deadline in ``time.monotonic()``.
+
+        Returns:
+            ``List[int]`` or ``List[str]``: The ids or tokens of the text.
+
+        Raises:
+            DeadlineExceeded: If the text is not processed before the deadline.
+        """
+        if kind not in KINDS:
+            raise ValueError(f"Invalid kind '{kind}' is specified.")
+        arrived: asyncio.Event = self._start_collector()
+        future: "asyncio.Future[Any]" = asyncio.get_running_loop().create_future()
+        key: Tuple[str, bool] = (kind, kind == "encode" and add_special_tokens)
+        self._pending.append(_Request(key, text, future, deadline))
+        arrived.set()
+        if deadline is None:
+            return await future
+        try:
+            return await asyncio.wait_for(
+                asyncio.shield(future), max(deadline - time.monotonic(), 0)
+            )
+        except asyncio.TimeoutError:
+            future.cancel()
+            raise DeadlineExceeded("The deadline of the request is exceeded")
+
+    async def close(self) -> None:
+        """Stop collecting batches and wait for the running ones."""
+        if self._collector is not None:
+            self._collector.cancel()
+            await asyncio.gather(self._collector, return_exceptions=True)
+            self._collector = None
+            for request in self._pending:
+                request.future.cancel()
+            self._pending.clear()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+
+    def _start_collector(self) -> asyncio.Event:
+        # The event notifying the collector of requests, which starts in the running loop
+        arrived: Optional[asyncio.Event] = self._arrived
+        if self._collector is None or arrived is None:
+            arrived = self._arrived = asyncio.Event()
+            self._collector = asyncio.ensure_future(self._collect(arrived))
+        return arrived
+
+    async def _collect(self, arrived: asyncio.Event) -> None:
+        # Requests are appended to the list and notified with the event,
+        # since cancelling asyncio.Queue.get() on timeout can lose an item before Python 3.12
+        while True:
+            while not self._pending:
+                arrived.clear()
+                await arrived.wait()
+            end: float = time.monotonic() + self.max_wait_ms / 1000
+            while len(self._pending) < self.max_batch_size:
+                timeout: float = end - time.monotonic()
+                if timeout <= 0:
+                    break
+                arrived.clear()
+                try:
+                    await asyncio.wait_for(arrived.wait(), timeout)
+                except asyncio.TimeoutError:
+                    break
+            batch: List[_Request] = self._pending[: self.max_batch_size]
+            del self._pending[: self.max_batch_size]
+            groups: Dict[Tuple[str, bool], List[_Request]] = {}
+            for request in batch:
+                groups.setdefault(request.key, []).append(request)
+            for key, requests in groups.items():
+                task: asyncio.Task = asyncio.ensure_future(self._process(key, requests))
+                self._tasks.add(task)
+                task.add_done_callback(self._tasks.discard)
+
+    async def _process(self, key: Tuple[str, bool], requests: List[_Request]) -> None:
+        now: float = time.monotonic()
+        alive: List[_Request] = []
+        for request in requests:
+            if request.future.done():
+                # Cancelled by the deadline
+                self.stats["expired"] += 1
+            elif request.deadline is not None and request.deadline <= now:
+                self.stats["expired"] += 1
+                request.future.set_exception(
+                    DeadlineExceeded("The deadline of the request is exceeded")
+                )
+            else:
+                alive.append(request)
+        if not alive:
+            return
+        self.stats["texts"] += len(alive)
+        self.stats["batches"] += 1
+        kind, add_special_tokens = key
+        texts: List[str] = [request.text for request in alive]
+        try:
+            results: List[Any]
+            if kind == "encode":
+                results = (
+                    await self.tokenizer.abatch_encode(
+                        texts, add_special_tokens=add_special_tokens
+                    )
+                )["input_ids"]
+            else:
+                results = await self.tokenizer.atokenize_batch(texts)
+        except Exception as error:
+            for request in alive:
+                if not request.future.done():
+                    request.future.set_exception(error)
+            return
+        for request, result in zip(alive, results):
+            if not request.future.done():
+                request.future.set_result(result)
+
+
+class TokenizationServer:
+    """HTTP server of tokenization, which groups concurrent requests with ``MicroBatcher``.
+
+    Endpoints:
+
+    - ``POST /encode``: ``{"text": "..."}`` or ``{"texts": [...]}`` to ``{"input_ids": ...}``.
+      ``"add_special_tokens"`` (defaults to ``true``) can be specified.
+    - ``POST /tokenize``: ``{"text": "..."}`` or ``{"texts": [...]}`` to ``{"tokens": ...}``.
+    - ``GET /health``: ``{"status": "ok", ...}`` with the statistics of batches.
+
+    ``"deadline_ms"`` in a request overrides *default_deadline_ms*,
+    and the server responds with 504 if the request is not processed in time.
+
+    Args:
+        tokenizer (``JapaneseTransformerTokenizer``): The tokenizer.
+        max_batch_size (``int``, *optional*, defaults to ``64``): See ``MicroBatcher``.
+        max_wait_ms (``float``, *optional*, defaults to ``5``): See ``MicroBatcher``.
+        default_deadline_ms (``float``, *optional*): Milliseconds allowed for a request.
+        max_body_bytes (``int``, *optional*, defaults to ``16777216``): The maximum size of a request body.
+    """
+
+    def __init__(
+        self,
+        tokenizer: Any,
+        max_batch_size: int = 64,
+        max_wait_ms: float = 5,
+        default_deadline_ms: Optional[float] = None,
+        max_body_bytes: int = 2**24,
+    ):
+        self.batcher = MicroBatcher(
+            tokenizer, max_batch_size=max_batch_size, max_wait_ms=max_wait_ms
+        )
+        self.default_deadline_ms = default_deadline_ms
+        self.max_body_bytes = max_body_bytes
+
+    async def handle(self, method: str, path: str, body: bytes) -> Tuple[int, Any]:
+        """Process a request and return the status and the JSON object of the response."""
+        if path == "/health":
+            return 200, {"status": "ok", **self.batcher.stats}
+        kind: str = path.strip("/")
+        if kind not in KINDS:
+            return 404, {"error": f"Unknown path: {path}"}
+        if method != "POST":
+            return 405, {"error": "Use POST"}
+        try:
+            request: Dict[str, Any] = json.loads(body or b"{}")
+            single: bool = "text" in request
+            batch: List[str] = [request["text"]] if single else request["texts"]
+            deadline_ms: Optional[float] = request.get(
+                "deadline_ms", self.default_deadline_ms
+            )
+            if deadline_ms is not None and (
+                isinstance(deadline_ms, bool)
+                or not isinstance(deadline_ms, (int, float))
+                or not deadline_ms >= 0
+            ):
+                return 400, {"error": '"deadline_ms" must be a non-negative number'}
+            add_special_tokens: bool = bool(request.get("add_special_tokens", True))
+        except (ValueError, KeyError, TypeError, AttributeError):
+            return 400, {
+                "error": 'The body must be a JSON object with "text" or "texts"'
+            }
+        if not isinstance(batch, list) or not all(isinstance(t, str) for t in batch):
+            return 400, {
+                "error": '"text" must be a string or "texts" a list of strings'
+            }
+        deadline: Optional[float] = (
+            None if deadline_ms is None else time.monotonic() + deadline_ms / 1000
+        )
+        try:
+            results: List[Any] = await asyncio.gather(
+                *[
+                    self.batcher.submit(kind, text, add_special_tokens, deadline)
+                    for text in batch
+                ]
+            )
+        except DeadlineExceeded as error:
+            return 504, {"error": str(error)}
+        except Exception as error:
+            return 500, {"error": repr(error)}
+        return 200, {KINDS[kind]: results[0] if single else results}
+
+    async def handle_connection(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        """Serve HTTP/1.1 requests of a connection, which can be kept alive."""
+        try:
+            while True:
+                request_line: bytes = await reader.readline()
+                if not request_line.strip():
+                    break
+                method, path, version = request_line.decode("latin-1").split(" ", 2)
+                headers: Dict[str, str] = {}
+                while True:
+                    line: bytes = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+                length: int = int(headers.get("content-length", "0"))
+                if length > self.max_body_bytes:
+                    status, response = 413, {"error": "The body is too large"}
+                    keep_alive: bool = False
+                else:
+                    body: bytes = await reader.readexactly(length)
+                    status, response = await self.handle(
+                        method, path.split("?", 1)[0], body
+                    )
+                    keep_alive = headers.get("connection", "").lower() != "close" and (
+                        version.strip() == "HTTP/1.1"
+                        or headers.get("connection", "").lower() == "keep-alive"
+                    )
+                data: bytes = json.dumps(response, ensure_ascii=False).encode("utf-8")
+                writer.write(
+                    (
+                        f"HTTP/1.1 {status} {REASONS[status]}\r\n"
+                        "Content-Type: application/json; charset=utf-8\r\n"
+                        f"Content-Length: {len(data)}\r\n"
+                        f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n"
+                    ).encode("latin-1")
+                    + data
+                )
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+    async def start(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 8000,
+        unix_socket: Optional[Union[str, os.PathLike]] = None,
+    ) -> asyncio.AbstractServer:
+        """Start listening on the address or the Unix socket.
+
+        Returns:
+            ``asyncio.AbstractServer``: The server.
+        """
+        if unix_socket is not None:
+            return await asyncio.start_unix_server(
+                self.handle_connection, path=os.fspath(unix_socket)
+            )
+        return await asyncio.start_server(self.handle_connection, host=host, port=port)
+
+    async def close(self) -> None:
+        """Wait for running batches and release resources of the tokenizer."""
+        await self.batcher.close()
+        await self.batcher.tokenizer.aclose()
+
+
+def serve(
+    tokenizer: Any,
+    host: str = "127.0.0.1",
+    port: int = 8000,
+    unix_socket: Optional[Union[str, os.PathLike]] = None,
+    max_batch_size: int = 64,
+    max_wait_ms: float = 5,
+    default_deadline_ms: Optional[float] = None,
+) -> None:
+    """Run ``TokenizationServer`` until interrupted or terminated.
+    One process serves model replicas, so dictionaries of Juman++ or Sudachi are loaded only once.
+
+    Args:
+        tokenizer (``JapaneseTransformerTokenizer``): The tokenizer.
+        host (``str``, *optional*, defaults to ``"127.0.0.1"``): The address to listen on.
+        port (``int``, *optional*, defaults to ``8000``): The port to listen on.
+        unix_socket (``str`` or ``os.PathLike``, *optional*): If specified, listen on the Unix socket instead.
+        max_batch_size (``int``, *optional*, defaults to ``64``): See ``MicroBatcher``.
+        max_wait_ms (``float``, *optional*, defaults to ``5``): See ``MicroBatcher``.
+        default_deadline_ms (``float``, *optional*): See ``TokenizationServer``.
+    """
+
+    async def run() -> None:
+        server = TokenizationServer(
+            tokenizer,
+            max_batch_size=max_batch_size,
+            max_wait_ms=max_wait_ms,
+            default_deadline_ms=default_deadline_ms,
+        )
+        listener: asyncio.AbstractServer = await server.start(
+            host=host, port=port, unix_socket=unix_socket
+        )
+        address: str = (
+            os.fspath(unix_socket) if unix_socket is not None else f"{host}:{port}"
+        )
+        print(f"Serving on {address}", flush=True)
+        stopped: asyncio.Event = asyncio.Event()
+        with contextlib.suppress(NotImplementedError):
+            # Not supported on Windows
+            asyncio.get_running_loop().add_signal_handler(signal.SIGTERM, stopped.set)
+        try:
+            async with listener:
+                await stopped.wait()
+        finally:
+            await server.close()
+
+    try:
+        asyncio.run(run())
+    except KeyboardInterrupt:
+        pass
@@ -1 +1,5 @@
+from .cache import SubwordCache
+from .character import CharacterTokenizer
 from .sentencepiece import SentencepieceTokenizer
+from .vocab import CompactVocab
+from .wordpiece import WordpieceTokenizer
@@ -0,0 +1,133 @@
+import json
+import os
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+
+class SubwordCache:
+    """Size-bounded cache of subword tokenization for each word.
+    The least recently used word is evicted when the cache is full.
+    It can be shared among threads.
+    You can import this module shortly:
+
+    .. code-block:: none
+
+       >> from jptranstokenizer.subword import SubwordCache
+
+    Args:
+        maxsize (``int``, *optional*, defaults to ``65536``):
+            The maximum number of words in the cache.
+        fingerprint (``str``, *optional*):
+            Identifier of the subword vocabulary.
+            A snapshot with a different fingerprint is not loaded.
+    """
+
+    def __init__(self, maxsize: int = 65536, fingerprint: Optional[str] = None):
+        if maxsize < 1:
+            raise ValueError("maxsize must be positive")
+        self.maxsize = maxsize
+        self.fingerprint = fingerprint
+        self.hits: int = 0
+        self.misses: int = 0
+        self._cache: "OrderedDict[str, List[str]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __getstate__(self) -> Dict[str, Any]:
+        state: Dict[str, Any] = self.__dict__.copy()
+        del state["_lock"]
+        return state
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._cache)
+
+    def __contains__(self, word: str) -> bool:
+        return word in self._cache
+
+    def get(self, word: str) -> Optional[List[str]]:
+        """Return the cached subwords of the word and count a hit or a miss.
+
+        Args:
+            word (``str``): A word.
+
+        Returns:
+            ``List[str]``: Subwords, or ``None`` if the word is not cached.
+        """
+        with self._lock:
+            tokens: Optional[List[str]] = self._cache.get(word)
+            if tokens is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+                self._cache.move_to_end(word)
+        return tokens
+
+    def put(self, word: str, tokens: List[str]) -> None:
+        """Cache subwords of the word, evicting the least recently used one if full.
+
+        Args:
+            word (``str``): A word.
+            tokens (``List[str]``): Subwords of the word.
+        """
+        with self._lock:
+            self._cache[word] = tokens
+            self._cache.move_to_end(word)
+            if len(self._cache) > self.maxsize:
+                self._cache.popitem(last=False)
+
+    def clear(self) -> None:
+        """Remove all words and reset the counters."""
+        with self._lock:
+            self._cache.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def cache_info(self) -> Dict[str, int]:
+        """Return the counters like ``functools.lru_cache``.
+
+        Returns:
+            ``Dict[str, int]``: ``hits``, ``misses``, ``maxsize`` and ``currsize``.
+        """
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "maxsize": self.maxsize,
+            "currsize": len(self._cache),
+        }
+
+    def save(self, path: Union[str, os.PathLike]) -> None:
+        """Save the cached words as a JSON file, from the least recently used one.
+
+        Args:
+            path (``str`` or ``os.PathLike``): The file path.
+        """
+        with self._lock:
+            entries: List[Tuple[str, List[str]]] = list(self._cache.items())
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(
+                {"fingerprint": self.fingerprint, "entries": entries},
+                f,
+                ensure_ascii=False,
+            )
+
+    def load(self, path: Union[str, os.PathLike]) -> bool:
+        """Load words saved by ``save``.
+        Nothing is loaded if the fingerprint is different from this cache.
+
+        Args:
+            path (``str`` or ``os.PathLike``): The file path.
+
+        Returns:
+            ``bool``: Whether the snapshot is loaded.
+        """
+        with open(path, encoding="utf-8") as f:
+            snapshot = json.load(f)
+        if snapshot.get("fingerprint") != self.fingerprint:
+            return False
+        for word, tokens in snapshot["entries"]:
+            self.put(word, tokens)
+        return True
@@ -0,0 +1,120 @@
+from typing import Any, Dict, List, Mapping, Optional
+
+# numpy is a dependency of transformers
+import numpy as np
+
+from ..mainword.base import normalize_nfkc
+
+# Characters in the Basic Multilingual Plane are looked up in the dense table
+BMP_SIZE: int = 0x10000
+
+
+class CharacterTokenizer:
+    """Runs character tokenization with the same outputs as ``CharacterTokenizer`` of transformers.
+    ``encode_batch`` maps the characters of a whole batch to ids at once through a table indexed by code points
+    (a dense array for the Basic Multilingual Plane and a dict above it),
+    without making a token string for each character.
+    You can import this module shortly:
+
+    .. code-block:: none
+
+       >> from jptranstokenizer.subword import CharacterTokenizer
+
+    Args:
+        vocab (``Mapping[str, int]``): The vocabulary.
+        unk_token (``str``): The token for a character which is not in *vocab*.
+        normalize_text (``bool``, *optional*, defaults to ``True``):
+            Whether to apply unicode normalization to text before tokenization.
+    """
+
+    def __init__(
+        self, vocab: Mapping[str, int], unk_token: str, normalize_text: bool = True
+    ):
+        self.unk_token = unk_token
+        self.normalize_text = normalize_text
+        self.vocab = vocab
+
+    @property
+    def vocab(self) -> Mapping[str, int]:
+        return self._vocab
+
+    @vocab.setter
+    def vocab(self, vocab: Mapping[str, int]) -> None:
+        self._vocab = vocab
+        # None if unk_token is not in the vocabulary, where ids can't be looked up in the table
+        self.unk_id: Optional[int] = vocab.get(self.unk_token)
+        self._table: np.ndarray = np.full(
+            BMP_SIZE, -1 if self.unk_id is None else self.unk_id, dtype=np.int32
+        )
+        self._sparse_ids: Dict[int, int] = {}
+        for token, token_id in vocab.items():
+            if len(token) != 1:
+                continue
+            code_point: int = ord(token)
+            if code_point < BMP_SIZE:
+                self._table[code_point] = token_id
+            else:
+                self._sparse_ids[code_point] = token_id
+
+    def __getstate__(self) -> Dict[str, Any]:
+        # The table is rebuilt from the vocabulary
+        state: Dict[str, Any] = self.__dict__.copy()
+        del state["_table"], state["_sparse_ids"]
+        return state
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.__dict__.update(state)
+        self.vocab = self._vocab
+
+    def normalize(self, text: str) -> str:
+        """Apply unicode normalization if *normalize_text* is ``True``."""
+        return normalize_nfkc(text) if self.normalize_text else text
+
+    def tokenize(self, text: str) -> List[str]:
+        """Tokenizes a piece of text into characters.
+
+        Args:
+            text (``str``): A single word or a text.
+
+        Returns:
+            ``List[str]``: A list of characters.
+        """
+        vocab: Mapping[str, int] = self.vocab
+        return [
+            char if char in vocab else self.unk_token for char in self.normalize(text)
+        ]
+
+    def encode_batch(
+        self, texts: List[str], is_normalized: bool = False
+    ) -> List[List[int]]:
+        """Converts texts into ids of their characters at once.
+
+        Args:
+            texts (``List[str]``): Words or texts.
+            is_normalized (``bool``, *optional*, defaults to ``False``):
+                Whether *texts* are already normalized by ``normalize``.
+
+        Returns:
+            ``List[List[int]]``: The ids of the characters for each text.
+        """
+        if self.unk_id is None:
+            raise ValueError(f"unk_token '{self.unk_token}' is not in the vocabulary")
+        if not is_normalized:
+            texts = [self.normalize(text) for text in texts]
+        code_points: np.ndarray = np.frombuffer(
+            "".join(texts).encode("utf-32-le", "surrogatepass"), dtype=np.uint32
+        )
+        ids: np.ndarray = self._table[np.minimum(code_points, BMP_SIZE - 1)]
+        outside: np.ndarray = np.flatnonzero(code_points >= BMP_SIZE)
+        if len(outside):
+            ids[outside] = [
+                self._sparse_ids.get(code_point, self.unk_id)
+                for code_point in code_points[outside].tolist()
+            ]
+        flat_ids: List[int] = ids.tolist()
+        batch_ids: List[List[int]] = []
+        start: int = 0
+        for text in texts:
+            batch_ids.append(flat_ids[start : start + len(text)])
+            start += len(text)
+        return batch_ids
@@ -1,8 +1,15 @@
-from typing import Any, Dict, Optional, List
+import os
+from typing import Any, Dict, List, Mapping, Optional, Set, Union
+
+from .vocab import CompactVocab
 
 SPIECE_UNDERLINE = "▁"
 
 
+def _is_digit_comma(piece: str) -> bool:
+    return len(piece) > 1 and piece[-1] == "," and piece[-2].isdigit()
+
+
 class SentencepieceTokenizer:
     """Runs sentencepiece tokenization.
     You can import this module shortly:
@@ -18,6 +25,11 @@ class SentencepieceTokenizer:
             Arguments of dict to pass ``sentencepiece.SentencePieceProcessor``.
         sp_model (``sentencepiece.SentencePieceProcessor``, *optional*):
             Already trained ``SentencePieceProcessor`` model.
+        compact_vocab (``bool``, *optional*, defaults to ``False``):
+            Whether to store ``vocab`` in a ``CompactVocab`` instead of ``dict``.
+        compact_vocab_file (``str`` or ``os.PathLike``, *optional*):
+            A file where the ``CompactVocab`` is saved and memory-mapped.
+            If specified, *compact_vocab* is regarded as ``True``.
     """
 
     def __init__(
@@ -25,6 +37,8 @@ class SentencepieceTokenizer:
         vocab_file: Optional[str] = None,
         sp_model_kwargs: Optional[Dict[str, Any]] = None,
         sp_model: Optional[Any] = None,
+        compact_vocab: bool = False,
+        compact_vocab_file: Optional[Union[str, os.PathLike]] = None,
     ):
         if vocab_file is None and sp_model is None:
             raise ValueError("vocab_file or sp_model must be specified")
@@ -47,9 +61,60 @@ class SentencepieceTokenizer:
         else:
             self.sp_model = sp_model
         self.bpe_vocab_size: int = self.sp_model.GetPieceSize()
-        self.vocab: Dict[str, int] = {
-            self.sp_model.IdToPiece(i): i for i in range(self.bpe_vocab_size)
-        }
+        pieces: List[str] = self.sp_model.IdToPiece(list(range(self.bpe_vocab_size)))
+        self.vocab: Mapping[str, int]
+        if compact_vocab or compact_vocab_file is not None:
+            self.vocab = CompactVocab.from_tokens(pieces, path=compact_vocab_file)
+        else:
+            self.vocab = {piece: i for i, piece in enumerate(pieces)}
+        self.unk_id: int = self.sp_model.unk_id()
+        # The splits of the pieces ending with a comma after a digit are computed once,
+        # except under subword regularization, where every split is sampled
+        self._digit_comma_splits: Dict[str, List[str]] = {}
+        self._digit_comma_split_ids: Dict[int, List[int]] = {}
+        if not (sp_model_kwargs or {}).get("enable_sampling", False):
+            for i, piece in enumerate(pieces):
+                if _is_digit_comma(piece):
+                    split: List[str] = self._split_piece(piece)
+                    self._digit_comma_splits[piece] = split
+                    self._digit_comma_split_ids[i] = [
+                        self.vocab.get(token, self.unk_id) for token in split
+                    ]
+        # Texts with these ids are encoded through tokenize: unknown pieces, whose surfaces
+        # may end with a comma after a digit, and pieces to split without the table
+        self._string_path_ids: Set[int] = {
+            i
+            for i, piece in enumerate(pieces)
+            if _is_digit_comma(piece) and i not in self._digit_comma_split_ids
+        } | {self.unk_id}
+
+    def encode_batch(self, texts: List[str]) -> List[List[int]]:
+        """Converts texts into ids in one call of sentencepiece without making token strings.
+        The ids are the same as ``tokenize`` followed by the lookup in ``vocab``.
+
+        Args:
+            texts (``List[str]``): Words or texts.
+
+        Returns:
+            ``List[List[int]]``: The ids of the sentencepiece tokens for each text.
+        """
+        if not texts:
+            return []
+        batch_ids: List[List[int]] = self.sp_model.encode(texts, out_type=int)
+        split_ids: Dict[int, List[int]] = self._digit_comma_split_ids
+        for i, ids in enumerate(batch_ids):
+            if not self._string_path_ids.isdisjoint(ids):
+                batch_ids[i] = [
+                    self.vocab.get(piece, self.unk_id)
+                    for piece in self.tokenize(texts[i])
+                ]
+            elif not split_ids.keys().isdisjoint(ids):
+                batch_ids[i] = [
+                    split_id
+                    for token_id in ids
+                    for split_id in split_ids.get(token_id, (token_id,))
+                ]
+        return batch_ids
 
     def tokenize(self, text: str) -> List[str]:
         """Converts a string in a sequence of tokens.
@@ -60,23 +125,45 @@ class SentencepieceTokenizer:
         Returns:
             ``List[str]``: A list of sentencepiece tokens.
         """
-        pieces: List[str] = self.sp_model.encode(text, out_type=str)
+        return self._split_digit_comma(self.sp_model.encode(text, out_type=str))
+
+    def tokenize_batch(self, texts: List[str]) -> List[List[str]]:
+        """Batch version of ``tokenize``.
+        All the texts are encoded in one call of sentencepiece, which runs in multiple threads,
+        so use this for the words of sentences instead of calling ``tokenize`` for each word.
+
+        Args:
+            texts (``List[str]``): Words or texts.
+
+        Returns:
+            ``List[List[str]]``: The sentencepiece tokens for each text.
+        """
+        if not texts:
+            return []
+        return [
+            self._split_digit_comma(pieces)
+            for pieces in self.sp_model.encode(texts, out_type=str)
+        ]
+
+    def _split_digit_comma(self, pieces: List[str]) -> List[str]:
+        # A comma following a digit is split from the piece
         tokens: List[str] = []
         for piece in pieces:
-            if len(piece) > 1 and piece[-1] == str(",") and piece[-2].isdigit():
-                cur_pieces = self.sp_model.EncodeAsPieces(
-                    piece[:-1].replace(SPIECE_UNDERLINE, "")
-                )
-                if (
-                    piece[0] != SPIECE_UNDERLINE
-                    and cur_pieces[0][0] == SPIECE_UNDERLINE
-                ):
-                    if len(cur_pieces[0]) == 1:
-                        cur_pieces = cur_pieces[1:]
-                    else:
-                        cur_pieces[0] = cur_pieces[0][1:]
-                cur_pieces.append(piece[-1])
-                tokens.extend(cur_pieces)
+            if _is_digit_comma(piece):
+                split: Optional[List[str]] = self._digit_comma_splits.get(piece)
+                tokens.extend(self._split_piece(piece) if split is None else split)
             else:
                 tokens.append(piece)
         return tokens
+
+    def _split_piece(self, piece: str) -> List[str]:
+        cur_pieces: List[str] = self.sp_model.EncodeAsPieces(
+            piece[:-1].replace(SPIECE_UNDERLINE, "")
+        )
+        if piece[0] != SPIECE_UNDERLINE and cur_pieces[0][0] == SPIECE_UNDERLINE:
+            if len(cur_pieces[0]) == 1:
+                cur_pieces = cur_pieces[1:]
+            else:
+                cur_pieces[0] = cur_pieces[0][1:]
+        cur_pieces.append(piece[-1])
+        return cur_pieces
@@ -0,0 +1,296 @@
+import mmap
+import os
+import struct
+import zlib
+from typing import (
+    Any,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    Tuple,
+    TypeVar,
+    Union,
+    overload,
+)
+
+_T = TypeVar("_T")
+
+MAGIC: bytes = b"JPTV"
+# magic, version, number of ids, number of distinct tokens, size of the hash table
+HEADER: struct.Struct = struct.Struct("=4sIIII")
+VERSION: int = 1
+
+
+def _build_buffer(tokens: Sequence[Optional[str]]) -> bytes:
+    """Serialize tokens into the layout of ``CompactVocab``."""
+    encoded: List[bytes] = [
+        b"" if token is None else token.encode("utf-8") for token in tokens
+    ]
+    offsets: List[int] = [0]
+    for data in encoded:
+        offsets.append(offsets[-1] + len(data))
+    # Open addressing with the load factor of at most 1/2
+    table_size: int = 1
+    while table_size < 2 * len(tokens):
+        table_size *= 2
+    mask: int = table_size - 1
+    table: List[int] = [0] * table_size
+    num_tokens: int = 0
+    for i, (token, data) in enumerate(zip(tokens, encoded)):
+        if token is None:
+            continue
+        slot: int = zlib.crc32(data) & mask
+        while table[slot] and encoded[table[slot] - 1] != data:
+            slot = (slot + 1) & mask
+        if not table[slot]:
+            num_tokens += 1
+        # The last id of duplicated tokens wins like dict
+        table[slot] = i + 1
+    return b"".join(
+        [
+            HEADER.pack(MAGIC, VERSION, len(tokens), num_tokens, table_size),
+            struct.pack(f"={len(offsets)}I", *offsets),
+            struct.pack(f"={table_size}I", *table),
+            *encoded,
+        ]
+    )
+
+
+class CompactVocab(Mapping[str, int]):
+    """Immutable vocabulary mapping tokens to ids, stored in one buffer.
+    The buffer consists of the offsets of tokens in a UTF-8 string table
+    and a hash table of ids, so both directions are served without Python objects per token.
+    A vocabulary loaded from a file is memory-mapped, and it is shared among processes
+    (pickling it only passes the path).
+    A lookup is slower than ``dict``, so this is for reducing memory of many processes.
+    You can import this module shortly:
+
+    .. code-block:: none
+
+       >> from jptranstokenizer.subword import CompactVocab
+
+    Args:
+        buffer (``bytes``, ``mmap.mmap``): A buffer made by ``from_tokens`` or ``save``.
+        path (``str`` or ``os.PathLike``, *optional*): The file which *buffer* maps.
+    """
+
+    def __init__(
+        self,
+        buffer: Union[bytes, mmap.mmap],
+        path: Optional[Union[str, os.PathLike]] = None,
+    ):
+        magic, version, num_ids, num_tokens, table_size = HEADER.unpack_from(buffer)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError("The buffer is not a vocabulary of this version")
+        self._buffer = buffer
+        self.path: Optional[str] = None if path is None else os.fspath(path)
+        self._num_ids: int = num_ids
+        self._num_tokens: int = num_tokens
+        self._mask: int = table_size - 1
+        view: memoryview = memoryview(buffer)
+        start: int = HEADER.size
+        end: int = start + 4 * (num_ids + 1)
+        self._offsets: memoryview = view[start:end].cast("I")
+        start, end = end, end + 4 * table_size
+        self._table: memoryview = view[start:end].cast("I")
+        self._strings: memoryview = view[end:]
+        self.ids_to_tokens: IdsToTokens = IdsToTokens(self)
+
+    @classmethod
+    def from_tokens(
+        cls,
+        tokens: Sequence[Optional[str]],
+        path: Optional[Union[str, os.PathLike]] = None,
+    ) -> "CompactVocab":
+        """Make a vocabulary from tokens in the order of ids.
+
+        Args:
+            tokens (``Sequence[str]``):
+                The token of each id. ``None`` means that the id is not used.
+            path (``str`` or ``os.PathLike``, *optional*):
+                If specified, the vocabulary is saved into the file (unless it already has the same vocabulary)
+                and memory-mapped.
+
+        Returns:
+            ``CompactVocab``: The vocabulary.
+        """
+        buffer: bytes = _build_buffer(tokens)
+        if path is None:
+            return cls(buffer)
+        if not os.path.isfile(path) or os.path.getsize(path) != len(buffer):
+            cls._write(path, buffer)
+        else:
+            with open(path, "rb") as f:
+                if f.read() != buffer:
+                    cls._write(path, buffer)
+        return cls.load(path)
+
+    @classmethod
+    def from_vocab(
+        cls, vocab: Mapping[str, int], path: Optional[Union[str, os.PathLike]] = None
+    ) -> "CompactVocab":
+        """Make a vocabulary from a mapping of tokens to ids, such as ``load_vocab``.
+
+        Args:
+            vocab (``Mapping[str, int]``): The mapping.
+            path (``str`` or ``os.PathLike``, *optional*): See ``from_tokens``.
+
+        Returns:
+            ``CompactVocab``: The vocabulary.
+        """
+        if isinstance(vocab, CompactVocab) and path is None:
+            return vocab
+        tokens: List[Optional[str]] = [None] * (max(vocab.values(), default=-1) + 1)
+        for token, i in vocab.items():
+            tokens[i] = token
+        return cls.from_tokens(tokens, path=path)
+
+    @classmethod
+    def from_file(
+        cls,
+        vocab_file: Union[str, os.PathLike],
+        path: Optional[Union[str, os.PathLike]] = None,
+    ) -> "CompactVocab":
+        """Make a vocabulary from a file with one token per line (such as ``vocab.txt`` of WordPiece).
+
+        Args:
+            vocab_file (``str`` or ``os.PathLike``): The vocabulary file.
+            path (``str`` or ``os.PathLike``, *optional*): See ``from_tokens``.
+
+        Returns:
+            ``CompactVocab``: The vocabulary.
+        """
+        with open(vocab_file, "r", encoding="utf-8") as f:
+            tokens: List[str] = [line.rstrip("\n") for line in f]
+        return cls.from_tokens(tokens, path=path)
+
+    @classmethod
+    def load(cls, path: Union[str, os.PathLike]) -> "CompactVocab":
+        """Memory-map a vocabulary saved by ``save``.
+
+        Args:
+            path (``str`` or ``os.PathLike``): The file.
+
+        Returns:
+            ``CompactVocab``: The vocabulary.
+        """
+        with open(path, "rb") as f:
+            buffer: mmap.mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        return cls(buffer, path=path)
+
+    @staticmethod
+    def _write(path: Union[str, os.PathLike], buffer: bytes) -> None:
+        # Processes mapping the old file keep reading it
+        tmp_path: str = f"{os.fspath(path)}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(buffer)
+        os.replace(tmp_path, path)
+
+    def save(self, path: Union[str, os.PathLike]) -> None:
+        """Save the vocabulary, which can be memory-mapped with ``load``.
+
+        Args:
+            path (``str`` or ``os.PathLike``): The file.
+        """
+        self._write(path, bytes(self._buffer))
+
+    def __reduce__(self) -> Tuple[Any, ...]:
+        if self.path is not None:
+            return (self.__class__.load, (self.path,))
+        return (self.__class__, (bytes(self._buffer),))
+
+    def _token(self, index: int) -> str:
+        return str(
+            self._strings[self._offsets[index] : self._offsets[index + 1]], "utf-8"
+        )
+
+    def _find(self, token: str) -> int:
+        data: bytes = token.encode("utf-8")
+        slot: int = zlib.crc32(data) & self._mask
+        while True:
+            entry: int = self._table[slot]
+            if not entry:
+                return -1
+            if self._strings[self._offsets[entry - 1] : self._offsets[entry]] == data:
+                return entry - 1
+            slot = (slot + 1) & self._mask
+
+    def __getitem__(self, token: str) -> int:
+        index: int = self._find(token) if isinstance(token, str) else -1
+        if index < 0:
+            raise KeyError(token)
+        return index
+
+    @overload
+    def get(self, token: str) -> Optional[int]:
+        ...
+
+    @overload
+    def get(self, token: str, default: Union[int, _T]) -> Union[int, _T]:
+        ...
+
+    def get(self, token: str, default: Any = None) -> Any:
+        index: int = self._find(token) if isinstance(token, str) else -1
+        return default if index < 0 else index
+
+    def __contains__(self, token: object) -> bool:
+        return isinstance(token, str) and self._find(token) >= 0
+
+    def __len__(self) -> int:
+        return self._num_tokens
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.ids_to_tokens.values())
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}(size={len(self)}, path={self.path!r})"
+
+    @property
+    def num_ids(self) -> int:
+        """The number of ids including unused ones."""
+        return self._num_ids
+
+
+class IdsToTokens(Mapping[int, str]):
+    """View of ``CompactVocab`` mapping ids to tokens.
+    An id is not contained if it is unused or its token is duplicated with a larger id.
+    """
+
+    def __init__(self, vocab: CompactVocab):
+        self._vocab = vocab
+        # Ids are contiguous unless unused or duplicated tokens exist
+        self._is_dense: bool = len(vocab) == vocab.num_ids
+
+    def _contains(self, index: int) -> bool:
+        if not 0 <= index < self._vocab.num_ids:
+            return False
+        return self._is_dense or self._vocab._find(self._vocab._token(index)) == index
+
+    def __getitem__(self, index: int) -> str:
+        if not isinstance(index, int) or not self._contains(index):
+            raise KeyError(index)
+        return self._vocab._token(index)
+
+    @overload
+    def get(self, index: int) -> Optional[str]:
+        ...
+
+    @overload
+    def get(self, index: int, default: Union[str, _T]) -> Union[str, _T]:
+        ...
+
+    def get(self, index: int, default: Any = None) -> Any:
+        if not isinstance(index, int) or not self._contains(index):
+            return default
+        return self._vocab._token(index)
+
+    def __contains__(self, index: object) -> bool:
+        return isinstance(index, int) and self._contains(index)
+
+    def __len__(self) -> int:
+        return len(self._vocab)
+
+    def __iter__(self) -> Iterator[int]:
+        return (i for i in range(self._vocab.num_ids) if self._contains(i))
@@ -0,0 +1,174 @@
+from typing import Any, Dict, List, Mapping, Optional, Tuple
+
+# A node of the trie maps a character to a child node,
+# and a node which is the end of a token has the id under _END, which is not a character.
+_Node = Dict[str, Any]
+_END: str = ""
+
+
+def _insert(trie: _Node, key: str, token_id: int) -> None:
+    node: _Node = trie
+    for char in key:
+        node = node.setdefault(char, {})
+    node[_END] = token_id
+
+
+def build_tries(vocab: Mapping[str, int]) -> Tuple[_Node, _Node]:
+    """Build tries of the tokens at the beginning of a word and of the ``##`` tokens following them.
+
+    Args:
+        vocab (``Mapping[str, int]``): The vocabulary.
+
+    Returns:
+        ``Tuple[Dict, Dict]``: The trie of the whole tokens and the trie of ``##`` tokens without ``##``,
+        which hold the ids of the tokens.
+    """
+    prefix_trie: _Node = {}
+    suffix_trie: _Node = {}
+    for token, token_id in vocab.items():
+        if token:
+            _insert(prefix_trie, token, token_id)
+        if len(token) > 2 and token.startswith("##"):
+            _insert(suffix_trie, token[2:], token_id)
+    return prefix_trie, suffix_trie
+
+
+class WordpieceTokenizer:
+    """Runs WordPiece tokenization with the same outputs as ``WordpieceTokenizer`` of transformers.
+    The greedy longest-match-first search walks a trie of the vocabulary from the end of the last match,
+    so it does not slice substrings, and a word is tokenized in the time linear in its length
+    (each step is bounded by the longest token).
+    Long katakana words and alphanumeric runs are much faster than transformers.
+    The trie holds ids, so ``encode_batch`` returns ids without making token strings.
+    You can import this module shortly:
+
+    .. code-block:: none
+
+       >> from jptranstokenizer.subword import WordpieceTokenizer
+
+    Args:
+        vocab (``Mapping[str, int]``): The vocabulary.
+        unk_token (``str``): The token for a word which can't be tokenized.
+        max_input_chars_per_word (``int``, *optional*, defaults to ``100``):
+            A longer word is regarded as *unk_token*.
+    """
+
+    def __init__(
+        self,
+        vocab: Mapping[str, int],
+        unk_token: str,
+        max_input_chars_per_word: int = 100,
+    ):
+        self.vocab = vocab
+        self.unk_token = unk_token
+        self.max_input_chars_per_word = max_input_chars_per_word
+
+    @property
+    def vocab(self) -> Mapping[str, int]:
+        return self._vocab
+
+    @vocab.setter
+    def vocab(self, vocab: Mapping[str, int]) -> None:
+        self._vocab = vocab
+        self._prefix_trie, self._suffix_trie = build_tries(vocab)
+        # Unused ids are never returned by the tries
+        self._id_to_token: List[str] = [""] * (max(vocab.values(), default=-1) + 1)
+        for token, token_id in vocab.items():
+            self._id_to_token[token_id] = token
+
+    @property
+    def unk_id(self) -> Optional[int]:
+        """The id of *unk_token*, or ``None`` if it is not in the vocabulary."""
+        return self._vocab.get(self.unk_token)
+
+    def __getstate__(self) -> Dict[str, Any]:
+        # The tries are larger than the vocabulary, so they are rebuilt
+        state: Dict[str, Any] = self.__dict__.copy()
+        del state["_prefix_trie"], state["_suffix_trie"], state["_id_to_token"]
+        return state
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.__dict__.update(state)
+        self.vocab = self._vocab
+
+    def tokenize(self, text: str) -> List[str]:
+        """Tokenizes a piece of text into its word pieces.
+
+        Args:
+            text (``str``): A single word or whitespace separated words.
+
+        Returns:
+            ``List[str]``: A list of wordpiece tokens.
+        """
+        output_tokens: List[str] = []
+        for word in text.split():
+            output_tokens.extend(self.tokenize_word(word))
+        return output_tokens
+
+    def tokenize_word(self, word: str) -> List[str]:
+        """Tokenizes a word without whitespaces into its word pieces.
+
+        Args:
+            word (``str``): A single word.
+
+        Returns:
+            ``List[str]``: A list of wordpiece tokens, or *unk_token* if the word can't be tokenized.
+        """
+        ids: Optional[List[int]] = self._encode_word(word)
+        if ids is None:
+            return [self.unk_token]
+        id_to_token: List[str] = self._id_to_token
+        return [id_to_token[token_id] for token_id in ids]
+
+    def encode_batch(self, texts: List[str]) -> List[List[int]]:
+        """Converts texts into ids of their word pieces.
+
+        Args:
+            texts (``List[str]``): Words or whitespace separated words.
+
+        Returns:
+            ``List[List[int]]``: The ids of the word pieces for each text.
+        """
+        unk_id: Optional[int] = self.unk_id
+        if unk_id is None:
+            raise ValueError(f"unk_token '{self.unk_token}' is not in the vocabulary")
+        batch_ids: List[List[int]] = []
+        for text in texts:
+            ids: List[int] = []
+            for word in text.split():
+                word_ids: Optional[List[int]] = self._encode_word(word)
+                if word_ids is None:
+                    ids.append(unk_id)
+                else:
+                    ids.extend(word_ids)
+            batch_ids.append(ids)
+        return batch_ids
+
+    def _encode_word(self, word: str) -> Optional[List[int]]:
+        # The ids of the word pieces, or None if the word can't be tokenized
+        length: int = len(word)
+        if length > self.max_input_chars_per_word:
+            return None
+        ids: List[int] = []
+        trie: _Node = self._prefix_trie
+        start: int = 0
+        while start < length:
+            node: _Node = trie
+            match: Optional[int] = None
+            end: int = start
+            i: int = start
+            while i < length:
+                child: Optional[_Node] = node.get(word[i])
+                if child is None:
+                    break
+                node = child
+                i += 1
+                token_id: Optional[int] = node.get(_END)
+                if token_id is not None:
+                    match, end = token_id, i
+            if match is None:
+                return None
+            ids.append(match)
+            start = end
+            trie = self._suffix_trie
+        return ids
@@ -1,34 +1,72 @@
+import asyncio
 import collections
+import functools
+import hashlib
 import os
-from typing import Any, Dict, List, Optional, Union
+import threading
+import time
+from concurrent.futures import Executor
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Dict,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+    TypeVar,
+    Union,
+    overload,
+)
 
 import transformers
 from transformers import (
     AddedToken,
     AlbertTokenizer,
+    BatchEncoding,
     BertJapaneseTokenizer,
     PreTrainedTokenizer,
+    SpecialTokensMixin,
     logging,
 )
 from transformers.models.bert.tokenization_bert import BasicTokenizer, load_vocab
-from transformers.models.bert_japanese.tokenization_bert_japanese import (
-    CharacterTokenizer,
-    MecabTokenizer,
-    WordpieceTokenizer,
+from transformers.models.bert_japanese import tokenization_bert_japanese
+from transformers.tokenization_utils_base import (
+    EncodedInput,
+    PreTokenizedInput,
+    TextInput,
+    TruncationStrategy,
 )
+from transformers.utils import PaddingStrategy, TensorType, to_py_obj
 
+from .alignment import Span, align_subwords, align_words, normalize_with_alignment
+from .mainword.base import MainTokenizerABC
 from .model_list import PUBLIC_AVAILABLE_SETTING_MAP
+from .parallel import ParallelEncoder, resolve_n_jobs
+from .profiling import TokenizerProfiler
+from .subword.cache import SubwordCache
+from .subword.character import CharacterTokenizer
+from .subword.sentencepiece import SPIECE_UNDERLINE
+from .subword.vocab import CompactVocab
+from .subword.wordpiece import WordpieceTokenizer
+
+if TYPE_CHECKING:
+    from .tokenization_utils_fast import JapaneseTransformerTokenizerFast
 
+logger = logging.get_logger(__name__)
 
-logging.set_verbosity_info()
-logging.enable_explicit_format()
-logger = logging.get_logger()
+_T = TypeVar("_T")
 
 
 def get_word_tokenizer(
     word_tokenizer_type: str,
     normalize_text: bool = True,
     ignore_max_byte_error: bool = False,
+    chunk_long_text: bool = False,
     do_lower_case: bool = False,
     mecab_dic: Optional[str] = "ipadic",
     mecab_option: Optional[str] = None,
@@ -36,7 +74,9 @@ def get_word_tokenizer(
     sudachi_config_path: Optional[str] = None,
     sudachi_resource_dir: Optional[str] = None,
     sudachi_dict_type: Optional[str] = "core",
-):
+    juman_max_workers: int = 1,
+    word_cache_path: Optional[Union[str, os.PathLike]] = None,
+) -> Union[MainTokenizerABC, BasicTokenizer]:
     """Load mainword tokenizer dynamically.
     You can import this module shortly:
 
@@ -54,6 +94,10 @@ def get_word_tokenizer(
         ignore_max_byte_error (``bool``, *optional*, defaults to ``False``):
             Whether or not to ignore error of max bytes (only valid with Juman and Sudachi).
             If valid, the tokenizer return empty list.
+        chunk_long_text (``bool``, *optional*, defaults to ``False``):
+            Whether to split a text over the max bytes into chunks at the ends of sentences or punctuations
+            and join the words of the chunks (only valid with Juman and Sudachi).
+            This takes precedence over *ignore_max_byte_error*.
         mecab_dic (``str``, *optional*, defaults to ``"ipadic"``):
             (For MeCab) Name of dictionary to be used for MeCab initialization.
             Maybe ``"ipadic"``, ``"unidic"``, or ``"unidic_lite"`` is used.
@@ -69,13 +113,22 @@ def get_word_tokenizer(
         sudachi_dict_type (``str``, *optional*, defaults to ``"core"``):
             (For Sudachi) Sudachi dictionary type to be used for tokenization.
             ``"small"``, ``"core"``, or ``"full"`` can be specified.
+        juman_max_workers (``int``, *optional*, defaults to ``1``):
+            (For Juman) The maximum number of Juman++ processes running in parallel.
+        word_cache_path (``str`` or ``os.PathLike``, *optional*):
+            Path to a SQLite database which caches results of word tokenization.
+            Results are keyed by the text and the configuration of the word tokenizer,
+            so a database can be shared among tokenizers and processes.
     """
+    word_tokenizer: Union[MainTokenizerABC, BasicTokenizer]
     if word_tokenizer_type == "basic":
         logger.warning("Argument normalize_text is ignored")
         word_tokenizer = BasicTokenizer(
             do_lower_case=do_lower_case, tokenize_chinese_chars=False
         )
     elif word_tokenizer_type == "mecab":
+        from .mainword import MecabTokenizer
+
         word_tokenizer = MecabTokenizer(
             do_lower_case=do_lower_case,
             normalize_text=normalize_text,
@@ -89,6 +142,8 @@ def get_word_tokenizer(
             do_lower_case=do_lower_case,
             normalize_text=normalize_text,
             ignore_max_byte_error=ignore_max_byte_error,
+            chunk_long_text=chunk_long_text,
+            max_workers=juman_max_workers,
         )
     elif word_tokenizer_type == "sudachi":
         from .mainword import SudachiTokenizer
@@ -97,6 +152,7 @@ def get_word_tokenizer(
             do_lower_case=do_lower_case,
             normalize_text=normalize_text,
             ignore_max_byte_error=ignore_max_byte_error,
+            chunk_long_text=chunk_long_text,
             split_mode=sudachi_split_mode,
             config_path=sudachi_config_path,
             resource_dir=sudachi_resource_dir,
@@ -112,9 +168,64 @@ def get_word_tokenizer(
         raise ValueError(
             f"Invalid word_tokenizer_type '{word_tokenizer_type}' is specified."
         )
+
+    if word_cache_path is not None:
+        from .mainword.cache import CachedWordTokenizer
+
+        config: Dict[str, Any] = {
+            "word_tokenizer_type": word_tokenizer_type,
+            "normalize_text": normalize_text,
+            "ignore_max_byte_error": ignore_max_byte_error,
+            "do_lower_case": do_lower_case,
+        }
+        if chunk_long_text:
+            config["chunk_long_text"] = chunk_long_text
+        if word_tokenizer_type == "mecab":
+            config.update(mecab_dic=mecab_dic, mecab_option=mecab_option)
+        elif word_tokenizer_type == "sudachi":
+            config.update(
+                sudachi_split_mode=sudachi_split_mode,
+                sudachi_config_path=sudachi_config_path,
+                sudachi_resource_dir=sudachi_resource_dir,
+                sudachi_dict_type=sudachi_dict_type,
+            )
+        word_tokenizer = CachedWordTokenizer(
+            word_tokenizer, path=word_cache_path, config=config
+        )
     return word_tokenizer
 
 
+class _DeferredText(int):
+    """Placeholder for a text whose tokenization is deferred in batch processing."""
+
+
+# The ids removed by skip_special_tokens and the ids decoded as tokens themselves
+# with whether they are added tokens (otherwise special tokens)
+_DecodeTable = Tuple[Set[int], Dict[int, Tuple[str, bool]]]
+# Attributes whose assignment invalidates the cached table (special tokens are set as "_bos_token" and so on)
+_DECODE_TABLE_ATTRIBUTES: Set[str] = {
+    *SpecialTokensMixin.SPECIAL_TOKENS_ATTRIBUTES,
+    "vocab",
+    "added_tokens_encoder",
+    "added_tokens_decoder",
+}
+
+
+def get_ids_to_tokens(vocab: Mapping[str, int]) -> Mapping[int, str]:
+    """Return the mapping of ids to tokens of the vocabulary.
+    The view is returned for ``CompactVocab``, otherwise it is built as ``collections.OrderedDict``.
+
+    Args:
+        vocab (``Mapping[str, int]``): The mapping of tokens to ids.
+
+    Returns:
+        ``Mapping[int, str]``: The mapping of ids to tokens.
+    """
+    if isinstance(vocab, CompactVocab):
+        return vocab.ids_to_tokens
+    return collections.OrderedDict([(ids, tok) for tok, ids in vocab.items()])
+
+
 class JapaneseTransformerTokenizer(BertJapaneseTokenizer):
     """Japanese tokenizer of main and sub word.
     Inherited from ``transformers.BertJapaneseTokenizer``.
@@ -138,6 +249,10 @@ class JapaneseTransformerTokenizer(BertJapaneseTokenizer):
         ignore_max_byte_error (``bool``, *optional*, defaults to ``False``):
             Whether or not to ignore error of max bytes (only valid with Juman and Sudachi).
             If valid, the tokenizer return empty list.
+        chunk_long_text (``bool``, *optional*, defaults to ``False``):
+            Whether to split a text over the max bytes into chunks at the ends of sentences or punctuations
+            and join the words of the chunks (only valid with Juman and Sudachi).
+            This takes precedence over *ignore_max_byte_error*.
         do_word_tokenize (``bool``, *optional*, defaults to ``True``):
             Whether to do (main) word tokenization.
         do_subword_tokenize (``bool``, *optional*, defaults to ``True``):
@@ -177,8 +292,39 @@ class JapaneseTransformerTokenizer(BertJapaneseTokenizer):
             ``"small"``, ``"core"``, or ``"full"`` can be specified.
         sp_model_kwargs (``str``, *optional*):
             (For sentencepiece) Optional arguments for ``sentencepiece.SentencePieceProcessor``.
+        juman_max_workers (``int``, *optional*, defaults to ``1``):
+            (For Juman) The maximum number of Juman++ processes running in parallel.
+        word_cache_path (``str`` or ``os.PathLike``, *optional*):
+            Path to a SQLite database which caches results of word tokenization.
+            It can be shared among tokenizers with different subword vocabularies.
+        subword_cache_size (``int``, *optional*):
+            The number of words whose subwords are cached (only valid with ``do_subword_by_word=True``).
+            If ``None``, the cache is not used.
+        subword_cache_file (``str`` or ``os.PathLike``, *optional*):
+            A snapshot saved by ``save_subword_cache`` to warm up the cache.
+        compact_vocab (``bool``, *optional*, defaults to ``False``):
+            Whether to store the vocabulary in a ``CompactVocab``, which holds all the tokens in one buffer
+            instead of ``dict`` objects. ``vocab`` and ``ids_to_tokens`` are views of it.
+        compact_vocab_file (``str`` or ``os.PathLike``, *optional*):
+            A file where the ``CompactVocab`` is saved and memory-mapped,
+            so that worker processes share it. If specified, *compact_vocab* is regarded as ``True``.
+
+    Batch encoding (such as ``tokenizer(texts)``) accepts the following arguments
+    to encode texts in parallel with replicas of the tokenizer in worker processes:
+
+    - ``n_jobs`` (``int``): The number of worker processes. ``-1`` means all CPUs.
+    - ``executor`` (``concurrent.futures.Executor``): An executor running workers in other processes.
+    - ``chunk_size`` (``int``): The number of texts sent to a worker at once.
+
+    The order of outputs is the same as the inputs.
     """
 
+    word_tokenizer: Union[MainTokenizerABC, BasicTokenizer]
+    # WordpieceTokenizer, CharacterTokenizer or SentencepieceTokenizer, used through the methods it has
+    subword_tokenizer: Any
+    vocab: Mapping[str, int]
+    ids_to_tokens: Mapping[int, str]
+
     def __init__(
         self,
         vocab_file: Optional[Union[str, os.PathLike]] = None,
@@ -186,6 +332,7 @@ class JapaneseTransformerTokenizer(BertJapaneseTokenizer):
         subword_tokenizer_type: str = "wordpiece",
         normalize_text: bool = True,
         ignore_max_byte_error: bool = False,
+        chunk_long_text: bool = False,
         do_lower_case: bool = False,
         do_word_tokenize: bool = True,
         do_subword_tokenize: bool = True,
@@ -203,7 +350,13 @@ class JapaneseTransformerTokenizer(BertJapaneseTokenizer):
         sudachi_resource_dir: Optional[str] = None,
         sudachi_dict_type: Optional[str] = "core",
         sp_model_kwargs: Optional[Dict[str, Any]] = None,
-        **kwargs,
+        juman_max_workers: int = 1,
+        word_cache_path: Optional[Union[str, os.PathLike]] = None,
+        subword_cache_size: Optional[int] = None,
+        subword_cache_file: Optional[Union[str, os.PathLike]] = None,
+        compact_vocab: bool = False,
+        compact_vocab_file: Optional[Union[str, os.PathLike]] = None,
+        **kwargs: Any,
     ):
         PreTrainedTokenizer.__init__(
             self,
@@ -220,33 +373,49 @@ class JapaneseTransformerTokenizer(BertJapaneseTokenizer):
         self.do_subword_by_word = do_subword_by_word
         self.word_tokenizer_type = word_tokenizer_type
         self.subword_tokenizer_type = subword_tokenizer_type
+        # State of each thread, such as texts deferred in tokenize_batch
+        self._local = threading.local()
+        self._parallel_encoder: Optional[ParallelEncoder] = None
+        self._decode_table: Optional[_DecodeTable] = None
+        self.subword_cache: Optional[SubwordCache] = None
+        self.profiler: Optional[TokenizerProfiler] = None
+        # Executor of the asynchronous methods, None for the default one of the event loop
+        self.async_executor: Optional[Executor] = None
+        # Kept to rebuild the word tokenizer in other processes
+        self.word_tokenizer_kwargs: Dict[str, Any] = dict(
+            word_tokenizer_type=word_tokenizer_type,
+            normalize_text=normalize_text,
+            ignore_max_byte_error=ignore_max_byte_error,
+            chunk_long_text=chunk_long_text,
+            do_lower_case=do_lower_case,
+            mecab_dic=mecab_dic,
+            mecab_option=mecab_option,
+            sudachi_split_mode=sudachi_split_mode,
+            sudachi_config_path=sudachi_config_path,
+            sudachi_resource_dir=sudachi_resource_dir,
+            sudachi_dict_type=sudachi_dict_type,
+            juman_max_workers=juman_max_workers,
+            word_cache_path=word_cache_path,
+        )
 
         if do_word_tokenize:
-            self.word_tokenizer = get_word_tokenizer(
-                word_tokenizer_type=word_tokenizer_type,
-                normalize_text=normalize_text,
-                ignore_max_byte_error=ignore_max_byte_error,
-                do_lower_case=do_lower_case,
-                mecab_dic=mecab_dic,
-                mecab_option=mecab_option,
-                sudachi_split_mode=sudachi_split_mode,
-                sudachi_config_path=sudachi_config_path,
-                sudachi_resource_dir=sudachi_resource_dir,
-                sudachi_dict_type=sudachi_dict_type,
-            )
+            self.word_tokenizer = get_word_tokenizer(**self.word_tokenizer_kwargs)
 
         if self.do_subword_tokenize and not call_from_pretrained:
             if self.subword_tokenizer_type in ["wordpiece", "character"]:
-                if not os.path.isfile(vocab_file):
+                if vocab_file is None or not os.path.isfile(vocab_file):
                     raise ValueError(
                         f"Can't find a vocabulary file at path '{vocab_file}'.\n"
                         "To load the vocabulary from a Google pretrained model use "
                         "`AutoTokenizer.from_pretrained(PRETRAINED_MODEL_NAME)`"
                     )
-                self.vocab = load_vocab(vocab_file)
-                self.ids_to_tokens = collections.OrderedDict(
-                    [(ids, tok) for tok, ids in self.vocab.items()]
-                )
+                if compact_vocab or compact_vocab_file is not None:
+                    self.vocab = CompactVocab.from_file(
+                        vocab_file, path=compact_vocab_file
+                    )
+                else:
+                    self.vocab = load_vocab(vocab_file)
+                self.ids_to_tokens = get_ids_to_tokens(self.vocab)
 
             if self.subword_tokenizer_type == "wordpiece":
                 self.subword_tokenizer = WordpieceTokenizer(
@@ -260,15 +429,13 @@ class JapaneseTransformerTokenizer(BertJapaneseTokenizer):
                 from .subword import SentencepieceTokenizer
 
                 self.subword_tokenizer = SentencepieceTokenizer(
-                    vocab_file=vocab_file, sp_model_kwargs=sp_model_kwargs
+                    vocab_file=None if vocab_file is None else os.fspath(vocab_file),
+                    sp_model_kwargs=sp_model_kwargs,
+                    compact_vocab=compact_vocab,
+                    compact_vocab_file=compact_vocab_file,
                 )
                 self.vocab = self.subword_tokenizer.vocab
-                self.ids_to_tokens = collections.OrderedDict(
-                    [
-                        (i, self.subword_tokenizer.sp_model.IdToPiece(i))
-                        for i in range(self.subword_tokenizer.bpe_vocab_size)
-                    ]
-                )
+                self.ids_to_tokens = get_ids_to_tokens(self.vocab)
             else:
                 raise ValueError(
                     f"Invalid subword_tokenizer_type '{subword_tokenizer_type}' is specified."
@@ -286,9 +453,13 @@ class JapaneseTransformerTokenizer(BertJapaneseTokenizer):
                     "Special tokens have been added in the vocabulary, make sure the associated word embeddings are"
                     " fine-tuned or trained."
                 )
+            if subword_cache_size is not None:
+                self.enable_subword_cache(subword_cache_size, path=subword_cache_file)
 
     @classmethod
-    def from_pretrained(cls, tokenizer_name_or_path: Union[str, os.PathLike], **kwargs):
+    def from_pretrained(
+        cls, tokenizer_name_or_path: Union[str, os.PathLike], **kwargs: Any
+    ) -> "JapaneseTransformerTokenizer":
         """
         Instantiate a ``transformers.BertJapaneseTokenizer`` (or a derived class) from a predefined tokenizer.
 
@@ -314,6 +485,10 @@ class JapaneseTransformerTokenizer(BertJapaneseTokenizer):
             ignore_max_byte_error (``bool``, *optional*, defaults to ``False``):
                 Whether or not to ignore error of max bytes (only valid with Juman and Sudachi).
                 If valid, the tokenizer return empty list.
+            chunk_long_text (``bool``, *optional*, defaults to ``False``):
+                Whether to split a text over the max bytes into chunks at the ends of sentences or punctuations
+                and join the words of the chunks (only valid with Juman and Sudachi).
+                This takes precedence over *ignore_max_byte_error*.
             do_lower_case (``bool``, *optional*, defaults to ``False``):
                 Whether or not to lowercase the input when tokenizing.
             do_word_tokenize (``bool``, *optional*, defaults to ``True``):
@@ -338,6 +513,22 @@ class JapaneseTransformerTokenizer(BertJapaneseTokenizer):
                 ``"small"``, ``"core"``, or ``"full"`` can be specified.
             sp_model_kwargs (``Dict[str, Any]``, *optional*):
                 (For sentencepiece) Optional arguments for ``sentencepiece.SentencePieceProcessor``.
+            juman_max_workers (``int``, *optional*, defaults to ``1``):
+                (For Juman) The maximum number of Juman++ processes running in parallel.
+            word_cache_path (``str`` or ``os.PathLike``, *optional*):
+                Path to a SQLite database which caches results of word tokenization.
+                It can be shared among tokenizers with different subword vocabularies.
+            subword_cache_size (``int``, *optional*):
+                The number of words whose subwords are cached (only valid with ``do_subword_by_word=True``).
+                If ``None``, the cache is not used.
+            subword_cache_file (``str`` or ``os.PathLike``, *optional*):
+                A snapshot saved by ``save_subword_cache`` to warm up the cache.
+            compact_vocab (``bool``, *optional*, defaults to ``False``):
+                Whether to store the vocabulary in a ``CompactVocab``, which holds all the tokens in one buffer
+                instead of ``dict`` objects. ``vocab`` and ``ids_to_tokens`` are views of it.
+            compact_vocab_file (``str`` or ``os.PathLike``, *optional*):
+                A file where the ``CompactVocab`` is saved and memory-mapped,
+                so that worker processes share it. If specified, *compact_vocab* is regarded as ``True``.
         """
 
         def _from_pretrained(
@@ -345,6 +536,7 @@ class JapaneseTransformerTokenizer(BertJapaneseTokenizer):
             word_tokenizer_type: str = "basic",
             normalize_text: bool = True,
             ignore_max_byte_error: bool = False,
+            chunk_long_text: bool = False,
             do_lower_case: bool = False,
             do_word_tokenize: bool = True,
             do_subword_by_word: bool = True,
@@ -355,17 +547,26 @@ class JapaneseTransformerTokenizer(BertJapaneseTokenizer):
             sudachi_resource_dir: Optional[str] = None,
             sudachi_dict_type: Optional[str] = "core",
             sp_model_kwargs: Optional[Dict[str, Any]] = None,
-            *init_inputs,
-            **kwargs,
-        ):
-            tokenizer_class = (
+            juman_max_workers: int = 1,
+            word_cache_path: Optional[Union[str, os.PathLike]] = None,
+            subword_cache_size: Optional[int] = None,
+            subword_cache_file: Optional[Union[str, os.PathLike]] = None,
+            compact_vocab: bool = False,
+            compact_vocab_file: Optional[Union[str, os.PathLike]] = None,
+            *init_inputs: Any,
+            **kwargs: Any,
+        ) -> "JapaneseTransformerTokenizer":
+            tokenizer_cls: Any = (
                 transformers.models.auto.tokenization_auto.tokenizer_class_from_name(
                     tokenizer_class
                 )
             )
-            tentative_tokenizer = tokenizer_class.from_pretrained(
+            tentative_tokenizer = tokenizer_cls.from_pretrained(
                 tokenizer_name_or_path, *init_inputs, **kwargs
             )
+            subword_tokenizer: Any
+            vocab: Mapping[str, int]
+            ids_to_tokens: Mapping[int, str]
             if isinstance(
                 tentative_tokenizer,
                 (
@@ -388,26 +589,44 @@ class JapaneseTransformerTokenizer(BertJapaneseTokenizer):
                 from .subword import SentencepieceTokenizer
 
                 subword_tokenizer = SentencepieceTokenizer(
-                    vocab_file=None, sp_model_kwargs=sp_model_kwargs, sp_model=sp_model
+                    vocab_file=None,
+                    sp_model_kwargs=sp_model_kwargs,
+                    sp_model=sp_model,
+                    compact_vocab=compact_vocab,
+                    compact_vocab_file=compact_vocab_file,
                 )
                 vocab = subword_tokenizer.vocab
-                ids_to_tokens = collections.OrderedDict(
-                    [
-                        (i, subword_tokenizer.sp_model.IdToPiece(i))
-                        for i in range(subword_tokenizer.bpe_vocab_size)
-                    ]
-                )
+                ids_to_tokens = get_ids_to_tokens(vocab)
             elif isinstance(tentative_tokenizer, BertJapaneseTokenizer):
                 # WordPiece or character
+                vocab = tentative_tokenizer.vocab
+                ids_to_tokens = tentative_tokenizer.ids_to_tokens
+                if compact_vocab or compact_vocab_file is not None:
+                    vocab = CompactVocab.from_vocab(vocab, path=compact_vocab_file)
+                    ids_to_tokens = vocab.ids_to_tokens
                 subword_tokenizer = tentative_tokenizer.subword_tokenizer
-                if isinstance(subword_tokenizer, WordpieceTokenizer):
+                if isinstance(
+                    subword_tokenizer, tokenization_bert_japanese.WordpieceTokenizer
+                ):
                     subword_tokenizer_type = "wordpiece"
-                elif isinstance(subword_tokenizer, CharacterTokenizer):
+                    # Replaced with the trie-based one which gives the same outputs
+                    subword_tokenizer = WordpieceTokenizer(
+                        vocab=vocab,
+                        unk_token=subword_tokenizer.unk_token,
+                        max_input_chars_per_word=subword_tokenizer.max_input_chars_per_word,
+                    )
+                elif isinstance(
+                    subword_tokenizer, tokenization_bert_japanese.CharacterTokenizer
+                ):
                     subword_tokenizer_type = "character"
+                    # Replaced with the one which looks up ids in bulk
+                    subword_tokenizer = CharacterTokenizer(
+                        vocab=vocab,
+                        unk_token=subword_tokenizer.unk_token,
+                        normalize_text=subword_tokenizer.normalize_text,
+                    )
                 else:
                     raise NotImplementedError()
-                vocab = tentative_tokenizer.vocab
-                ids_to_tokens = tentative_tokenizer.ids_to_tokens
             else:
                 raise NotImplementedError()
             tokenizer = cls(
@@ -415,6 +634,7 @@ class JapaneseTransformerTokenizer(BertJapaneseTokenizer):
                 subword_tokenizer_type=subword_tokenizer_type,
                 normalize_text=normalize_text,
                 ignore_max_byte_error=ignore_max_byte_error,
+                chunk_long_text=chunk_long_text,
                 do_lower_case=do_lower_case,
                 do_word_tokenize=do_word_tokenize,
                 do_subword_tokenize=True,
@@ -431,6 +651,8 @@ class JapaneseTransformerTokenizer(BertJapaneseTokenizer):
                 sudachi_config_path=sudachi_config_path,
                 sudachi_resource_dir=sudachi_resource_dir,
                 sudachi_dict_type=sudachi_dict_type,
+                juman_max_workers=juman_max_workers,
+                word_cache_path=word_cache_path,
             )
             tokenizer.subword_tokenizer = subword_tokenizer
             tokenizer.vocab = vocab
@@ -447,6 +669,10 @@ class JapaneseTransformerTokenizer(BertJapaneseTokenizer):
                     "Special tokens have been added in the vocabulary, make sure the associated word embeddings are"
                     " fine-tuned or trained."
                 )
+            if subword_cache_size is not None:
+                tokenizer.enable_subword_cache(
+                    subword_cache_size, path=subword_cache_file
+                )
             return tokenizer
 
         if tokenizer_name_or_path in [
@@ -461,7 +687,7 @@ class JapaneseTransformerTokenizer(BertJapaneseTokenizer):
             )
 
         if tokenizer_name_or_path in PUBLIC_AVAILABLE_SETTING_MAP.keys():
-            dct_setting: Dict[str, str] = PUBLIC_AVAILABLE_SETTING_MAP[
+            dct_setting: Dict[str, Union[str, bool]] = PUBLIC_AVAILABLE_SETTING_MAP[
                 tokenizer_name_or_path
             ]
             for k, v in dct_setting.items():
@@ -473,53 +699,1291 @@ class JapaneseTransformerTokenizer(BertJapaneseTokenizer):
                 raise ValueError("tokenizer_class must be specified")
         return _from_pretrained(**kwargs)
 
-    def _tokenize(self, text):
-        if self.do_word_tokenize:
-            tokens = self.word_tokenizer.tokenize(
-                text, never_split=self.all_special_tokens
+    def to_fast(self) -> "JapaneseTransformerTokenizerFast":
+        """Convert into ``JapaneseTransformerTokenizerFast``,
+        whose subword tokenization, padding and truncation run in the ``tokenizers`` library.
+
+        Returns:
+            ``JapaneseTransformerTokenizerFast``: The converted tokenizer.
+
+        Raises:
+            NotImplementedError: If the tokenizer can't be reproduced in ``tokenizers``,
+                such as a sentencepiece model with pieces ending with a digit and a comma.
+        """
+        from .tokenization_utils_fast import (
+            JapaneseTransformerTokenizerFast,
+            build_backend_tokenizer,
+        )
+
+        return JapaneseTransformerTokenizerFast(
+            tokenizer_object=build_backend_tokenizer(self),
+            word_tokenizer_type=self.word_tokenizer_type,
+            do_word_tokenize=self.do_word_tokenize,
+            subword_tokenizer_type=self.subword_tokenizer_type,
+            word_tokenizer_kwargs=self.word_tokenizer_kwargs,
+            model_max_length=self.model_max_length,
+            **self.special_tokens_map,
+        )
+
+    def enable_subword_cache(
+        self, maxsize: int = 65536, path: Optional[Union[str, os.PathLike]] = None
+    ) -> SubwordCache:
+        """Cache subword tokenization of each word in a LRU cache.
+        This is used when ``do_subword_by_word=True``.
+
+        Args:
+            maxsize (``int``, *optional*, defaults to ``65536``):
+                The maximum number of words in the cache.
+            path (``str`` or ``os.PathLike``, *optional*):
+                A snapshot saved by ``save_subword_cache``, which is loaded if it exists.
+
+        Returns:
+            ``SubwordCache``: The cache, whose ``cache_info()`` shows hits and misses.
+        """
+        vocab_hash: str = hashlib.sha1(
+            "\n".join(self.ids_to_tokens.values()).encode("utf-8")
+        ).hexdigest()
+        self.subword_cache = SubwordCache(
+            maxsize=maxsize, fingerprint=f"{self.subword_tokenizer_type}:{vocab_hash}"
+        )
+        if path is not None and os.path.isfile(path):
+            if not self.subword_cache.load(path):
+                logger.warning(
+                    f"Subword cache {path} is not loaded because the vocabulary is different."
+                )
+        return self.subword_cache
+
+    def save_subword_cache(self, path: Union[str, os.PathLike]) -> None:
+        """Save a snapshot of the subword cache.
+
+        Args:
+            path (``str`` or ``os.PathLike``): The file path.
+        """
+        if self.subword_cache is None:
+            raise ValueError("Subword cache is not enabled")
+        self.subword_cache.save(path)
+
+    def enable_profiling(
+        self, slow_threshold: Optional[float] = None, max_slow_inputs: int = 100
+    ) -> TokenizerProfiler:
+        """Measure the time of each stage of tokenization and capture slow inputs.
+        Texts encoded in worker processes (with ``n_jobs`` or ``executor``) are not profiled.
+
+        Args:
+            slow_threshold (``float``, *optional*):
+                Seconds of the word and subword tokenization of a text over which the text is recorded.
+                If specified, texts in a batch are analyzed one by one so that each of them is timed.
+            max_slow_inputs (``int``, *optional*, defaults to ``100``):
+                The number of recorded inputs. The slowest ones are kept.
+
+        Returns:
+            ``TokenizerProfiler``: The profiler, whose ``stats()`` shows the time of each stage.
+        """
+        self.profiler = TokenizerProfiler(
+            slow_threshold=slow_threshold, max_slow_inputs=max_slow_inputs
+        )
+        return self.profiler
+
+    def disable_profiling(self) -> None:
+        """Stop profiling."""
+        self.profiler = None
+
+    def _cached_subword_tokenize(self, word: str) -> List[str]:
+        cache: Optional[SubwordCache] = self.subword_cache
+        tokens: Optional[List[str]] = None if cache is None else cache.get(word)
+        if tokens is None:
+            tokens = self.subword_tokenizer.tokenize(word)
+            if cache is not None:
+                cache.put(word, tokens)
+        return tokens
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        super().__setattr__(name, value)
+        if name.lstrip("_") in _DECODE_TABLE_ATTRIBUTES:
+            self.__dict__["_decode_table"] = None
+
+    def _add_tokens(
+        self,
+        new_tokens: Union[List[str], List[AddedToken]],
+        special_tokens: bool = False,
+    ) -> int:
+        num_added: int = super()._add_tokens(new_tokens, special_tokens=special_tokens)
+        self._decode_table = None
+        return num_added
+
+    def __getstate__(self) -> Dict[str, Any]:
+        # Word tokenizers may hold unpicklable objects such as a Juman++ process,
+        # so they are rebuilt from word_tokenizer_kwargs when unpickled
+        state: Dict[str, Any] = self.__dict__.copy()
+        state["_has_word_tokenizer"] = state.pop("word_tokenizer", None) is not None
+        del state["_local"]
+        state["_parallel_encoder"] = None
+        state["_decode_table"] = None
+        state["profiler"] = None
+        state["async_executor"] = None
+        return state
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        has_word_tokenizer: bool = state.pop("_has_word_tokenizer")
+        self.__dict__.update(state)
+        self._local = threading.local()
+        if has_word_tokenizer:
+            self.word_tokenizer = get_word_tokenizer(**self.word_tokenizer_kwargs)
+
+    def prepare_for_tokenization(
+        self, text: str, is_split_into_words: bool = False, **kwargs: Any
+    ) -> Tuple[str, Dict[str, Any]]:
+        # Arguments for parallel encoding are not used in tokenization
+        for key in ["n_jobs", "executor", "chunk_size"]:
+            kwargs.pop(key, None)
+        return super().prepare_for_tokenization(
+            text, is_split_into_words=is_split_into_words, **kwargs
+        )
+
+    def _tokenize(self, text: str) -> Sequence[Union[str, _DeferredText]]:
+        deferred_texts: Optional[List[str]] = getattr(
+            self._local, "deferred_texts", None
+        )
+        if deferred_texts is not None:
+            # Called from tokenize_batch, so the text is tokenized later
+            deferred_texts.append(text)
+            return [_DeferredText(len(deferred_texts) - 1)]
+        return self._tokenize_batch([text])[0]
+
+    def normalize_batch(self, texts: List[str]) -> List[str]:
+        """Apply unicode normalization of the word tokenizer to texts.
+        Texts are normalized once in this stage before word tokenization,
+        and ASCII-only or already normalized texts are returned as they are.
+
+        Args:
+            texts (``List[str]``): Sequences to be normalized.
+
+        Returns:
+            ``List[str]``: The normalized texts.
+        """
+        if self.do_word_tokenize and isinstance(self.word_tokenizer, MainTokenizerABC):
+            return self.word_tokenizer.normalize_batch(texts)
+        return texts
+
+    def _word_tokenize_batch(
+        self, texts: List[str], is_normalized: bool = False
+    ) -> List[List[str]]:
+        if not self.do_word_tokenize:
+            return [[text] for text in texts]
+        prefetched_words: Optional[Dict[str, List[str]]] = getattr(
+            self._local, "prefetched_words", None
+        )
+        if prefetched_words is not None and all(
+            text in prefetched_words for text in texts
+        ):
+            # Analyzed asynchronously in _arun
+            return [prefetched_words[text] for text in texts]
+        elif isinstance(self.word_tokenizer, MainTokenizerABC):
+            return self.word_tokenizer.tokenize_batch(
+                texts, never_split=self.all_special_tokens, is_normalized=is_normalized
+            )
+        else:
+            return [
+                self.word_tokenizer.tokenize(text, never_split=self.all_special_tokens)
+                for text in texts
+            ]
+
+    def _get_subword_tokenize(self) -> Callable[[str], List[str]]:
+        return (
+            self.subword_tokenizer.tokenize
+            if self.subword_cache is None
+            else self._cached_subword_tokenize
+        )
+
+    def _tokenize_batch(self, texts: List[str]) -> List[List[str]]:
+        """Batch version of ``_tokenize``.
+        Main word tokenization is applied to all the texts at once.
+        """
+        if self.profiler is not None:
+            return self._profiled_tokenize_batch(
+                self.profiler, texts, self._subword_tokenize_batch
+            )
+        return self._subword_tokenize_batch(
+            self._word_tokenize_batch(self.normalize_batch(texts), is_normalized=True)
+        )
+
+    def _profiled_tokenize_batch(
+        self,
+        profiler: TokenizerProfiler,
+        texts: List[str],
+        subword_batch: Callable[[List[List[str]]], List[_T]],
+    ) -> List[_T]:
+        # subword_batch is _subword_tokenize_batch or _subword_encode_batch
+        if profiler.slow_threshold is not None and len(texts) > 1:
+            return [
+                self._profiled_tokenize_batch(profiler, [text], subword_batch)[0]
+                for text in texts
+            ]
+        start: float = time.perf_counter()
+        with profiler.timer("normalize", texts):
+            normalized_texts: List[str] = self.normalize_batch(texts)
+        with profiler.timer("word", texts):
+            batch_words: List[List[str]] = self._word_tokenize_batch(
+                normalized_texts, is_normalized=True
             )
+        with profiler.timer("subword", texts):
+            batch_tokens: List[_T] = subword_batch(batch_words)
+        if len(texts) == 1:
+            profiler.record_input(texts[0], "tokenize", time.perf_counter() - start)
+        return batch_tokens
+
+    def _subword_tokenize_batch(self, batch_tokens: List[List[str]]) -> List[List[str]]:
+        if not self.do_subword_tokenize:
+            return batch_tokens
+        elif not self.do_subword_by_word:
+            texts: List[str] = [" ".join(tokens) for tokens in batch_tokens]
+            if hasattr(self.subword_tokenizer, "tokenize_batch"):
+                return self.subword_tokenizer.tokenize_batch(texts)
+            return [self.subword_tokenizer.tokenize(text) for text in texts]
+        elif hasattr(self.subword_tokenizer, "tokenize_batch"):
+            # The words of all the texts are tokenized in one call (sentencepiece)
+            word_subwords: Iterator[List[str]] = iter(
+                self._subword_tokenize_words(
+                    [token for tokens in batch_tokens for token in tokens]
+                )
+            )
+            return [
+                [sub_token for _ in tokens for sub_token in next(word_subwords)]
+                for tokens in batch_tokens
+            ]
         else:
-            tokens = [text]
-
-        if self.do_subword_tokenize:
-            if self.do_subword_by_word:
-                split_tokens = [
-                    sub_token
-                    for token in tokens
-                    for sub_token in self.subword_tokenizer.tokenize(token)
+            subword_tokenize = self._get_subword_tokenize()
+            return [
+                [sub_token for token in tokens for sub_token in subword_tokenize(token)]
+                for tokens in batch_tokens
+            ]
+
+    def _subword_tokenize_words(self, words: List[str]) -> List[List[str]]:
+        # Words missing in the subword cache are tokenized at once with tokenize_batch
+        if self.subword_cache is None:
+            return self.subword_tokenizer.tokenize_batch(words)
+        results: List[Optional[List[str]]] = [
+            self.subword_cache.get(word) for word in words
+        ]
+        missing_words: List[str] = list(
+            dict.fromkeys(
+                word for word, tokens in zip(words, results) if tokens is None
+            )
+        )
+        tokenized: Dict[str, List[str]] = (
+            dict(
+                zip(missing_words, self.subword_tokenizer.tokenize_batch(missing_words))
+            )
+            if missing_words
+            else {}
+        )
+        for word, tokens in tokenized.items():
+            self.subword_cache.put(word, tokens)
+        return [
+            tokenized[word] if tokens is None else tokens
+            for word, tokens in zip(words, results)
+        ]
+
+    def _can_encode_ids(self) -> bool:
+        # Subword tokenizers with encode_batch convert words into ids without token strings.
+        # The id of unk_token must be the same as convert_tokens_to_ids, and the subword cache holds tokens.
+        return (
+            self.do_subword_tokenize
+            and self.subword_cache is None
+            and hasattr(self.subword_tokenizer, "encode_batch")
+            and self.subword_tokenizer.unk_id is not None
+            and self.subword_tokenizer.unk_id
+            == self._convert_token_to_id_with_added_voc(self.unk_token)
+        )
+
+    def _subword_encode_batch(self, batch_words: List[List[str]]) -> List[List[int]]:
+        if not self.do_subword_by_word:
+            return self.subword_tokenizer.encode_batch(
+                [" ".join(words) for words in batch_words]
+            )
+        word_ids: Iterator[List[int]] = iter(
+            self.subword_tokenizer.encode_batch(
+                [word for words in batch_words for word in words]
+            )
+        )
+        return [
+            [token_id for _ in words for token_id in next(word_ids)]
+            for words in batch_words
+        ]
+
+    def _encode_batch(self, texts: List[str]) -> List[List[int]]:
+        """Version of ``_tokenize_batch`` which returns ids.
+        If the subword tokenizer has ``encode_batch``, ids of all the texts are looked up at once
+        without making token strings.
+        """
+        if not self._can_encode_ids():
+            return [
+                self.convert_tokens_to_ids(tokens)
+                for tokens in self._tokenize_batch(texts)
+            ]
+        if self.profiler is not None:
+            return self._profiled_tokenize_batch(
+                self.profiler, texts, self._subword_encode_batch
+            )
+        return self._subword_encode_batch(
+            self._word_tokenize_batch(self.normalize_batch(texts), is_normalized=True)
+        )
+
+    def _tokenize_batch_with_offsets(
+        self, texts: List[str]
+    ) -> List[Tuple[List[str], List[Span]]]:
+        """Version of ``_tokenize_batch`` which also returns the span of each token in the text.
+        Spans are traced through unicode normalization, word tokenization and subword tokenization.
+        """
+        word_tokenizer_type: str = self.word_tokenizer_kwargs["word_tokenizer_type"]
+        # Normalization of sentencepiece is approximated by NFKC
+        do_normalize: bool = (
+            self.do_word_tokenize
+            and word_tokenizer_type != "basic"
+            and self.word_tokenizer_kwargs["normalize_text"]
+        ) or (
+            self.do_subword_tokenize and self.subword_tokenizer_type == "sentencepiece"
+        )
+        do_lower_case: bool = (
+            self.do_word_tokenize and self.word_tokenizer_kwargs["do_lower_case"]
+        )
+        subword_tokenize: Optional[Callable[[str], List[str]]] = (
+            self._get_subword_tokenize() if self.do_subword_tokenize else None
+        )
+        prefix: str = {"wordpiece": "##", "sentencepiece": SPIECE_UNDERLINE}.get(
+            self.subword_tokenizer_type, ""
+        )
+        unk_token: str = str(self.unk_token)
+
+        alignments: List[Tuple[str, Optional[List[Span]]]] = [
+            normalize_with_alignment(text) if do_normalize else (text, None)
+            for text in texts
+        ]
+        batch_words: List[List[str]]
+        if (
+            self.do_word_tokenize
+            and isinstance(self.word_tokenizer, MainTokenizerABC)
+            and self.word_tokenizer.normalize_text
+        ):
+            # The texts normalized for alignment are passed not to be normalized again
+            batch_words = self._word_tokenize_batch(
+                [normalized for normalized, _ in alignments], is_normalized=True
+            )
+        else:
+            batch_words = self._word_tokenize_batch(texts)
+
+        results: List[Tuple[List[str], List[Span]]] = []
+        for text, (normalized, normalized_spans), words in zip(
+            texts, alignments, batch_words
+        ):
+            search_text: str = normalized.lower() if do_lower_case else normalized
+            if len(search_text) != len(normalized):
+                search_text = normalized
+            word_spans: List[Span] = (
+                align_words(search_text, words)
+                if self.do_word_tokenize
+                else [(0, len(normalized))]
+            )
+
+            tokens: List[str]
+            spans: List[Span]
+            if subword_tokenize is None:
+                tokens, spans = words, word_spans
+            elif self.do_subword_by_word:
+                tokens, spans = [], []
+                for word, (word_start, word_end) in zip(words, word_spans):
+                    subwords: List[str] = subword_tokenize(word)
+                    subword_spans: List[Span] = (
+                        [(i, i + 1) for i in range(len(subwords))]
+                        if self.subword_tokenizer_type == "character"
+                        else align_subwords(
+                            search_text[word_start:word_end],
+                            subwords,
+                            unk_token,
+                            prefix=prefix,
+                        )
+                    )
+                    tokens.extend(subwords)
+                    spans.extend(
+                        (
+                            min(word_start + start, word_end),
+                            min(word_start + end, word_end),
+                        )
+                        for start, end in subword_spans
+                    )
+            else:
+                tokens = self.subword_tokenizer.tokenize(" ".join(words))
+                # Subwords are located in the joined surfaces of words
+                positions: List[int] = []
+                for word_start, word_end in word_spans:
+                    if positions:
+                        positions.append(word_start)
+                    positions.extend(range(word_start, word_end))
+                positions.append(len(normalized))
+                spans = [
+                    (positions[start], positions[end - 1] + 1)
+                    if start < end
+                    else (positions[start],) * 2
+                    for start, end in align_subwords(
+                        " ".join(
+                            search_text[word_start:word_end]
+                            for word_start, word_end in word_spans
+                        ),
+                        tokens,
+                        unk_token,
+                        prefix=prefix,
+                    )
+                ]
+
+            if normalized_spans is not None:
+                spans = [
+                    (normalized_spans[start][0], normalized_spans[end - 1][1])
+                    if start < end
+                    else (
+                        (normalized_spans[start][0],) * 2
+                        if start < len(normalized_spans)
+                        else (len(text),) * 2
+                    )
+                    for start, end in spans
+                ]
+            results.append((tokens, spans))
+        return results
+
+    def tokenize_with_offsets(self, text: str) -> Tuple[List[str], List[Span]]:
+        """Converts a string in a sequence of tokens with the span of each token in the string.
+        The tokens are the same as ``tokenize``.
+
+        Args:
+            text (``str``): A sequence to be encoded.
+
+        Returns:
+            ``Tuple[List[str], List[Tuple[int, int]]]``: The tokens and their ``(start, end)`` in *text*.
+        """
+        return self.tokenize_batch_with_offsets([text])[0]
+
+    def tokenize_batch_with_offsets(
+        self, texts: List[str]
+    ) -> List[Tuple[List[str], List[Span]]]:
+        """Batch version of ``tokenize_with_offsets``.
+
+        Args:
+            texts (``List[str]``): Sequences to be encoded.
+
+        Returns:
+            ``List[Tuple[List[str], List[Tuple[int, int]]]]``: The tokens and their spans for each sequence.
+        """
+        all_special_tokens_extended: Dict[str, AddedToken] = {
+            str(t): t
+            for t in self.all_special_tokens_extended
+            if isinstance(t, AddedToken)
+        }
+        no_split_token = set(self.unique_no_split_tokens)
+        # Split added tokens in the same way as PreTrainedTokenizer.tokenize
+        batch_parts: List[List[Tuple[str, int, int]]] = []
+        chunks: List[str] = []
+        for text in texts:
+            parts: List[List[Any]] = []
+            start: int = 0
+            for part in self.tokens_trie.split(text):
+                parts.append([part, start, start + len(part)])
+                start += len(part)
+            for i, (part, _, _) in enumerate(parts):
+                if part not in no_split_token:
+                    continue
+                tok_extended = all_special_tokens_extended.get(part, None)
+                strip_right: bool = (
+                    tok_extended.rstrip
+                    if isinstance(tok_extended, AddedToken)
+                    else True
+                )
+                strip_left: bool = (
+                    tok_extended.lstrip
+                    if isinstance(tok_extended, AddedToken)
+                    else True
+                )
+                if strip_right and i < len(parts) - 1:
+                    right = parts[i + 1]
+                    right[1] = right[2] - len(right[0].lstrip())
+                    right[0] = right[0].lstrip()
+                if strip_left and i > 0:
+                    left = parts[i - 1]
+                    left[2] = left[1] + len(left[0].rstrip())
+                    left[0] = left[0].rstrip()
+            batch_parts.append([tuple(part) for part in parts if part[0]])
+            chunks.extend(
+                part[0] for part in parts if part[0] and part[0] not in no_split_token
+            )
+
+        chunk_results = iter(self._tokenize_batch_with_offsets(chunks))
+        results: List[Tuple[List[str], List[Span]]] = []
+        for text_parts in batch_parts:
+            tokens: List[str] = []
+            spans: List[Span] = []
+            for part, start, end in text_parts:
+                if part in no_split_token:
+                    tokens.append(part)
+                    spans.append((start, end))
+                else:
+                    chunk_tokens, chunk_spans = next(chunk_results)
+                    tokens.extend(chunk_tokens)
+                    spans.extend(
+                        (start + span_start, start + span_end)
+                        for span_start, span_end in chunk_spans
+                    )
+            results.append((tokens, spans))
+        return results
+
+    def _defer_batch(
+        self, texts: List[str], **kwargs: Any
+    ) -> Tuple[List[List[str]], List[str]]:
+        """Split texts by added tokens, and defer tokenization of the other parts.
+
+        Returns:
+            ``Tuple[List[List[str]], List[str]]``: Added tokens and placeholders of the deferred parts
+            for each text, and the deferred parts.
+        """
+        deferred_texts: List[str] = []
+        self._local.deferred_texts = deferred_texts
+        try:
+            batch_tokens: List[List[str]] = [
+                self.tokenize(text, **kwargs) for text in texts
+            ]
+        finally:
+            self._local.deferred_texts = None
+        return batch_tokens, deferred_texts
+
+    def tokenize_batch(self, texts: List[str], **kwargs: Any) -> List[List[str]]:
+        """Converts strings in sequences of tokens.
+        Added tokens are taken care of in the same way as ``tokenize``,
+        and the remaining parts of all the texts are tokenized at once.
+
+        Args:
+            texts (``List[str]``): Sequences to be encoded.
+
+        Returns:
+            ``List[List[str]]``: The list of tokens for each sequence.
+        """
+        batch_tokens, deferred_texts = self._defer_batch(texts, **kwargs)
+        deferred_tokens: List[List[str]] = self._tokenize_batch(deferred_texts)
+        return [
+            [
+                sub_token
+                for token in tokens
+                for sub_token in (
+                    deferred_tokens[token]
+                    if isinstance(token, _DeferredText)
+                    else [token]
+                )
+            ]
+            for tokens in batch_tokens
+        ]
+
+    def _convert_texts_to_ids(self, texts: List[str], **kwargs: Any) -> List[List[int]]:
+        """Version of ``tokenize_batch`` followed by ``convert_tokens_to_ids``,
+        which skips token strings where the subword tokenizer allows it.
+        """
+        batch_tokens, deferred_texts = self._defer_batch(texts, **kwargs)
+        if not deferred_texts:
+            return [self.convert_tokens_to_ids(tokens) for tokens in batch_tokens]
+        deferred_ids: List[List[int]] = self._encode_batch(deferred_texts)
+        return [
+            [
+                token_id
+                for token in tokens
+                for token_id in (
+                    deferred_ids[token]
+                    if isinstance(token, _DeferredText)
+                    else [self.convert_tokens_to_ids(token)]
+                )
+            ]
+            for tokens in batch_tokens
+        ]
+
+    def encode_batch(
+        self, texts: List[str], add_special_tokens: bool = True, **kwargs: Any
+    ) -> List[List[int]]:
+        """Converts strings into sequences of ids, which is the same as ``encode`` of each text.
+        WordPiece, character and sentencepiece tokenizers look up ids directly without making token strings,
+        so use this instead of ``tokenize_batch`` and ``convert_tokens_to_ids`` if tokens are not needed.
+
+        Args:
+            texts (``List[str]``): Sequences to be encoded.
+            add_special_tokens (``bool``, *optional*, defaults to ``True``):
+                Whether to add special tokens such as ``[CLS]`` and ``[SEP]``.
+
+        Returns:
+            ``List[List[int]]``: The ids of the tokens for each sequence.
+        """
+        batch_ids: List[List[int]] = self._convert_texts_to_ids(texts, **kwargs)
+        if not add_special_tokens:
+            return batch_ids
+        return [self.build_inputs_with_special_tokens(ids) for ids in batch_ids]
+
+    def _run_with_words(
+        self, words: Optional[Dict[str, List[str]]], func: Callable[[], Any]
+    ) -> Any:
+        self._local.prefetched_words = words
+        try:
+            return func()
+        finally:
+            self._local.prefetched_words = None
+
+    async def _arun(self, texts: List[str], func: Callable[[], Any]) -> Any:
+        """Run *func* tokenizing *texts* in ``async_executor`` not to block the event loop.
+        If the word tokenizer has ``atokenize_batch`` (Juman++), words are analyzed asynchronously beforehand,
+        so concurrent calls overlap their analysis without occupying threads.
+        """
+        words: Optional[Dict[str, List[str]]] = None
+        if self.do_word_tokenize and hasattr(self.word_tokenizer, "atokenize_batch"):
+            normalized_texts: List[str] = self.normalize_batch(
+                self._defer_batch(texts)[1]
+            )
+            words = dict(
+                zip(
+                    normalized_texts,
+                    await self.word_tokenizer.atokenize_batch(
+                        normalized_texts,
+                        never_split=self.all_special_tokens,
+                        is_normalized=True,
+                    ),
+                )
+            )
+        loop: asyncio.AbstractEventLoop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self.async_executor, functools.partial(self._run_with_words, words, func)
+        )
+
+    async def aclose(self) -> None:
+        """Release resources of the asynchronous methods in the running event loop,
+        such as Juman++ processes. Call this before the event loop is closed.
+        """
+        word_tokenizer: Any = getattr(self, "word_tokenizer", None)
+        if hasattr(word_tokenizer, "aclose"):
+            await word_tokenizer.aclose()
+
+    async def atokenize(self, text: str, **kwargs: Any) -> List[str]:
+        """Asynchronous version of ``tokenize``.
+        See ``atokenize_batch`` for the execution.
+
+        Args:
+            text (``str``): A sequence to be encoded.
+
+        Returns:
+            ``List[str]``: The list of tokens.
+        """
+        return (await self.atokenize_batch([text], **kwargs))[0]
+
+    async def atokenize_batch(self, texts: List[str], **kwargs: Any) -> List[List[str]]:
+        """Asynchronous version of ``tokenize_batch``.
+        Juman++ is called through asyncio streams, and the other work runs in ``tokenizer.async_executor``
+        (the default executor of the event loop if ``None``), so the event loop is not blocked.
+
+        Args:
+            texts (``List[str]``): Sequences to be encoded.
+
+        Returns:
+            ``List[List[str]]``: The list of tokens for each sequence.
+        """
+        return await self._arun(
+            texts, functools.partial(self.tokenize_batch, texts, **kwargs)
+        )
+
+    async def aencode(
+        self,
+        text: Union[str, List[str], List[int]],
+        text_pair: Optional[Union[str, List[str], List[int]]] = None,
+        **kwargs: Any,
+    ) -> List[int]:
+        """Asynchronous version of ``encode``.
+        See ``atokenize_batch`` for the execution.
+
+        Returns:
+            ``List[int]``: The ids of the tokens.
+        """
+        texts: List[str] = [t for t in (text, text_pair) if isinstance(t, str)]
+        return await self._arun(
+            texts, functools.partial(self.encode, text, text_pair, **kwargs)
+        )
+
+    async def abatch_encode(
+        self, batch_text_or_text_pairs: List[Any], **kwargs: Any
+    ) -> BatchEncoding:
+        """Asynchronous version of calling the tokenizer with a batch.
+        See ``atokenize_batch`` for the execution.
+
+        Args:
+            batch_text_or_text_pairs (``List[str]`` or ``List[Tuple[str, str]]``):
+                The batch of sequences or pairs of sequences.
+            kwargs: Passed to ``__call__``, such as *padding* and *return_tensors*.
+
+        Returns:
+            ``BatchEncoding``: The encodings.
+        """
+        texts: List[str] = [
+            text
+            for item in batch_text_or_text_pairs
+            for text in (item if isinstance(item, (list, tuple)) else [item])
+            if isinstance(text, str)
+        ]
+        return await self._arun(
+            texts, functools.partial(self, batch_text_or_text_pairs, **kwargs)
+        )
+
+    def _encode_plus(
+        self,
+        text: Union[TextInput, PreTokenizedInput, EncodedInput],
+        text_pair: Optional[Union[TextInput, PreTokenizedInput, EncodedInput]] = None,
+        add_special_tokens: bool = True,
+        padding_strategy: PaddingStrategy = PaddingStrategy.DO_NOT_PAD,
+        truncation_strategy: TruncationStrategy = TruncationStrategy.DO_NOT_TRUNCATE,
+        max_length: Optional[int] = None,
+        stride: int = 0,
+        is_split_into_words: bool = False,
+        pad_to_multiple_of: Optional[int] = None,
+        return_tensors: Optional[Union[str, TensorType]] = None,
+        return_token_type_ids: Optional[bool] = None,
+        return_attention_mask: Optional[bool] = None,
+        return_overflowing_tokens: bool = False,
+        return_special_tokens_mask: bool = False,
+        return_offsets_mapping: bool = False,
+        return_length: bool = False,
+        verbose: bool = True,
+        **kwargs: Any,
+    ) -> BatchEncoding:
+        if not return_offsets_mapping or is_split_into_words:
+            if not is_split_into_words:
+                # Strings are converted into ids without token strings where possible
+                texts: List[str] = [t for t in (text, text_pair) if isinstance(t, str)]
+                text_ids: Iterator[List[int]] = iter(
+                    self._convert_texts_to_ids(texts, **kwargs)
+                )
+                # Empty ids are not accepted as input_ids, but the string is tokenized into nothing
+                text, text_pair = [
+                    (next(text_ids) or t) if isinstance(t, str) else t
+                    for t in (text, text_pair)
                 ]
+            return super()._encode_plus(
+                text,
+                text_pair=text_pair,
+                add_special_tokens=add_special_tokens,
+                padding_strategy=padding_strategy,
+                truncation_strategy=truncation_strategy,
+                max_length=max_length,
+                stride=stride,
+                is_split_into_words=is_split_into_words,
+                pad_to_multiple_of=pad_to_multiple_of,
+                return_tensors=return_tensors,
+                return_token_type_ids=return_token_type_ids,
+                return_attention_mask=return_attention_mask,
+                return_overflowing_tokens=return_overflowing_tokens,
+                return_special_tokens_mask=return_special_tokens_mask,
+                return_offsets_mapping=return_offsets_mapping,
+                return_length=return_length,
+                verbose=verbose,
+                **kwargs,
+            )
+        batch_outputs: BatchEncoding = self._batch_encode_plus_with_offsets(
+            [(text, text_pair)],
+            add_special_tokens=add_special_tokens,
+            padding_strategy=padding_strategy,
+            truncation_strategy=truncation_strategy,
+            max_length=max_length,
+            stride=stride,
+            pad_to_multiple_of=pad_to_multiple_of,
+            return_tensors=None,
+            return_token_type_ids=return_token_type_ids,
+            return_attention_mask=return_attention_mask,
+            return_overflowing_tokens=return_overflowing_tokens,
+            return_special_tokens_mask=return_special_tokens_mask,
+            return_length=return_length,
+            verbose=verbose,
+        )
+        return BatchEncoding(
+            {key: value[0] for key, value in batch_outputs.items()},
+            tensor_type=return_tensors,
+            prepend_batch_axis=return_tensors is not None,
+        )
+
+    def _offsets_for_model(
+        self,
+        offsets: List[Span],
+        pair_offsets: Optional[List[Span]],
+        add_special_tokens: bool,
+        truncation_strategy: TruncationStrategy,
+        max_length: Optional[int],
+        stride: int,
+    ) -> List[Span]:
+        # Truncated and added special tokens in the same way as prepare_for_model
+        pair: bool = pair_offsets is not None
+        total_len: int = (
+            len(offsets)
+            + (len(pair_offsets) if pair_offsets is not None else 0)
+            + (self.num_special_tokens_to_add(pair=pair) if add_special_tokens else 0)
+        )
+        if (
+            truncation_strategy != TruncationStrategy.DO_NOT_TRUNCATE
+            and max_length
+            and total_len > max_length
+        ):
+            offsets, pair_offsets, _ = self.truncate_sequences(
+                offsets,
+                pair_ids=pair_offsets,
+                num_tokens_to_remove=total_len - max_length,
+                truncation_strategy=truncation_strategy,
+                stride=stride,
+            )
+        if not add_special_tokens:
+            return offsets + (pair_offsets or [])
+        sequences = {-1: iter(offsets), -2: iter(pair_offsets or [])}
+        return [
+            next(sequences[i]) if i in sequences else (0, 0)
+            for i in self.build_inputs_with_special_tokens(
+                [-1] * len(offsets),
+                [-2] * len(pair_offsets) if pair_offsets is not None else None,
+            )
+        ]
+
+    def _batch_encode_plus_with_offsets(
+        self,
+        batch_pairs: List[Tuple[Any, Any]],
+        add_special_tokens: bool,
+        padding_strategy: PaddingStrategy,
+        truncation_strategy: TruncationStrategy,
+        max_length: Optional[int],
+        stride: int,
+        pad_to_multiple_of: Optional[int],
+        return_tensors: Optional[Union[str, TensorType]],
+        return_token_type_ids: Optional[bool],
+        return_attention_mask: Optional[bool],
+        return_overflowing_tokens: bool,
+        return_special_tokens_mask: bool,
+        return_length: bool,
+        verbose: bool,
+    ) -> BatchEncoding:
+        texts: List[Any] = [
+            text for pair in batch_pairs for text in pair if text is not None
+        ]
+        if not all(isinstance(text, str) for text in texts):
+            raise NotImplementedError(
+                "return_offset_mapping is available only for strings."
+            )
+        encoded = iter(self.tokenize_batch_with_offsets(texts))
+        batch_outputs: Dict[str, List[Any]] = {}
+        for _, text_pair in batch_pairs:
+            tokens, offsets = next(encoded)
+            pair_tokens, pair_offsets = (
+                next(encoded) if text_pair is not None else (None, None)
+            )
+            outputs = self.prepare_for_model(
+                self.convert_tokens_to_ids(tokens),
+                self.convert_tokens_to_ids(pair_tokens)
+                if pair_tokens is not None
+                else None,
+                add_special_tokens=add_special_tokens,
+                padding=PaddingStrategy.DO_NOT_PAD.value,
+                truncation=truncation_strategy.value,
+                max_length=max_length,
+                stride=stride,
+                pad_to_multiple_of=None,
+                return_attention_mask=False,
+                return_token_type_ids=return_token_type_ids,
+                return_overflowing_tokens=return_overflowing_tokens,
+                return_special_tokens_mask=return_special_tokens_mask,
+                return_length=return_length,
+                return_tensors=None,
+                prepend_batch_axis=False,
+                verbose=verbose,
+            )
+            outputs["offset_mapping"] = self._offsets_for_model(
+                offsets,
+                pair_offsets,
+                add_special_tokens=add_special_tokens,
+                truncation_strategy=truncation_strategy,
+                max_length=max_length,
+                stride=stride,
+            )
+            for key, value in outputs.items():
+                batch_outputs.setdefault(key, []).append(value)
+
+        batch_outputs = self.pad(
+            batch_outputs,
+            padding=padding_strategy.value,
+            max_length=max_length,
+            pad_to_multiple_of=pad_to_multiple_of,
+            return_attention_mask=return_attention_mask,
+        )
+        # Offsets are not padded by pad
+        for offsets, input_ids in zip(
+            batch_outputs["offset_mapping"], batch_outputs["input_ids"]
+        ):
+            padding: List[Span] = [(0, 0)] * (len(input_ids) - len(offsets))
+            if self.padding_side == "right":
+                offsets.extend(padding)
             else:
-                split_tokens = self.subword_tokenizer.tokenize(" ".join(tokens))
+                offsets[:0] = padding
+        return BatchEncoding(batch_outputs, tensor_type=return_tensors)
+
+    def _batch_encode_plus(
+        self,
+        batch_text_or_text_pairs: List[Any],
+        add_special_tokens: bool = True,
+        padding_strategy: PaddingStrategy = PaddingStrategy.DO_NOT_PAD,
+        truncation_strategy: TruncationStrategy = TruncationStrategy.DO_NOT_TRUNCATE,
+        max_length: Optional[int] = None,
+        stride: int = 0,
+        is_split_into_words: bool = False,
+        pad_to_multiple_of: Optional[int] = None,
+        return_tensors: Optional[Union[str, TensorType]] = None,
+        return_token_type_ids: Optional[bool] = None,
+        return_attention_mask: Optional[bool] = None,
+        return_overflowing_tokens: bool = False,
+        return_special_tokens_mask: bool = False,
+        return_offsets_mapping: bool = False,
+        return_length: bool = False,
+        verbose: bool = True,
+        **kwargs: Any,
+    ) -> BatchEncoding:
+        # Strings are tokenized with tokenize_batch and the rest is the same as
+        # transformers.PreTrainedTokenizer._batch_encode_plus
+        if is_split_into_words:
+            return super()._batch_encode_plus(
+                batch_text_or_text_pairs,
+                add_special_tokens=add_special_tokens,
+                padding_strategy=padding_strategy,
+                truncation_strategy=truncation_strategy,
+                max_length=max_length,
+                stride=stride,
+                is_split_into_words=is_split_into_words,
+                pad_to_multiple_of=pad_to_multiple_of,
+                return_tensors=return_tensors,
+                return_token_type_ids=return_token_type_ids,
+                return_attention_mask=return_attention_mask,
+                return_overflowing_tokens=return_overflowing_tokens,
+                return_special_tokens_mask=return_special_tokens_mask,
+                return_offsets_mapping=return_offsets_mapping,
+                return_length=return_length,
+                verbose=verbose,
+                **kwargs,
+            )
+
+        batch_pairs: List[Tuple[Any, Any]] = [
+            (ids_or_pair_ids, None)
+            if not isinstance(ids_or_pair_ids, (list, tuple))
+            else tuple(ids_or_pair_ids)
+            for ids_or_pair_ids in batch_text_or_text_pairs
+        ]
+        if return_offsets_mapping:
+            return self._batch_encode_plus_with_offsets(
+                batch_pairs,
+                add_special_tokens=add_special_tokens,
+                padding_strategy=padding_strategy,
+                truncation_strategy=truncation_strategy,
+                max_length=max_length,
+                stride=stride,
+                pad_to_multiple_of=pad_to_multiple_of,
+                return_tensors=return_tensors,
+                return_token_type_ids=return_token_type_ids,
+                return_attention_mask=return_attention_mask,
+                return_overflowing_tokens=return_overflowing_tokens,
+                return_special_tokens_mask=return_special_tokens_mask,
+                return_length=return_length,
+                verbose=verbose,
+            )
+        texts: List[str] = [
+            text for pair in batch_pairs for text in pair if isinstance(text, str)
+        ]
+        n_jobs: Optional[int] = kwargs.pop("n_jobs", None)
+        executor: Optional[Executor] = kwargs.pop("executor", None)
+        chunk_size: Optional[int] = kwargs.pop("chunk_size", None)
+        if executor is not None or resolve_n_jobs(n_jobs) > 1:
+            if self._parallel_encoder is None:
+                self._parallel_encoder = ParallelEncoder(self)
+            text_ids = iter(
+                self._parallel_encoder.encode(
+                    texts,
+                    n_jobs=n_jobs,
+                    executor=executor,
+                    chunk_size=chunk_size,
+                    **kwargs,
+                )
+            )
         else:
-            split_tokens = tokens
+            text_ids = iter(self._convert_texts_to_ids(texts, **kwargs))
+
+        def get_input_ids(text: Any) -> Sequence[int]:
+            if isinstance(text, str):
+                return next(text_ids)
+            elif (
+                isinstance(text, (list, tuple))
+                and len(text) > 0
+                and isinstance(text[0], str)
+            ):
+                return self.convert_tokens_to_ids(list(text))
+            elif (
+                isinstance(text, (list, tuple))
+                and len(text) > 0
+                and isinstance(text[0], int)
+            ):
+                return text
+            else:
+                raise ValueError(
+                    "Input is not valid. Should be a string, a list/tuple of strings or a list/tuple of integers."
+                )
 
-        return split_tokens
+        input_ids = [
+            (
+                get_input_ids(ids),
+                get_input_ids(pair_ids) if pair_ids is not None else None,
+            )
+            for ids, pair_ids in batch_pairs
+        ]
+        batch_outputs = self._batch_prepare_for_model(
+            input_ids,
+            add_special_tokens=add_special_tokens,
+            padding_strategy=padding_strategy,
+            truncation_strategy=truncation_strategy,
+            max_length=max_length,
+            stride=stride,
+            pad_to_multiple_of=pad_to_multiple_of,
+            return_attention_mask=return_attention_mask,
+            return_token_type_ids=return_token_type_ids,
+            return_overflowing_tokens=return_overflowing_tokens,
+            return_special_tokens_mask=return_special_tokens_mask,
+            return_length=return_length,
+            return_tensors=return_tensors,
+            verbose=verbose,
+        )
+        return BatchEncoding(batch_outputs)
+
+    def __call__(self, *args: Any, **kwargs: Any) -> BatchEncoding:
+        if self.profiler is None:
+            return super().__call__(*args, **kwargs)
+        with self.profiler.timer("total"):
+            return super().__call__(*args, **kwargs)
+
+    @overload
+    def convert_tokens_to_ids(self, tokens: str) -> int:
+        ...
+
+    @overload
+    def convert_tokens_to_ids(self, tokens: List[str]) -> List[int]:
+        ...
 
-    def convert_tokens_to_string(self, tokens: List[str]):
+    def convert_tokens_to_ids(
+        self, tokens: Union[str, List[str]]
+    ) -> Union[int, List[int]]:
+        if self.profiler is None:
+            return super().convert_tokens_to_ids(tokens)
+        with self.profiler.timer("convert"):
+            return super().convert_tokens_to_ids(tokens)
+
+    def prepare_for_model(self, *args: Any, **kwargs: Any) -> BatchEncoding:
+        if self.profiler is None:
+            return super().prepare_for_model(*args, **kwargs)
+        with self.profiler.timer("prepare"):
+            return super().prepare_for_model(*args, **kwargs)
+
+    def pad(self, *args: Any, **kwargs: Any) -> BatchEncoding:
+        if self.profiler is None:
+            return super().pad(*args, **kwargs)
+        with self.profiler.timer("prepare"):
+            return super().pad(*args, **kwargs)
+
+    def convert_tokens_to_string(self, tokens: List[str]) -> str:
         if self.subword_tokenizer_type in ["character", "wordpiece"]:
             return super().convert_tokens_to_string(tokens)
         elif self.subword_tokenizer_type == "sentencepiece":
             """Converts a sequence of tokens (string) in a single string."""
-            current_sub_tokens = []
-            out_string = ""
+            all_special_tokens: Set[str] = set(self.all_special_tokens)
+            segments: List[Union[str, List[str]]] = []
+            current_sub_tokens: List[str] = []
             for token in tokens:
-                if token in self.all_special_tokens:
-                    out_string = out_string.rstrip(" ")
+                if token in all_special_tokens:
                     if current_sub_tokens:
-                        out_string += " " + self.subword_tokenizer.sp_model.decode(
-                            current_sub_tokens
-                        )
+                        segments.append(current_sub_tokens)
                         current_sub_tokens = []
-                    out_string += " " + token
+                    segments.append(token)
                 else:
                     current_sub_tokens.append(token)
-            out_string = out_string.rstrip(" ")
             if current_sub_tokens:
-                out_string += " " + self.subword_tokenizer.sp_model.decode(
-                    current_sub_tokens
-                )
-            return out_string.strip()
+                segments.append(current_sub_tokens)
+            return self._join_sentencepiece_segments(segments)
         else:  # pragma: no cover
             raise NotImplementedError(
                 f"{self.subword_tokenizer} is not allowed for convert_tokens_to_string"
             )
+
+    def _join_sentencepiece_segments(
+        self, segments: Sequence[Union[str, List[str], List[int]]]
+    ) -> str:
+        # Segments are special tokens (str) and runs of the other tokens or ids, which are decoded at once.
+        # The spaces around special tokens are the same as sentencepiece tokenizers of transformers.
+        out_string: str = ""
+        after_run: bool = False
+        for segment in segments:
+            if isinstance(segment, str):
+                if not after_run:
+                    out_string = out_string.rstrip(" ")
+                out_string += " " + segment
+                after_run = False
+            else:
+                out_string = (
+                    out_string.rstrip(" ")
+                    + " "
+                    + self.subword_tokenizer.sp_model.decode(segment)
+                )
+                after_run = True
+        return out_string.strip()
+
+    def _sentencepiece_decode_table(self) -> _DecodeTable:
+        # Cached until tokens are added or special tokens are set
+        table: Optional[_DecodeTable] = self.__dict__.get("_decode_table")
+        if table is None:
+            table = self._decode_table = self._build_sentencepiece_decode_table()
+        return table
+
+    def _build_sentencepiece_decode_table(self) -> _DecodeTable:
+        boundary: Dict[int, Tuple[str, bool]] = {}
+        for token_id, token in self.added_tokens_decoder.items():
+            boundary[token_id] = (token, token in self.added_tokens_encoder)
+        for token in self.added_tokens_encoder:
+            vocab_id: Optional[int] = self.vocab.get(token)
+            if vocab_id is not None and vocab_id not in boundary:
+                boundary[vocab_id] = (token, True)
+        for token in self.all_special_tokens:
+            vocab_id = self.vocab.get(token)
+            if vocab_id is not None and vocab_id not in boundary:
+                boundary[vocab_id] = (token, False)
+        return set(self.all_special_ids), boundary
+
+    def _decode_sentencepiece(
+        self,
+        token_ids: List[int],
+        table: _DecodeTable,
+        skip_special_tokens: bool = False,
+        clean_up_tokenization_spaces: Optional[bool] = None,
+        spaces_between_special_tokens: bool = True,
+    ) -> str:
+        # The same as _decode of transformers followed by convert_tokens_to_string,
+        # where runs of ids are decoded by sentencepiece without converting them into tokens.
+        # Ids out of the vocabulary raise IndexError in sentencepiece as IdToPiece does.
+        special_ids, boundary = table
+        sub_texts: List[str] = []
+        segments: List[Union[str, List[int]]] = []
+        run: List[int] = []
+        for token_id in token_ids:
+            token_id = int(token_id)
+            if skip_special_tokens and token_id in special_ids:
+                continue
+            entry: Optional[Tuple[str, bool]] = boundary.get(token_id)
+            if entry is None:
+                run.append(token_id)
+                continue
+            if run:
+                segments.append(run)
+                run = []
+            token, is_added = entry
+            if is_added:
+                if segments:
+                    sub_texts.append(self._join_sentencepiece_segments(segments))
+                    segments = []
+                sub_texts.append(token)
+            else:
+                segments.append(token)
+        if run:
+            segments.append(run)
+        if segments:
+            sub_texts.append(self._join_sentencepiece_segments(segments))
+        text: str = (" " if spaces_between_special_tokens else "").join(sub_texts)
+        if clean_up_tokenization_spaces is None:
+            clean_up_tokenization_spaces = self.clean_up_tokenization_spaces
+        if clean_up_tokenization_spaces:
+            return self.clean_up_tokenization(text)
+        return text
+
+    def _decode(
+        self,
+        token_ids: List[int],
+        skip_special_tokens: bool = False,
+        clean_up_tokenization_spaces: Optional[bool] = None,
+        spaces_between_special_tokens: bool = True,
+        **kwargs: Any,
+    ) -> str:
+        if self.subword_tokenizer_type != "sentencepiece" or isinstance(token_ids, int):
+            return super()._decode(
+                token_ids,
+                skip_special_tokens=skip_special_tokens,
+                clean_up_tokenization_spaces=clean_up_tokenization_spaces,
+                spaces_between_special_tokens=spaces_between_special_tokens,
+                **kwargs,
+            )
+        self._decode_use_source_tokenizer = kwargs.pop("use_source_tokenizer", False)
+        return self._decode_sentencepiece(
+            token_ids,
+            self._sentencepiece_decode_table(),
+            skip_special_tokens=skip_special_tokens,
+            clean_up_tokenization_spaces=clean_up_tokenization_spaces,
+            spaces_between_special_tokens=spaces_between_special_tokens,
+        )
+
+    def batch_decode(
+        self,
+        sequences: Union[List[int], List[List[int]], Any],
+        skip_special_tokens: bool = False,
+        clean_up_tokenization_spaces: Optional[bool] = None,
+        **kwargs: Any,
+    ) -> List[str]:
+        """Convert a list of lists of token ids into a list of strings by calling decode.
+        For sentencepiece, the ids of special and added tokens are looked up once for the whole batch
+        and runs of the other ids are decoded by sentencepiece without converting them into tokens.
+
+        Args:
+            sequences (``Union[List[int], List[List[int]], np.ndarray, torch.Tensor, tf.Tensor]``):
+                List of tokenized input ids.
+            skip_special_tokens (``bool``, *optional*, defaults to ``False``):
+                Whether or not to remove special tokens in the decoding.
+            clean_up_tokenization_spaces (``bool``, *optional*):
+                Whether or not to clean up the tokenization spaces.
+                If ``None``, will default to ``self.clean_up_tokenization_spaces``.
+            kwargs (additional keyword arguments, *optional*):
+                Will be passed to the underlying model specific decode method.
+
+        Returns:
+            ``List[str]``: The list of decoded sentences.
+        """
+        if self.subword_tokenizer_type != "sentencepiece":
+            return super().batch_decode(
+                sequences,
+                skip_special_tokens=skip_special_tokens,
+                clean_up_tokenization_spaces=clean_up_tokenization_spaces,
+                **kwargs,
+            )
+        table: _DecodeTable = self._sentencepiece_decode_table()
+        self._decode_use_source_tokenizer = kwargs.pop("use_source_tokenizer", False)
+        spaces_between_special_tokens: bool = kwargs.pop(
+            "spaces_between_special_tokens", True
+        )
+        decoded: List[str] = []
+        for token_ids in sequences:
+            token_ids = to_py_obj(token_ids)
+            if isinstance(token_ids, int):
+                decoded.append(
+                    self.decode(
+                        token_ids,
+                        skip_special_tokens=skip_special_tokens,
+                        clean_up_tokenization_spaces=clean_up_tokenization_spaces,
+                        spaces_between_special_tokens=spaces_between_special_tokens,
+                        **kwargs,
+                    )
+                )
+            else:
+                decoded.append(
+                    self._decode_sentencepiece(
+                        token_ids,
+                        table,
+                        skip_special_tokens=skip_special_tokens,
+                        clean_up_tokenization_spaces=clean_up_tokenization_spaces,
+                        spaces_between_special_tokens=spaces_between_special_tokens,
+                    )
+                )
+        return decoded
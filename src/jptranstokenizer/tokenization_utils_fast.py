@@ -0,0 +1,455 @@
+import itertools
+import os
+import threading
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple, Union
+
+from tokenizers import AddedToken as FastAddedToken
+from tokenizers import (
+    NormalizedString,
+    PreTokenizedString,
+    Regex,
+    Tokenizer,
+    decoders,
+    models,
+    normalizers,
+    pre_tokenizers,
+    processors,
+)
+from transformers import AddedToken, PreTrainedTokenizerFast
+
+from .model_list import PUBLIC_AVAILABLE_SETTING_MAP
+from .subword.sentencepiece import SPIECE_UNDERLINE, _is_digit_comma
+
+# Word tokenizers which run in Python as a custom pre-tokenizer
+PYTHON_WORD_TOKENIZER_TYPES: List[str] = ["mecab", "juman", "sudachi"]
+
+
+class MainWordPreTokenizer:
+    """Custom pre-tokenizer of ``tokenizers`` which splits texts into words with a main word tokenizer.
+    Words are located in the normalized text, so offsets of tokens are kept.
+    Words whose surface is changed by the word tokenizer (such as ``"＃"`` by Juman)
+    are rewritten in place if the length is the same.
+
+    Args:
+        word_tokenizer: A main word tokenizer which does not normalize texts.
+        do_lower_case (``bool``, *optional*, defaults to ``False``):
+            Whether or not to lowercase words.
+        skip_whitespace (``bool``, *optional*, defaults to ``False``):
+            Whether to drop words consisting of whitespaces.
+    """
+
+    def __init__(
+        self,
+        word_tokenizer: Any,
+        do_lower_case: bool = False,
+        skip_whitespace: bool = False,
+    ):
+        self.word_tokenizer = word_tokenizer
+        self.do_lower_case = do_lower_case
+        self.skip_whitespace = skip_whitespace
+        # Rust threads of encode_batch call this concurrently
+        self._lock = threading.Lock()
+
+    def split(self, i: int, normalized: NormalizedString) -> List[NormalizedString]:
+        text: str = str(normalized)
+        with self._lock:
+            words: List[str] = self.word_tokenizer.tokenize(text)
+        pieces: List[NormalizedString] = []
+        cursor: int = 0
+        for word in words:
+            if not word or (self.skip_whitespace and word.isspace()):
+                continue
+            start: int = text.find(word, cursor)
+            if start >= 0 and not text[cursor:start].strip():
+                end: int = start + len(word)
+                piece: NormalizedString = normalized[start:end]
+            else:
+                # The surface is changed by the word tokenizer
+                start = cursor
+                while (
+                    start < len(text) and text[start].isspace() and not word.isspace()
+                ):
+                    start += 1
+                end = min(start + len(word), len(text))
+                if end <= start:
+                    continue
+                piece = normalized[start:end]
+                if end - start == len(word):
+                    for old, new in zip(text[start:end], word):
+                        if old != new:
+                            piece.replace(old, new)
+            if self.do_lower_case:
+                piece.lowercase()
+            pieces.append(piece)
+            cursor = end
+        return pieces
+
+    def pre_tokenize(self, pretok: PreTokenizedString) -> None:
+        pretok.split(self.split)
+
+
+def _sentencepiece_components(sp_model: Any) -> Dict[str, Any]:
+    try:
+        from sentencepiece import sentencepiece_model_pb2
+    except ModuleNotFoundError as error:
+        raise error.__class__(
+            "You need to install protobuf to convert sentencepiece models."
+            "See https://pypi.org/project/protobuf/ for installation."
+        )
+    # The classes of the module are generated by protobuf at runtime
+    proto = sentencepiece_model_pb2.ModelProto()  # type: ignore[attr-defined]
+    proto.ParseFromString(sp_model.serialized_model_proto())
+    unk_id: int = proto.trainer_spec.unk_id
+    if proto.trainer_spec.model_type == proto.trainer_spec.UNIGRAM:
+        model = models.Unigram(
+            [(piece.piece, piece.score) for piece in proto.pieces], unk_id
+        )
+    elif proto.trainer_spec.model_type == proto.trainer_spec.BPE:
+        vocab: Dict[str, int] = {piece.piece: i for i, piece in enumerate(proto.pieces)}
+        merges: List[Any] = []
+        # Merges are prioritized by the id of the merged piece
+        for piece in vocab:
+            merges.extend(
+                sorted(
+                    [
+                        (piece[:k], piece[k:])
+                        for k in range(1, len(piece))
+                        if piece[:k] in vocab and piece[k:] in vocab
+                    ],
+                    key=lambda pair: (vocab[pair[0]], vocab[pair[1]]),
+                )
+            )
+        model = models.BPE(
+            vocab, merges, unk_token=proto.pieces[unk_id].piece, fuse_unk=True
+        )
+    else:
+        raise NotImplementedError(
+            "Only unigram and BPE sentencepiece models can be converted"
+        )
+
+    normalizer_list: List[normalizers.Normalizer] = []
+    if proto.normalizer_spec.precompiled_charsmap:
+        normalizer_list.append(
+            normalizers.Precompiled(proto.normalizer_spec.precompiled_charsmap)
+        )
+    if proto.normalizer_spec.remove_extra_whitespaces:
+        normalizer_list.extend(
+            [normalizers.Replace(Regex(" {2,}"), " "), normalizers.Strip()]
+        )
+    return {
+        "model": model,
+        "normalizers": normalizer_list,
+        "pre_tokenizer": pre_tokenizers.Metaspace(
+            replacement=SPIECE_UNDERLINE,
+            add_prefix_space=proto.normalizer_spec.add_dummy_prefix,
+        ),
+        "decoder": decoders.Metaspace(
+            replacement=SPIECE_UNDERLINE,
+            add_prefix_space=proto.normalizer_spec.add_dummy_prefix,
+        ),
+    }
+
+
+def build_backend_tokenizer(tokenizer: Any) -> Tokenizer:
+    """Build a ``tokenizers.Tokenizer`` from ``JapaneseTransformerTokenizer``.
+    Word tokenizers running in Python (MeCab, Juman++ and Sudachi) are not included
+    and attached by ``JapaneseTransformerTokenizerFast``.
+
+    Args:
+        tokenizer (``JapaneseTransformerTokenizer``): The tokenizer to be converted.
+
+    Returns:
+        ``tokenizers.Tokenizer``: The tokenizer whose model is WordPiece, WordLevel (character),
+        Unigram or BPE (sentencepiece).
+    """
+    if not tokenizer.do_subword_tokenize:
+        raise NotImplementedError(
+            "Tokenizers without subword tokenization can't be converted"
+        )
+    word_tokenizer_type: str = tokenizer.word_tokenizer_type
+    word_tokenizer_kwargs: Dict[str, Any] = tokenizer.word_tokenizer_kwargs
+    if tokenizer.do_word_tokenize and word_tokenizer_type not in [
+        "basic",
+        "none",
+        *PYTHON_WORD_TOKENIZER_TYPES,
+    ]:
+        raise NotImplementedError(
+            f"Word tokenizer '{word_tokenizer_type}' can't be converted"
+        )
+
+    normalizer_list: List[normalizers.Normalizer] = []
+    pre_tokenizer_list: List[pre_tokenizers.PreTokenizer] = []
+    if tokenizer.do_word_tokenize:
+        if word_tokenizer_type == "basic":
+            normalizer_list.extend(
+                [
+                    normalizers.NFC(),
+                    normalizers.BertNormalizer(
+                        clean_text=True,
+                        handle_chinese_chars=False,
+                        lowercase=word_tokenizer_kwargs["do_lower_case"],
+                    ),
+                ]
+            )
+            pre_tokenizer_list.append(pre_tokenizers.BertPreTokenizer())
+        else:
+            if word_tokenizer_kwargs["normalize_text"]:
+                normalizer_list.append(normalizers.NFKC())
+            if word_tokenizer_type == "none" and word_tokenizer_kwargs["do_lower_case"]:
+                normalizer_list.append(normalizers.Lowercase())
+
+    decoder: decoders.Decoder
+    if tokenizer.subword_tokenizer_type == "wordpiece":
+        model = models.WordPiece(
+            dict(tokenizer.vocab),
+            unk_token=str(tokenizer.unk_token),
+            max_input_chars_per_word=tokenizer.subword_tokenizer.max_input_chars_per_word,
+        )
+        pre_tokenizer_list.append(pre_tokenizers.WhitespaceSplit())
+        decoder = decoders.WordPiece(prefix="##", cleanup=False)
+    elif tokenizer.subword_tokenizer_type == "character":
+        model = models.WordLevel(
+            dict(tokenizer.vocab), unk_token=str(tokenizer.unk_token)
+        )
+        pre_tokenizer_list.append(pre_tokenizers.Split(Regex("."), "isolated"))
+        decoder = decoders.WordPiece(prefix="##", cleanup=False)
+    elif tokenizer.subword_tokenizer_type == "sentencepiece":
+        # The split of pieces ending with a digit and a comma follows the segmentation of the model,
+        # which can't be reproduced in tokenizers
+        if any(_is_digit_comma(piece) for piece in tokenizer.vocab):
+            raise NotImplementedError(
+                "Sentencepiece models with pieces ending with a digit and a comma can't be converted"
+            )
+        components: Dict[str, Any] = _sentencepiece_components(
+            tokenizer.subword_tokenizer.sp_model
+        )
+        model = components["model"]
+        normalizer_list.extend(components["normalizers"])
+        pre_tokenizer_list.append(components["pre_tokenizer"])
+        decoder = components["decoder"]
+    else:  # pragma: no cover
+        raise NotImplementedError(
+            f"Subword tokenizer '{tokenizer.subword_tokenizer_type}' can't be converted"
+        )
+
+    backend_tokenizer: Tokenizer = Tokenizer(model)
+    if normalizer_list:
+        backend_tokenizer.normalizer = normalizers.Sequence(normalizer_list)
+    backend_tokenizer.pre_tokenizer = (
+        pre_tokenizer_list[0]
+        if len(pre_tokenizer_list) == 1
+        else pre_tokenizers.Sequence(pre_tokenizer_list)
+    )
+    backend_tokenizer.decoder = decoder
+
+    backend_tokenizer.add_special_tokens(
+        [
+            FastAddedToken(
+                token.content,
+                single_word=token.single_word,
+                lstrip=token.lstrip,
+                rstrip=token.rstrip,
+                normalized=False,
+            )
+            if isinstance(token, AddedToken)
+            else FastAddedToken(token, normalized=False)
+            for token in tokenizer.all_special_tokens_extended
+        ]
+    )
+    cls_token: str = str(tokenizer.cls_token)
+    sep_token: str = str(tokenizer.sep_token)
+    backend_tokenizer.post_processor = processors.TemplateProcessing(
+        single=f"{cls_token}:0 $A:0 {sep_token}:0",
+        pair=f"{cls_token}:0 $A:0 {sep_token}:0 $B:1 {sep_token}:1",
+        special_tokens=[
+            (cls_token, tokenizer.cls_token_id),
+            (sep_token, tokenizer.sep_token_id),
+        ],
+    )
+    return backend_tokenizer
+
+
+class JapaneseTransformerTokenizerFast(PreTrainedTokenizerFast):
+    """Japanese tokenizer of main and sub word, backed by the ``tokenizers`` library.
+    Subword tokenization, padding, truncation and conversion into ids run in Rust,
+    and only MeCab, Juman++ or Sudachi runs in Python as a custom pre-tokenizer.
+    Create with ``JapaneseTransformerTokenizer.to_fast`` or ``from_pretrained``.
+    You can import this module shortly:
+
+    .. code-block:: none
+
+       >> from jptranstokenizer import JapaneseTransformerTokenizerFast
+
+    ``tokenizer.json`` saved by ``save_pretrained`` contains the normalizer and subword model,
+    and the settings of the word tokenizer are saved in ``tokenizer_config.json``.
+
+    .. note::
+        The following differ from ``JapaneseTransformerTokenizer`` in rare cases:
+
+        - Normalization of sentencepiece is applied before word tokenization.
+
+        Sentencepiece models with pieces ending with a digit and a comma (such as ``"1,"``),
+        which ``JapaneseTransformerTokenizer`` splits, can't be converted.
+
+    Args:
+        tokenizer_file (``str``, *optional*):
+            Path to ``tokenizer.json``.
+        word_tokenizer_type (``str``, defaults to ``"basic"``):
+            Type of word tokenizer. ``"mecab"``, ``"juman"``, and ``"sudachi"`` run in Python.
+        do_word_tokenize (``bool``, *optional*, defaults to ``True``):
+            Whether to do (main) word tokenization.
+        subword_tokenizer_type (``str``, defaults to ``"wordpiece"``):
+            Type of subword tokenizer. ``"wordpiece"``, ``"sentencepiece"``, or ``"character"``.
+        word_tokenizer_kwargs (``Dict[str, Any]``, *optional*):
+            Arguments of ``get_word_tokenizer`` (such as *mecab_dic* and *sudachi_split_mode*).
+    """
+
+    def __init__(
+        self,
+        *args: Any,
+        word_tokenizer_type: str = "basic",
+        do_word_tokenize: bool = True,
+        subword_tokenizer_type: str = "wordpiece",
+        word_tokenizer_kwargs: Optional[Dict[str, Any]] = None,
+        **kwargs: Any,
+    ):
+        word_tokenizer_kwargs = dict(word_tokenizer_kwargs or {})
+        word_tokenizer_kwargs["word_tokenizer_type"] = word_tokenizer_type
+        super().__init__(
+            *args,
+            word_tokenizer_type=word_tokenizer_type,
+            do_word_tokenize=do_word_tokenize,
+            subword_tokenizer_type=subword_tokenizer_type,
+            word_tokenizer_kwargs=word_tokenizer_kwargs,
+            **kwargs,
+        )
+        self.word_tokenizer_type = word_tokenizer_type
+        self.do_word_tokenize = do_word_tokenize
+        self.subword_tokenizer_type = subword_tokenizer_type
+        self.word_tokenizer_kwargs = word_tokenizer_kwargs
+        self._attach_word_tokenizer()
+
+    def _attach_word_tokenizer(self) -> None:
+        self._base_pre_tokenizer = self._tokenizer.pre_tokenizer
+        self.word_tokenizer = None
+        if (
+            not self.do_word_tokenize
+            or self.word_tokenizer_type not in PYTHON_WORD_TOKENIZER_TYPES
+        ):
+            return
+        from .tokenization_utils import get_word_tokenizer
+
+        # Texts are normalized in Rust and lowercased after word tokenization
+        self.word_tokenizer = get_word_tokenizer(
+            **{
+                **self.word_tokenizer_kwargs,
+                "normalize_text": False,
+                "do_lower_case": False,
+            }
+        )
+        self._tokenizer.pre_tokenizer = pre_tokenizers.Sequence(
+            [
+                pre_tokenizers.PreTokenizer.custom(
+                    MainWordPreTokenizer(
+                        self.word_tokenizer,
+                        do_lower_case=self.word_tokenizer_kwargs.get(
+                            "do_lower_case", False
+                        ),
+                        skip_whitespace=self.subword_tokenizer_type == "sentencepiece",
+                    )
+                ),
+                self._base_pre_tokenizer,
+            ]
+        )
+
+    @contextmanager
+    def _detach_word_tokenizer(self) -> Iterator[None]:
+        # A custom pre-tokenizer can't be serialized
+        pre_tokenizer = self._tokenizer.pre_tokenizer
+        self._tokenizer.pre_tokenizer = self._base_pre_tokenizer
+        try:
+            yield
+        finally:
+            self._tokenizer.pre_tokenizer = pre_tokenizer
+
+    def __getstate__(self) -> Dict[str, Any]:
+        state: Dict[str, Any] = self.__dict__.copy()
+        with self._detach_word_tokenizer():
+            state["_tokenizer"] = self._tokenizer.to_str()
+        state["_base_pre_tokenizer"] = None
+        state["word_tokenizer"] = None
+        return state
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.__dict__.update(state)
+        self._tokenizer = Tokenizer.from_str(state["_tokenizer"])
+        self._attach_word_tokenizer()
+
+    def _save_pretrained(self, *args: Any, **kwargs: Any) -> Tuple[str, ...]:
+        with self._detach_word_tokenizer():
+            return super()._save_pretrained(*args, **kwargs)
+
+    def _decode(
+        self,
+        token_ids: Union[int, List[int]],
+        skip_special_tokens: bool = False,
+        clean_up_tokenization_spaces: Optional[bool] = None,
+        **kwargs: Any,
+    ) -> str:
+        if self.subword_tokenizer_type != "sentencepiece":
+            return super()._decode(
+                token_ids,
+                skip_special_tokens=skip_special_tokens,
+                clean_up_tokenization_spaces=clean_up_tokenization_spaces,
+                **kwargs,
+            )
+        # Special tokens are separated by spaces like JapaneseTransformerTokenizer
+        if isinstance(token_ids, int):
+            token_ids = [token_ids]
+        special_ids: Set[int] = set(self.all_special_ids)
+        if skip_special_tokens:
+            token_ids = [i for i in token_ids if i not in special_ids]
+        texts: List[str] = []
+        for is_special, group in itertools.groupby(
+            token_ids, key=lambda i: i in special_ids
+        ):
+            if is_special:
+                texts.extend(self.convert_ids_to_tokens(list(group)))
+            else:
+                texts.append(self._tokenizer.decode(list(group)))
+        text: str = " ".join(filter(None, texts)).strip()
+        if (
+            clean_up_tokenization_spaces
+            if clean_up_tokenization_spaces is not None
+            else self.clean_up_tokenization_spaces
+        ):
+            text = self.clean_up_tokenization(text)
+        return text
+
+    @classmethod
+    def from_pretrained(
+        cls,
+        tokenizer_name_or_path: Union[str, os.PathLike],
+        *init_inputs: Any,
+        **kwargs: Any,
+    ) -> "JapaneseTransformerTokenizerFast":
+        """Instantiate from a tokenizer saved by ``save_pretrained``,
+        or from a tokenizer supported by ``JapaneseTransformerTokenizer.from_pretrained``.
+        The latter is selected when *tokenizer_name_or_path* is in the supported list
+        or *tokenizer_class* is specified.
+
+        Args:
+            tokenizer_name_or_path (``str`` or ``os.PathLike``):
+                A model id on huggingface.co or a path to a directory.
+        """
+        if (
+            tokenizer_name_or_path in PUBLIC_AVAILABLE_SETTING_MAP
+            or kwargs.get("tokenizer_class") is not None
+        ):
+            from .tokenization_utils import JapaneseTransformerTokenizer
+
+            return JapaneseTransformerTokenizer.from_pretrained(
+                tokenizer_name_or_path, **kwargs
+            ).to_fast()
+        return super().from_pretrained(tokenizer_name_or_path, *init_inputs, **kwargs)
@@ -2,7 +2,11 @@ from typing import List
 
 import pytest
 
-from src.jptranstokenizer.mainword.base import Normalizer
+from src.jptranstokenizer.mainword.base import (
+    Normalizer,
+    normalize_nfkc,
+    split_into_chunks,
+)
 
 
 @pytest.mark.parametrize(
@@ -22,3 +26,49 @@ def test_normalizer(
     )
     text: str = "Example: ① is converted to 1．"
     assert tokenizer.tokenize(text) == expected
+
+
+def test_normalizer_tokenize_batch() -> None:
+    tokenizer: Normalizer = Normalizer(do_lower_case=True)
+    texts: List[str] = ["Example: ① is converted to 1．", "ＡＢＣ"]
+    assert tokenizer.tokenize_batch(texts) == [
+        tokenizer.tokenize(text) for text in texts
+    ]
+
+
+@pytest.mark.parametrize(
+    "text, expected",
+    [("ascii only", "ascii only"), ("正規化済み", "正規化済み"), ("ＡＢＣ①ｶﾞ", "ABC1ガ")],
+)
+def test_normalize_nfkc(text: str, expected: str) -> None:
+    assert normalize_nfkc(text) == expected
+
+
+def test_normalize_batch_is_normalized() -> None:
+    tokenizer: Normalizer = Normalizer()
+    texts: List[str] = ["ＡＢＣ", "abc"]
+    assert tokenizer.normalize_batch(texts) == ["ABC", "abc"]
+    assert tokenizer.normalize_batch(texts, is_normalized=True) is texts
+    assert Normalizer(normalize_text=False).normalize_batch(texts) is texts
+
+
+@pytest.mark.parametrize(
+    "text, max_bytes, expected",
+    [
+        ("短い文。", 100, ["短い文。"]),
+        ("今日は晴れ。明日は「雨？」と聞いた。", 36, ["今日は晴れ。", "明日は「雨？」と聞いた。"]),
+        ("今日は晴れ、明日は雨", 21, ["今日は晴れ、", "明日は雨"]),
+        ("abc def ghi", 8, ["abc def ", "ghi"]),
+        ("あいうえお", 6, ["あい", "うえ", "お"]),
+    ],
+)
+def test_split_into_chunks(text: str, max_bytes: int, expected: List[str]) -> None:
+    assert split_into_chunks(text, max_bytes) == expected
+
+
+def test_split_into_chunks_long_text() -> None:
+    text: str = "これは長い文章です。" * 1000 + "あ" * 5000 + "\n終わり"
+    chunks: List[str] = split_into_chunks(text, 4096)
+    assert "".join(chunks) == text
+    assert all(len(chunk.encode()) <= 4096 for chunk in chunks)
+    assert all(chunk.endswith("。") for chunk in chunks[:6])
@@ -0,0 +1,41 @@
+import os
+import sqlite3
+from typing import List
+
+from src.jptranstokenizer.mainword.cache import CachedWordTokenizer
+from src.jptranstokenizer.mainword.sudachi import SudachiTokenizer
+
+texts: List[str] = [
+    "未来科学部でコンビニ店員になりきってお釣りを返していこう！",
+    "外国人参政権",
+    "外国人参政権",
+    "",
+    "Ｅｘａｍｐｌｅ: ① is 1．",
+]
+
+
+def count_rows(path: str) -> int:
+    with sqlite3.connect(path) as connection:
+        return connection.execute("SELECT COUNT(*) FROM segmentation").fetchone()[0]
+
+
+def test_cached_word_tokenizer(tmp_path) -> None:
+    path: str = os.path.join(tmp_path, "cache.sqlite")
+    word_tokenizer: SudachiTokenizer = SudachiTokenizer(do_lower_case=True)
+    tokenizer: CachedWordTokenizer = CachedWordTokenizer(
+        word_tokenizer, path=path, config={"split_mode": "A"}
+    )
+    expected: List[List[str]] = [word_tokenizer.tokenize(text) for text in texts]
+    assert tokenizer.tokenize_batch(texts) == expected
+    assert count_rows(path) == 4
+    # Read from the database
+    assert tokenizer.tokenize_batch(texts) == expected
+    assert tokenizer.tokenize(texts[-1]) == expected[-1]
+    assert count_rows(path) == 4
+
+    # Another configuration does not share results
+    other: CachedWordTokenizer = CachedWordTokenizer(
+        SudachiTokenizer(split_mode="C"), path=path, config={"split_mode": "C"}
+    )
+    assert other.tokenize(texts[1]) == ["外国人参政権"]
+    assert count_rows(path) == 5
@@ -1,9 +1,12 @@
+import asyncio
+import threading
+import time
 from contextlib import nullcontext as does_not_raise
-from typing import List
+from typing import Dict, List
 
 import pytest
 
-from src.jptranstokenizer.mainword.juman import JumanTokenizer
+from src.jptranstokenizer.mainword.juman import JumanError, JumanppPool, JumanTokenizer
 
 sentence_1: str = "未来科学部でコンビニ店員になりきってお釣りを返していこう！"
 sentence_2: str = "外国人参政権"
@@ -71,7 +74,7 @@ def test_juman_lower_and_normalize(
 
 @pytest.mark.parametrize(
     "ignore_max_byte_error, expectation",
-    [(False, pytest.raises(SystemExit)), (True, does_not_raise())],
+    [(False, pytest.raises(JumanError)), (True, does_not_raise())],
 )
 def test_juman_ignore_max_byte_error(ignore_max_byte_error: bool, expectation) -> None:
     tokenizer: JumanTokenizer = JumanTokenizer(
@@ -82,6 +85,70 @@ def test_juman_ignore_max_byte_error(ignore_max_byte_error: bool, expectation) -
         _ = tokenizer.tokenize(text)
 
 
+def test_juman_escape() -> None:
+    tokenizer: JumanTokenizer = JumanTokenizer(normalize_text=False)
+    tokens: List[str] = tokenizer.tokenize('#彼は"犬"\tと 言った\u3000。')
+    # Whitespaces are "\u3000" as Juman++ outputs for spaces
+    assert "".join(tokens) == '#彼は"犬"\u3000と\u3000言った\u3000。'
+
+
+def test_juman_tokenize_batch() -> None:
+    tokenizer: JumanTokenizer = JumanTokenizer(ignore_max_byte_error=True)
+    texts: List[str] = [sentence_1, "", sentence_2, "こんにちは" * 10000, sentence_3]
+    assert tokenizer.tokenize_batch(texts) == [
+        tokenizer.tokenize(text) for text in texts
+    ]
+
+
+@pytest.mark.parametrize("max_workers", [1, 2])
+def test_juman_chunk_long_text(max_workers: int) -> None:
+    tokenizer: JumanTokenizer = JumanTokenizer(
+        chunk_long_text=True, max_workers=max_workers
+    )
+    text: str = "今日は晴れです。" * 1000
+    tokens: List[str] = tokenizer.tokenize(text)
+    assert tokens == tokenizer.tokenize("今日は晴れです。") * 1000
+
+
+def test_juman_multiple_workers() -> None:
+    tokenizer: JumanTokenizer = JumanTokenizer(max_workers=3)
+    texts: List[str] = [sentence_1, sentence_2, sentence_3] * 10
+    expected: List[List[str]] = [JumanTokenizer().tokenize(text) for text in texts]
+    assert tokenizer.tokenize_batch(texts) == expected
+    assert tokenizer.juman.num_workers == 3
+
+    results: Dict[int, List[List[str]]] = {}
+
+    def run(i: int) -> None:
+        results[i] = [tokenizer.tokenize(text) for text in texts]
+
+    threads = [threading.Thread(target=run, args=(i,)) for i in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert all(result == expected for result in results.values())
+
+
+def test_jumanpp_pool_shrink() -> None:
+    pool: JumanppPool = JumanppPool(max_workers=3, idle_timeout=0)
+    _ = pool.query_batch([sentence_1] * 9)
+    assert pool.num_workers == 1
+    pool.close()
+    assert pool.num_workers == 0
+
+
+def test_jumanpp_pool_shrink_when_idle() -> None:
+    pool: JumanppPool = JumanppPool(max_workers=3, idle_timeout=0.2)
+    _ = pool.query_batch([sentence_1] * 9)
+    assert pool.num_workers == 3
+    # Idle processes are terminated without further calls
+    time.sleep(1)
+    assert pool.num_workers == 1
+    pool.close()
+    assert pool.num_workers == 0
+
+
 def test_juman_use_quote() -> None:
     # TODO
     pass
@@ -90,3 +157,21 @@ def test_juman_use_quote() -> None:
 def test_juman_use_underscore() -> None:
     # TODO
     pass
+
+
+def test_juman_atokenize_batch() -> None:
+    tokenizer: JumanTokenizer = JumanTokenizer(max_workers=2)
+    texts: List[str] = [sentence_1, sentence_2, sentence_3] * 10
+
+    async def run() -> List[List[List[str]]]:
+        try:
+            return await asyncio.gather(
+                *[tokenizer.atokenize_batch(texts[i : i + 3]) for i in range(0, 30, 3)]
+            )
+        finally:
+            await tokenizer.aclose()
+
+    results: List[List[List[str]]] = asyncio.run(run())
+    assert [tokens for result in results for tokens in result] == (
+        tokenizer.tokenize_batch(texts)
+    )
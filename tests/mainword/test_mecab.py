@@ -0,0 +1,78 @@
+import pickle
+from concurrent.futures import ThreadPoolExecutor
+from typing import List
+
+import pytest
+from transformers.models.bert_japanese.tokenization_bert_japanese import (
+    MecabTokenizer as TransformersMecabTokenizer,
+)
+
+from src.jptranstokenizer.mainword.mecab import MecabTokenizer
+
+sentence_1: str = "未来科学部でコンビニ店員になりきってお釣りを返していこう！"
+sentence_2: str = "外国人参政権"
+sentence_3: str = "魔法少女リリカルなのは"
+
+
+def test_mecab() -> None:
+    tokenizer: MecabTokenizer = MecabTokenizer(mecab_dic="ipadic")
+    lst_tokens_2: List[str] = ["外国", "人参", "政権"]
+    assert tokenizer.tokenize(sentence_2) == lst_tokens_2
+
+
+@pytest.mark.parametrize("mecab_dic", ["ipadic", "unidic_lite"])
+@pytest.mark.parametrize(
+    "do_lower_case, normalize_text",
+    [(False, False), (False, True), (True, False), (True, True)],
+)
+def test_mecab_same_as_transformers(
+    mecab_dic: str, do_lower_case: bool, normalize_text: bool
+) -> None:
+    kwargs = dict(
+        do_lower_case=do_lower_case, normalize_text=normalize_text, mecab_dic=mecab_dic
+    )
+    tokenizer: MecabTokenizer = MecabTokenizer(**kwargs)
+    expected_tokenizer = TransformersMecabTokenizer(**kwargs)
+    for text in [
+        sentence_1,
+        sentence_2,
+        sentence_3,
+        "Example: ① is 1．[MASK]",
+        "　全角　空白　",
+        " ",
+    ]:
+        assert tokenizer.tokenize(
+            text, never_split=["[MASK]"]
+        ) == expected_tokenizer.tokenize(text, never_split=["[MASK]"])
+
+
+def test_mecab_tokenize_batch() -> None:
+    tokenizer: MecabTokenizer = MecabTokenizer(do_lower_case=True)
+    texts: List[str] = [sentence_1, "", sentence_2, "Example: ① is 1．", sentence_3]
+    assert tokenizer.tokenize_batch(texts) == [
+        tokenizer.tokenize(text) for text in texts
+    ]
+
+
+def test_mecab_invalid_dic() -> None:
+    with pytest.raises(ValueError):
+        MecabTokenizer(mecab_dic="foo")
+
+
+def test_mecab_share_taggers() -> None:
+    tokenizer_1: MecabTokenizer = MecabTokenizer(mecab_dic="ipadic")
+    tokenizer_2: MecabTokenizer = MecabTokenizer(mecab_dic="ipadic")
+    assert tokenizer_1.mecab is tokenizer_2.mecab
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        assert (
+            executor.submit(lambda: tokenizer_1.mecab).result() is not tokenizer_1.mecab
+        )
+
+
+def test_mecab_threads() -> None:
+    tokenizer: MecabTokenizer = pickle.loads(pickle.dumps(MecabTokenizer()))
+    texts: List[str] = [sentence_1, sentence_2, sentence_3] * 20
+    expected: List[List[str]] = tokenizer.tokenize_batch(texts)
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        results = list(executor.map(tokenizer.tokenize_batch, [texts] * 16))
+    assert all(result == expected for result in results)
@@ -121,3 +121,18 @@ def test_sudachi_ignore_max_byte_error(
     text: str = "こんにちは" * 10000
     with expectation:
         _ = tokenizer.tokenize(text)
+
+
+def test_sudachi_chunk_long_text() -> None:
+    tokenizer: SudachiTokenizer = SudachiTokenizer(split_mode="A", chunk_long_text=True)
+    text: str = "今日は晴れです。" * 3000
+    tokens: List[str] = tokenizer.tokenize(text)
+    assert tokens == tokenizer.tokenize("今日は晴れです。") * 3000
+
+
+def test_sudachi_tokenize_batch() -> None:
+    tokenizer: SudachiTokenizer = SudachiTokenizer(split_mode="A", do_lower_case=True)
+    texts: List[str] = [sentence_1, "", sentence_2, "Example: ① is 1．", sentence_3]
+    assert tokenizer.tokenize_batch(texts) == [
+        tokenizer.tokenize(text) for text in texts
+    ]
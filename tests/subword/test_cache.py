@@ -0,0 +1,38 @@
+import os
+from typing import List
+
+from src.jptranstokenizer.subword.cache import SubwordCache
+
+
+def test_subword_cache_lru() -> None:
+    cache: SubwordCache = SubwordCache(maxsize=2)
+    assert cache.get("今日") is None
+    cache.put("今日", ["今日"])
+    cache.put("晴れ", ["晴", "##れ"])
+    assert cache.get("今日") == ["今日"]
+    # "晴れ" is the least recently used
+    cache.put("です", ["です"])
+    assert "晴れ" not in cache
+    assert "今日" in cache
+    assert cache.cache_info() == {"hits": 1, "misses": 1, "maxsize": 2, "currsize": 2}
+    cache.clear()
+    assert len(cache) == 0
+    assert cache.hits == 0
+
+
+def test_subword_cache_save_and_load(tmp_path) -> None:
+    path: str = os.path.join(tmp_path, "cache.json")
+    cache: SubwordCache = SubwordCache(maxsize=3, fingerprint="a")
+    words: List[str] = ["今日", "晴れ", "です"]
+    for word in words:
+        cache.put(word, [word])
+    cache.save(path)
+
+    loaded: SubwordCache = SubwordCache(maxsize=3, fingerprint="a")
+    assert loaded.load(path)
+    assert [word for word in words if word in loaded] == words
+    # The order of recency is kept
+    loaded.put("雨", ["雨"])
+    assert "今日" not in loaded
+
+    assert not SubwordCache(fingerprint="b").load(path)
@@ -0,0 +1,83 @@
+import os
+import pickle
+from typing import Dict, List
+
+import pytest
+from transformers.models.bert.tokenization_bert import load_vocab
+from transformers.models.bert_japanese import tokenization_bert_japanese
+
+from src.jptranstokenizer.subword.character import CharacterTokenizer
+from src.jptranstokenizer.subword.vocab import CompactVocab
+from src.jptranstokenizer.tokenization_utils import JapaneseTransformerTokenizer
+
+DATA_DIR: str = os.path.join(os.path.dirname(os.path.dirname(__file__)), "data")
+TEXTS: List[str] = ["今日は晴れです。", "ｶﾀｶﾅと①", "𠮷野家の𩸽", "", "外 国\t人", "\ud800", "hello"]
+
+
+@pytest.mark.parametrize("normalize_text", [True, False])
+def test_character_tokenizer(normalize_text: bool) -> None:
+    vocab: Dict[str, int] = load_vocab(os.path.join(DATA_DIR, "character/vocab.txt"))
+    vocab["𠮷"] = len(vocab)
+    tokenizer = CharacterTokenizer(
+        vocab=vocab, unk_token="[UNK]", normalize_text=normalize_text
+    )
+    original = tokenization_bert_japanese.CharacterTokenizer(
+        vocab=vocab, unk_token="[UNK]", normalize_text=normalize_text
+    )
+    expected: List[List[str]] = [original.tokenize(text) for text in TEXTS]
+    assert [tokenizer.tokenize(text) for text in TEXTS] == expected
+    assert tokenizer.encode_batch(TEXTS) == [
+        [vocab.get(token, vocab["[UNK]"]) for token in tokens] for tokens in expected
+    ]
+    assert tokenizer.encode_batch([]) == []
+    restored: CharacterTokenizer = pickle.loads(pickle.dumps(tokenizer))
+    assert restored.encode_batch(TEXTS) == tokenizer.encode_batch(TEXTS)
+    # The table follows the replaced vocabulary
+    tokenizer.vocab = CompactVocab.from_tokens(["[UNK]", "今", "𩸽"])
+    assert tokenizer.encode_batch(["今日の𩸽"]) == [[1, 0, 0, 2]]
+
+
+def test_character_tokenizer_without_unk() -> None:
+    tokenizer = CharacterTokenizer(vocab={"a": 0}, unk_token="[UNK]")
+    assert tokenizer.tokenize("ab") == ["a", "[UNK]"]
+    with pytest.raises(ValueError):
+        tokenizer.encode_batch(["ab"])
+
+
+@pytest.mark.parametrize("word_tokenizer_type", ["mecab", "none"])
+@pytest.mark.parametrize("do_subword_by_word", [True, False])
+def test_character_tokenizer_ids(
+    word_tokenizer_type: str, do_subword_by_word: bool
+) -> None:
+    tokenizer = JapaneseTransformerTokenizer(
+        vocab_file=os.path.join(DATA_DIR, "character/vocab.txt"),
+        word_tokenizer_type=word_tokenizer_type,
+        subword_tokenizer_type="character",
+        do_subword_by_word=do_subword_by_word,
+    )
+    texts: List[str] = [text for text in TEXTS if text != "\ud800"] + [
+        "[CLS]今日は[MASK]です[SEP]"
+    ]
+    assert tokenizer(texts)["input_ids"] == [
+        tokenizer.build_inputs_with_special_tokens(
+            tokenizer.convert_tokens_to_ids(tokens)
+        )
+        for tokens in tokenizer.tokenize_batch(texts)
+    ]
+
+
+def test_character_tokenizer_selected(tmp_path) -> None:
+    tokenization_bert_japanese.BertJapaneseTokenizer(
+        vocab_file=os.path.join(DATA_DIR, "character/vocab.txt"),
+        word_tokenizer_type="mecab",
+        subword_tokenizer_type="character",
+    ).save_pretrained(tmp_path)
+    tokenizer = JapaneseTransformerTokenizer.from_pretrained(
+        str(tmp_path),
+        tokenizer_class="BertJapaneseTokenizer",
+        word_tokenizer_type="mecab",
+        compact_vocab=True,
+    )
+    assert isinstance(tokenizer.subword_tokenizer, CharacterTokenizer)
+    assert tokenizer.subword_tokenizer.vocab is tokenizer.vocab
+    assert tokenizer.tokenize("外国人") == ["外", "国", "人"]
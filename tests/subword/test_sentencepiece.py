@@ -0,0 +1,95 @@
+import os
+import random
+from typing import Any, Dict, List, Optional
+
+import pytest
+
+from src.jptranstokenizer.subword.sentencepiece import (
+    SentencepieceTokenizer,
+    _is_digit_comma,
+)
+from src.jptranstokenizer.tokenization_utils import JapaneseTransformerTokenizer
+
+DATA_DIR: str = os.path.join(os.path.dirname(os.path.dirname(__file__)), "data")
+TEXTS: List[str] = ["今日は晴れです。", "1,000円と2,5", "", "外国 人参政権", "abc,1,", "①"]
+
+
+def test_sentencepiece_tokenizer_tokenize_batch() -> None:
+    tokenizer = SentencepieceTokenizer(
+        vocab_file=os.path.join(DATA_DIR, "sentencepiece/spiece.model")
+    )
+    assert tokenizer.tokenize_batch(TEXTS) == [
+        tokenizer.tokenize(text) for text in TEXTS
+    ]
+    assert tokenizer.tokenize_batch([]) == []
+
+
+@pytest.mark.parametrize("subword_cache_size", [None, 16])
+@pytest.mark.parametrize("do_subword_by_word", [True, False])
+def test_sentencepiece_tokenizer_batched_words(
+    do_subword_by_word: bool, subword_cache_size: Optional[int]
+) -> None:
+    tokenizer = JapaneseTransformerTokenizer(
+        vocab_file=os.path.join(DATA_DIR, "sentencepiece/spiece.model"),
+        word_tokenizer_type="mecab",
+        subword_tokenizer_type="sentencepiece",
+        do_subword_by_word=do_subword_by_word,
+        subword_cache_size=subword_cache_size,
+    )
+    assert tokenizer.tokenize_batch(TEXTS * 2) == [
+        tokenizer.tokenize(text) for text in TEXTS * 2
+    ]
+
+
+@pytest.fixture(scope="module")
+def numeric_model_file(tmp_path_factory) -> str:
+    # A model whose vocabulary has pieces ending with a comma after a digit
+    import sentencepiece as sp
+
+    rng: random.Random = random.Random(0)
+    tmp_dir = tmp_path_factory.mktemp("sentencepiece")
+    with open(tmp_dir / "corpus.txt", "w", encoding="utf-8") as f:
+        for _ in range(3000):
+            f.write(
+                f"価格は{rng.randint(1, 999)},{rng.randint(0, 999):03d}円で、{rng.randint(1, 99)},です\n"
+            )
+    sp.SentencePieceTrainer.train(
+        input=str(tmp_dir / "corpus.txt"),
+        model_prefix=str(tmp_dir / "numeric"),
+        vocab_size=300,
+        minloglevel=2,
+    )
+    return str(tmp_dir / "numeric.model")
+
+
+@pytest.mark.parametrize("sp_model_kwargs", [None, {"enable_sampling": True}])
+def test_sentencepiece_tokenizer_digit_comma(
+    numeric_model_file: str, sp_model_kwargs: Optional[Dict[str, Any]]
+) -> None:
+    tokenizer = SentencepieceTokenizer(
+        vocab_file=numeric_model_file, sp_model_kwargs=sp_model_kwargs
+    )
+    assert bool(tokenizer._digit_comma_splits) is (sp_model_kwargs is None)
+    if sp_model_kwargs is not None:
+        return
+    rng: random.Random = random.Random(0)
+    characters: str = "0123456789,,, 円今日①ｱabc"
+    texts: List[str] = [
+        "".join(rng.choice(characters) for _ in range(rng.randint(0, 30)))
+        for _ in range(1000)
+    ] + ["1,000円", "▁1,", "①,1,"]
+    expected: List[List[str]] = [
+        [
+            token
+            for piece in tokenizer.sp_model.EncodeAsPieces(text)
+            for token in (
+                tokenizer._split_piece(piece) if _is_digit_comma(piece) else [piece]
+            )
+        ]
+        for text in texts
+    ]
+    assert [tokenizer.tokenize(text) for text in texts] == expected
+    assert tokenizer.encode_batch(texts) == [
+        [tokenizer.vocab.get(token, tokenizer.unk_id) for token in tokens]
+        for tokens in expected
+    ]
@@ -0,0 +1,56 @@
+import os
+import pickle
+from typing import Dict, List, Optional
+
+import pytest
+
+from src.jptranstokenizer.subword.vocab import CompactVocab
+
+TOKENS: List[str] = ["[PAD]", "[UNK]", "今日", "##は", "晴れ", "", "a"]
+
+
+def test_compact_vocab() -> None:
+    vocab: CompactVocab = CompactVocab.from_tokens(TOKENS)
+    expected: Dict[str, int] = {token: i for i, token in enumerate(TOKENS)}
+    assert vocab == expected
+    assert list(vocab) == TOKENS
+    assert vocab["##は"] == 3
+    assert vocab.get("雨") is None
+    assert vocab.get("雨", 1) == 1
+    assert "晴れ" in vocab and "晴" not in vocab and 0 not in vocab
+    with pytest.raises(KeyError):
+        vocab["雨"]
+    assert vocab.ids_to_tokens == {i: token for i, token in enumerate(TOKENS)}
+    assert vocab.ids_to_tokens[2] == "今日"
+    assert vocab.ids_to_tokens.get(len(TOKENS)) is None
+    assert pickle.loads(pickle.dumps(vocab)) == expected
+
+
+def test_compact_vocab_gaps() -> None:
+    # Duplicated tokens are mapped to the last id like dict
+    tokens: List[Optional[str]] = ["a", "b", None, "a"]
+    vocab: CompactVocab = CompactVocab.from_tokens(tokens)
+    assert vocab == {"a": 3, "b": 1}
+    assert vocab.num_ids == 4
+    assert vocab.ids_to_tokens == {1: "b", 3: "a"}
+    assert CompactVocab.from_vocab({"a": 3, "b": 1}) == vocab
+
+
+def test_compact_vocab_file(tmp_path) -> None:
+    path: str = os.path.join(tmp_path, "vocab.bin")
+    vocab: CompactVocab = CompactVocab.from_tokens(TOKENS, path=path)
+    assert vocab.path == path
+    mtime: int = os.stat(path).st_mtime_ns
+    # The same vocabulary is not written again
+    assert CompactVocab.from_tokens(TOKENS, path=path) == vocab
+    assert os.stat(path).st_mtime_ns == mtime
+    # Only the path is pickled
+    assert b"##" not in pickle.dumps(vocab)
+    assert pickle.loads(pickle.dumps(vocab)) == vocab
+    assert CompactVocab.from_tokens(TOKENS[:3], path=path) == {
+        token: i for i, token in enumerate(TOKENS[:3])
+    }
+
+    saved: str = os.path.join(tmp_path, "saved.bin")
+    vocab.save(saved)
+    assert CompactVocab.load(saved) == vocab
@@ -0,0 +1,97 @@
+import os
+import pickle
+import random
+from typing import Dict, List
+
+import pytest
+from transformers.models.bert.tokenization_bert import load_vocab
+from transformers.models.bert_japanese import tokenization_bert_japanese
+
+from src.jptranstokenizer.subword.vocab import CompactVocab
+from src.jptranstokenizer.subword.wordpiece import WordpieceTokenizer
+from src.jptranstokenizer.tokenization_utils import JapaneseTransformerTokenizer
+
+DATA_DIR: str = os.path.join(os.path.dirname(os.path.dirname(__file__)), "data")
+VOCAB: Dict[str, int] = {
+    token: i
+    for i, token in enumerate(
+        [
+            "[UNK]",
+            "un",
+            "##aff",
+            "##able",
+            "##a",
+            "a",
+            "ab",
+            "abc",
+            "##",
+            "##b",
+            "#",
+            "##bcd",
+        ]
+    )
+}
+
+
+@pytest.mark.parametrize(
+    "text, expected",
+    [
+        ("unaffable", ["un", "##aff", "##able"]),
+        ("abc", ["abc"]),
+        ("abcd", ["[UNK]"]),
+        ("abbcd", ["ab", "##bcd"]),
+        ("aa ab\tabc", ["a", "##a", "ab", "abc"]),
+        ("##", ["##"]),
+        ("###", ["[UNK]"]),
+        ("#", ["#"]),
+        ("", []),
+        (" ", []),
+        ("a" * 10, ["a"] + ["##a"] * 9),
+        ("a" * 11, ["[UNK]"]),
+    ],
+)
+def test_wordpiece_tokenizer(text: str, expected: List[str]) -> None:
+    tokenizer = WordpieceTokenizer(
+        vocab=VOCAB, unk_token="[UNK]", max_input_chars_per_word=10
+    )
+    original = tokenization_bert_japanese.WordpieceTokenizer(
+        vocab=VOCAB, unk_token="[UNK]", max_input_chars_per_word=10
+    )
+    assert tokenizer.tokenize(text) == original.tokenize(text) == expected
+
+
+def test_wordpiece_tokenizer_same_as_transformers() -> None:
+    vocab: Dict[str, int] = load_vocab(os.path.join(DATA_DIR, "wordpiece/vocab.txt"))
+    tokenizer = WordpieceTokenizer(vocab=vocab, unk_token="[UNK]")
+    original = tokenization_bert_japanese.WordpieceTokenizer(
+        vocab=vocab, unk_token="[UNK]"
+    )
+    rng: random.Random = random.Random(0)
+    characters: str = "アイウエオカキクケコサシスセソンーabcxyz0123456789今日国人参政権。、"
+    words: List[str] = [
+        "".join(rng.choice(characters) for _ in range(rng.randint(1, 120)))
+        for _ in range(300)
+    ] + list(vocab)[:1000]
+    assert [tokenizer.tokenize(word) for word in words] == [
+        original.tokenize(word) for word in words
+    ]
+    restored: WordpieceTokenizer = pickle.loads(pickle.dumps(tokenizer))
+    assert [restored.tokenize(word) for word in words[:100]] == [
+        original.tokenize(word) for word in words[:100]
+    ]
+    # The tries follow the replaced vocabulary
+    tokenizer.vocab = CompactVocab.from_vocab(VOCAB)
+    assert tokenizer.tokenize("unaffable") == ["un", "##aff", "##able"]
+
+
+@pytest.mark.parametrize("compact_vocab", [False, True])
+def test_wordpiece_tokenizer_selected(compact_vocab: bool) -> None:
+    tokenizer = JapaneseTransformerTokenizer.from_pretrained(
+        os.path.join(DATA_DIR, "wordpiece/"),
+        tokenizer_class="BertJapaneseTokenizer",
+        word_tokenizer_type="mecab",
+        compact_vocab=compact_vocab,
+    )
+    assert isinstance(tokenizer.subword_tokenizer, WordpieceTokenizer)
+    assert tokenizer.subword_tokenizer.vocab is tokenizer.vocab
+    assert tokenizer.tokenize("外国人参政権") == ["外国", "人", "##参", "政権"]
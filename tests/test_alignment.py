@@ -0,0 +1,52 @@
+from typing import List, Tuple
+
+import pytest
+
+from src.jptranstokenizer.alignment import (
+    align_subwords,
+    align_words,
+    normalize_with_alignment,
+)
+
+
+@pytest.mark.parametrize(
+    "text, expected_text, expected_spans",
+    [
+        ("今日は晴れ", "今日は晴れ", None),
+        ("ＡB", "AB", [(0, 1), (1, 2)]),
+        ("ｶﾞ㍻", "ガ平成", [(0, 2), (2, 3), (2, 3)]),
+        ("が", "が", [(0, 2)]),
+    ],
+)
+def test_normalize_with_alignment(
+    text: str, expected_text: str, expected_spans
+) -> None:
+    assert normalize_with_alignment(text) == (expected_text, expected_spans)
+
+
+@pytest.mark.parametrize(
+    "text, words, expected",
+    [
+        ("外国人 参政権", ["外国", "人", "参政", "権"], [(0, 2), (2, 3), (4, 6), (6, 7)]),
+        ("#タグ", ["＃", "タグ"], [(0, 1), (1, 3)]),
+        ("a b", ["a", "　", "b"], [(0, 1), (1, 2), (2, 3)]),
+    ],
+)
+def test_align_words(
+    text: str, words: List[str], expected: List[Tuple[int, int]]
+) -> None:
+    assert align_words(text, words) == expected
+
+
+@pytest.mark.parametrize(
+    "word, subwords, prefix, expected",
+    [
+        ("政権", ["政", "##権"], "##", [(0, 1), (1, 2)]),
+        ("外国人", ["[UNK]"], "##", [(0, 3)]),
+        ("外国人", ["▁", "[UNK]", "人"], "▁", [(0, 0), (0, 2), (2, 3)]),
+    ],
+)
+def test_align_subwords(
+    word: str, subwords: List[str], prefix: str, expected: List[Tuple[int, int]]
+) -> None:
+    assert align_subwords(word, subwords, "[UNK]", prefix=prefix) == expected
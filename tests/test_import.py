@@ -0,0 +1,56 @@
+import json
+import os
+import subprocess
+import sys
+
+# Budget of the cold import of the top-level package, which must not load transformers
+IMPORT_TIME_BUDGET: float = 1.0
+
+SRC_DIR: str = os.path.join(os.path.dirname(os.path.dirname(__file__)), "src")
+
+
+def run_python(code: str) -> str:
+    result = subprocess.run(
+        [sys.executable, "-c", code],
+        env={**os.environ, "PYTHONPATH": SRC_DIR},
+        stdout=subprocess.PIPE,
+        check=True,
+    )
+    return result.stdout.decode("utf-8")
+
+
+def test_import_is_lazy() -> None:
+    code: str = (
+        "import json, sys, time\n"
+        "start = time.perf_counter()\n"
+        "import jptranstokenizer\n"
+        "from jptranstokenizer.mainword import Normalizer, SudachiTokenizer\n"
+        "elapsed = time.perf_counter() - start\n"
+        "print(json.dumps({'elapsed': elapsed, "
+        "'transformers': 'transformers' in sys.modules}))"
+    )
+    result = json.loads(run_python(code))
+    assert not result["transformers"]
+    assert result["elapsed"] < IMPORT_TIME_BUDGET
+
+
+def test_import_keeps_logging() -> None:
+    code: str = (
+        "import transformers\n"
+        "verbosity = transformers.logging.get_verbosity()\n"
+        "import jptranstokenizer\n"
+        "jptranstokenizer.JapaneseTransformerTokenizer\n"
+        "print(transformers.logging.get_verbosity() == verbosity)"
+    )
+    assert run_python(code).strip() == "True"
+
+
+def test_lazy_attributes() -> None:
+    code: str = (
+        "import jptranstokenizer\n"
+        "from jptranstokenizer.tokenization_utils import JapaneseTransformerTokenizer\n"
+        "print(jptranstokenizer.JapaneseTransformerTokenizer is JapaneseTransformerTokenizer, "
+        "'get_word_tokenizer' in dir(jptranstokenizer), "
+        "hasattr(jptranstokenizer, 'NoSuchTokenizer'))"
+    )
+    assert run_python(code).split() == ["True", "True", "False"]
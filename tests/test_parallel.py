@@ -0,0 +1,52 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Optional
+
+import pytest
+
+from src.jptranstokenizer.parallel import ParallelEncoder, resolve_n_jobs, split_chunks
+from src.jptranstokenizer.tokenization_utils import JapaneseTransformerTokenizer
+
+DATA_DIR: str = os.path.join(os.path.dirname(__file__), "data")
+
+
+@pytest.mark.parametrize(
+    "n_jobs, expected", [(None, 1), (0, 1), (1, 1), (4, 4), (-1, os.cpu_count() or 1)]
+)
+def test_resolve_n_jobs(n_jobs: Optional[int], expected: int) -> None:
+    assert resolve_n_jobs(n_jobs) == expected
+
+
+def test_split_chunks() -> None:
+    texts: List[str] = [str(i) for i in range(10)]
+    chunks: List[List[str]] = split_chunks(texts, 4)
+    assert [len(chunk) for chunk in chunks] == [4, 4, 2]
+    assert [text for chunk in chunks for text in chunk] == texts
+
+
+def test_parallel_encoder_state() -> None:
+    tokenizer = JapaneseTransformerTokenizer(
+        vocab_file=os.path.join(DATA_DIR, "wordpiece/vocab.txt"),
+        word_tokenizer_type="mecab",
+        subword_tokenizer_type="wordpiece",
+    )
+    encoder = ParallelEncoder(tokenizer)
+    texts: List[str] = ["今日も晴れです。", "", "ほげほげの国境"] * 10
+    with ProcessPoolExecutor(max_workers=2) as executor:
+        assert encoder.encode(texts, executor=executor, chunk_size=2) == (
+            tokenizer.encode_batch(texts, add_special_tokens=False)
+        )
+        # The pickled tokenizer is reused while the tokenizer is unchanged
+        state = encoder._get_state()
+        assert encoder.encode(texts, executor=executor) == (
+            tokenizer.encode_batch(texts, add_special_tokens=False)
+        )
+        assert encoder._get_state() is state
+        tokenizer.add_tokens(["ほげ"])
+        assert encoder._get_state() != state
+        assert encoder.encode(texts, executor=executor, chunk_size=2) == (
+            tokenizer.encode_batch(texts, add_special_tokens=False)
+        )
+        state = encoder._get_state()
+        encoder.invalidate()
+        assert encoder._get_state() is not state
@@ -0,0 +1,154 @@
+import json
+import os
+from typing import List
+
+import numpy as np
+import pytest
+
+from src.jptranstokenizer.cli import main
+from src.jptranstokenizer.pretokenize import get_dtype
+from src.jptranstokenizer.pretokenize import pretokenize
+from src.jptranstokenizer.tokenization_utils import JapaneseTransformerTokenizer
+
+DATA_DIR: str = os.path.join(os.path.dirname(__file__), "data")
+TEXTS: List[str] = ["外国人参政権", "今日はいい天気ですね。", "", "吾輩は猫である。名前はまだ無い。", "東京都に住んでいます"]
+
+
+@pytest.fixture(scope="module")
+def tokenizer() -> JapaneseTransformerTokenizer:
+    return JapaneseTransformerTokenizer.from_pretrained(
+        os.path.join(DATA_DIR, "wordpiece/"),
+        tokenizer_class="BertJapaneseTokenizer",
+        word_tokenizer_type="mecab",
+    )
+
+
+@pytest.fixture
+def corpus(tmp_path) -> str:
+    path = tmp_path / "corpus.jsonl"
+    with open(path, "w", encoding="utf-8") as f:
+        for text in TEXTS * 3:
+            f.write(json.dumps({"text": text}, ensure_ascii=False) + "\n")
+    return str(path)
+
+
+def read_documents(output_dir: str, checkpoint) -> List[List[int]]:
+    documents: List[List[int]] = []
+    for shard in checkpoint["shards"]:
+        path: str = os.path.join(output_dir, shard["name"])
+        ids = np.memmap(path + ".bin", dtype=checkpoint["dtype"], mode="r")
+        offsets = np.load(path + ".idx.npy")
+        assert len(ids) == shard["num_tokens"] == offsets[-1]
+        documents.extend(
+            ids[start:end].tolist() for start, end in zip(offsets[:-1], offsets[1:])
+        )
+    return documents
+
+
+@pytest.mark.parametrize(
+    "vocab_size, expected",
+    [(256, "uint8"), (257, "uint16"), (32000, "uint16"), (70000, "uint32")],
+)
+def test_get_dtype(vocab_size: int, expected: str) -> None:
+    assert get_dtype(vocab_size) == expected
+
+
+@pytest.mark.parametrize("shard_size", [1, 10, 1000])
+def test_pretokenize(
+    tokenizer: JapaneseTransformerTokenizer, corpus: str, tmp_path, shard_size: int
+) -> None:
+    output_dir: str = str(tmp_path / "out")
+    checkpoint = pretokenize(
+        tokenizer, [corpus], output_dir, shard_size=shard_size, batch_size=4
+    )
+    assert checkpoint["done"]
+    expected: List[List[int]] = tokenizer(TEXTS * 3, add_special_tokens=False)[
+        "input_ids"
+    ]
+    assert read_documents(output_dir, checkpoint) == expected
+
+
+def test_pretokenize_world_size(
+    tokenizer: JapaneseTransformerTokenizer, corpus: str, tmp_path
+) -> None:
+    output_dir: str = str(tmp_path / "out")
+    documents: List[List[List[int]]] = [
+        read_documents(
+            output_dir,
+            pretokenize(
+                tokenizer,
+                [corpus],
+                output_dir,
+                shard_size=10,
+                batch_size=2,
+                rank=rank,
+                world_size=2,
+            ),
+        )
+        for rank in range(2)
+    ]
+    expected: List[List[int]] = tokenizer(TEXTS * 3, add_special_tokens=False)[
+        "input_ids"
+    ]
+    assert documents[0] == expected[0::2]
+    assert documents[1] == expected[1::2]
+
+
+def test_pretokenize_resume(
+    tokenizer: JapaneseTransformerTokenizer, corpus: str, tmp_path
+) -> None:
+    output_dir: str = str(tmp_path / "out")
+    expected = pretokenize(tokenizer, [corpus], str(tmp_path / "full"), shard_size=10)
+
+    # Simulate an interruption after the second shard is completed
+    class Interrupted(Exception):
+        pass
+
+    calls: List[int] = []
+    original = tokenizer.__class__.__call__
+
+    def interrupted_call(self, *args, **kwargs):
+        calls.append(0)
+        if len(calls) > 2:
+            raise Interrupted
+        return original(self, *args, **kwargs)
+
+    tokenizer.__class__.__call__ = interrupted_call
+    try:
+        with pytest.raises(Interrupted):
+            pretokenize(tokenizer, [corpus], output_dir, shard_size=10, batch_size=3)
+    finally:
+        tokenizer.__class__.__call__ = original
+    with open(os.path.join(output_dir, "checkpoint_00000.json")) as f:
+        checkpoint = json.load(f)
+    assert not checkpoint["done"]
+    assert 0 < checkpoint["num_lines"] < len(TEXTS) * 3
+
+    resumed = pretokenize(tokenizer, [corpus], output_dir, shard_size=10, batch_size=3)
+    assert resumed["shards"] == expected["shards"]
+    assert read_documents(output_dir, resumed) == read_documents(
+        str(tmp_path / "full"), expected
+    )
+
+
+def test_cli_pretokenize(corpus: str, tmp_path, capsys) -> None:
+    output_dir: str = str(tmp_path / "out")
+    main(
+        [
+            "pretokenize",
+            os.path.join(DATA_DIR, "wordpiece/"),
+            corpus,
+            "--output-dir",
+            output_dir,
+            "--word-tokenizer-type",
+            "mecab",
+            "--tokenizer-class",
+            "BertJapaneseTokenizer",
+            "--add-special-tokens",
+        ]
+    )
+    assert "15 documents" in capsys.readouterr().out
+    with open(os.path.join(output_dir, "checkpoint_00000.json")) as f:
+        checkpoint = json.load(f)
+    assert checkpoint["dtype"] == "uint16"
+    assert all(len(ids) >= 2 for ids in read_documents(output_dir, checkpoint))
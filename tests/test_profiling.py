@@ -0,0 +1,76 @@
+import os
+import pickle
+from typing import List, Tuple
+
+import pytest
+
+from src.jptranstokenizer.profiling import SlowInput, TokenizerProfiler
+from src.jptranstokenizer.tokenization_utils import JapaneseTransformerTokenizer
+
+DATA_DIR: str = os.path.join(os.path.dirname(__file__), "data")
+
+
+def test_profiler_timer() -> None:
+    profiler: TokenizerProfiler = TokenizerProfiler(max_slow_inputs=2)
+    events: List[Tuple[str, float, int]] = []
+    profiler.add_hook(lambda *event: events.append(event))
+    with profiler.timer("word", ["a", "b"]):
+        assert profiler.in_flight()[0][:2] == ("word", ["a", "b"])
+        # Nested calls of the same stage are counted once
+        with profiler.timer("word"):
+            pass
+    assert profiler.in_flight() == []
+    assert profiler.stats()["word"]["calls"] == 1
+    assert profiler.stats()["word"]["items"] == 2
+    assert [event[0] for event in events] == ["word"]
+
+    failed: List[SlowInput] = []
+    profiler.add_slow_input_hook(failed.append)
+    with pytest.raises(RuntimeError):
+        with profiler.timer("word", ["c"]):
+            raise RuntimeError("hang")
+    assert [slow_input.text for slow_input in failed] == ["c"]
+    assert "hang" in profiler.slow_inputs[0].error
+    profiler.reset()
+    assert profiler.stats() == {}
+    assert profiler.slow_inputs == []
+
+
+def test_profiler_slow_inputs() -> None:
+    profiler: TokenizerProfiler = TokenizerProfiler(
+        slow_threshold=1.0, max_slow_inputs=2
+    )
+    for text, seconds in [("a", 0.5), ("b", 2.0), ("c", 3.0), ("d", 1.5)]:
+        profiler.record_input(text, "tokenize", seconds)
+    assert [slow_input.text for slow_input in profiler.slow_inputs] == ["c", "b"]
+
+
+def test_tokenizer_profiling() -> None:
+    tokenizer = JapaneseTransformerTokenizer(
+        vocab_file=os.path.join(DATA_DIR, "wordpiece/vocab.txt"),
+        word_tokenizer_type="mecab",
+    )
+    texts: List[str] = ["外国人参政権", "今日はｲｲ天気ですね。", "長い" * 200]
+    expected = tokenizer(texts, padding=True)
+    profiler: TokenizerProfiler = tokenizer.enable_profiling(slow_threshold=0.0)
+    assert tokenizer(texts, padding=True) == expected
+    stats = profiler.stats()
+    assert list(stats.keys()) == [
+        "normalize",
+        "word",
+        "subword",
+        "convert",
+        "prepare",
+        "total",
+    ]
+    assert stats["word"]["items"] == len(texts)
+    assert stats["total"]["calls"] == 1
+    assert stats["total"]["seconds"] >= stats["word"]["seconds"]
+    assert sorted(slow_input.text for slow_input in profiler.slow_inputs) == sorted(
+        texts
+    )
+    # The profiler is not pickled
+    assert pickle.loads(pickle.dumps(tokenizer)).profiler is None
+    tokenizer.disable_profiling()
+    assert tokenizer.profiler is None
+    assert tokenizer(texts, padding=True) == expected
@@ -0,0 +1,147 @@
+import asyncio
+import json
+import os
+import time
+from typing import Any, Dict, List, Tuple
+
+import pytest
+
+from src.jptranstokenizer.cli import get_parser
+from src.jptranstokenizer.serve import DeadlineExceeded
+from src.jptranstokenizer.serve import MicroBatcher
+from src.jptranstokenizer.serve import TokenizationServer
+from src.jptranstokenizer.tokenization_utils import JapaneseTransformerTokenizer
+
+DATA_DIR: str = os.path.join(os.path.dirname(__file__), "data")
+TEXTS: List[str] = [f"{i}番目の国境の長いトンネルを抜けると雪国であった。" for i in range(10)] + ["", "外国人参政権"]
+
+
+@pytest.fixture
+def tokenizer() -> JapaneseTransformerTokenizer:
+    return JapaneseTransformerTokenizer.from_pretrained(
+        os.path.join(DATA_DIR, "wordpiece/"),
+        tokenizer_class="BertJapaneseTokenizer",
+        word_tokenizer_type="mecab",
+    )
+
+
+async def request(
+    path: str, method: str = "POST", body: Dict[str, Any] = None, **kwargs
+) -> Tuple[int, Dict[str, Any]]:
+    reader, writer = await asyncio.open_unix_connection(path)
+    data: bytes = json.dumps(body or {}).encode("utf-8")
+    writer.write(
+        (
+            f"{method} {kwargs.get('url', '/encode')} HTTP/1.1\r\n"
+            f"Content-Length: {len(data)}\r\nConnection: close\r\n\r\n"
+        ).encode("latin-1")
+        + data
+    )
+    await writer.drain()
+    response: bytes = await reader.read()
+    writer.close()
+    head, _, payload = response.partition(b"\r\n\r\n")
+    return int(head.split(b" ")[1]), json.loads(payload)
+
+
+def test_micro_batcher(tokenizer: JapaneseTransformerTokenizer) -> None:
+    batcher = MicroBatcher(tokenizer, max_batch_size=4, max_wait_ms=50)
+
+    async def run():
+        try:
+            return await asyncio.gather(
+                *[batcher.submit("encode", text) for text in TEXTS],
+                *[batcher.submit("tokenize", text) for text in TEXTS],
+                batcher.submit("encode", TEXTS[0], add_special_tokens=False),
+            )
+        finally:
+            await batcher.close()
+
+    results: List[Any] = asyncio.run(run())
+    assert results[: len(TEXTS)] == [tokenizer.encode(text) for text in TEXTS]
+    assert results[len(TEXTS) : -1] == tokenizer.tokenize_batch(TEXTS)
+    assert results[-1] == tokenizer.encode(TEXTS[0], add_special_tokens=False)
+    assert batcher.stats["texts"] == len(TEXTS) * 2 + 1
+    # Each batch of at most 4 texts is divided by the kind of the requests
+    assert 6 <= batcher.stats["batches"] <= 9
+
+
+def test_micro_batcher_deadline(tokenizer: JapaneseTransformerTokenizer) -> None:
+    batcher = MicroBatcher(tokenizer, max_batch_size=64, max_wait_ms=200)
+
+    async def run():
+        try:
+            with pytest.raises(DeadlineExceeded):
+                await batcher.submit(
+                    "encode", TEXTS[0], deadline=time.monotonic() + 0.01
+                )
+            return await batcher.submit("encode", TEXTS[1])
+        finally:
+            await batcher.close()
+
+    assert asyncio.run(run()) == tokenizer.encode(TEXTS[1])
+    assert batcher.stats["expired"] == 1
+    with pytest.raises(ValueError):
+        asyncio.run(batcher.submit("decode", TEXTS[0]))
+
+
+def test_tokenization_server(tokenizer: JapaneseTransformerTokenizer, tmp_path) -> None:
+    path: str = str(tmp_path / "serve.sock")
+    server = TokenizationServer(tokenizer, max_batch_size=8, max_wait_ms=5)
+
+    async def run():
+        listener = await server.start(unix_socket=path)
+        try:
+            return await asyncio.gather(
+                request(path, body={"texts": TEXTS}),
+                request(path, body={"text": TEXTS[0]}, url="/tokenize"),
+                request(path, body={"text": TEXTS[0], "add_special_tokens": False}),
+                request(path, body={"texts": TEXTS, "deadline_ms": 0}),
+                request(path, body={"texts": "not a list"}),
+                request(path, body={"textz": TEXTS}),
+                request(path, body={"text": "a", "deadline_ms": "100"}),
+                request(path, body={"text": "a", "deadline_ms": -1}),
+                request(path, url="/decode"),
+                request(path, method="GET"),
+                request(path, method="GET", url="/health"),
+            )
+        finally:
+            listener.close()
+            await listener.wait_closed()
+            await server.close()
+
+    (
+        encoded,
+        tokenized,
+        no_special,
+        expired,
+        invalid,
+        missing,
+        bad_deadline,
+        negative_deadline,
+        not_found,
+        not_allowed,
+        health,
+    ) = asyncio.run(run())
+    assert encoded == (200, {"input_ids": [tokenizer.encode(text) for text in TEXTS]})
+    assert tokenized == (200, {"tokens": tokenizer.tokenize(TEXTS[0])})
+    assert no_special == (
+        200,
+        {"input_ids": tokenizer.encode(TEXTS[0], add_special_tokens=False)},
+    )
+    assert expired[0] == 504
+    assert invalid[0] == missing[0] == 400
+    assert bad_deadline[0] == negative_deadline[0] == 400
+    assert not_found[0] == 404
+    assert not_allowed[0] == 405
+    assert health[0] == 200 and health[1]["status"] == "ok"
+
+
+def test_serve_parser() -> None:
+    args = get_parser().parse_args(
+        ["serve", "cl-tohoku/bert-base-japanese", "--unix-socket", "/tmp/a.sock"]
+    )
+    assert args.unix_socket == "/tmp/a.sock"
+    assert args.max_batch_size == 64
+    assert args.max_wait_ms == 5
+    assert args.default_deadline_ms is None
@@ -1,8 +1,12 @@
+import asyncio
 import os.path
+import pickle
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from contextlib import nullcontext as does_not_raise
 from typing import List, Optional
 
 import pytest
+from transformers import PreTrainedTokenizer
 
 from src.jptranstokenizer.tokenization_utils import (
     get_word_tokenizer,
@@ -62,6 +66,403 @@ def test_japanesetransformertokenizer_init(
         )
 
 
+@pytest.mark.parametrize(
+    "word_tokenizer_type, subword_tokenizer_type, vocab_file, do_subword_by_word",
+    [
+        ("mecab", "wordpiece", "wordpiece/vocab.txt", True),
+        ("sudachi", "sentencepiece", "sentencepiece/spiece.model", True),
+        ("sudachi", "sentencepiece", "sentencepiece/spiece.model", False),
+        ("none", "character", "character/vocab.txt", True),
+        ("basic", "wordpiece", "wordpiece/vocab.txt", True),
+    ],
+)
+def test_japanesetransformertokenizer_batch(
+    word_tokenizer_type: str,
+    subword_tokenizer_type: str,
+    vocab_file: str,
+    do_subword_by_word: bool,
+) -> None:
+    tokenizer = JapaneseTransformerTokenizer(
+        vocab_file=os.path.join(DATA_DIR, vocab_file),
+        word_tokenizer_type=word_tokenizer_type,
+        subword_tokenizer_type=subword_tokenizer_type,
+        do_subword_by_word=do_subword_by_word,
+    )
+    texts: List[str] = [
+        "今日も晴れです。",
+        "",
+        "[CLS] 国境の[MASK]トンネルを抜けると雪国であった。[SEP]",
+        "Example: ① is 1．",
+    ]
+    assert tokenizer.tokenize_batch(texts) == [
+        tokenizer.tokenize(text) for text in texts
+    ]
+    assert tokenizer(texts)["input_ids"] == [
+        tokenizer(text)["input_ids"] for text in texts
+    ]
+    pairs = list(zip(texts, reversed(texts)))
+    assert tokenizer(pairs, truncation=True, max_length=8)["input_ids"] == [
+        tokenizer(*pair, truncation=True, max_length=8)["input_ids"] for pair in pairs
+    ]
+
+
+@pytest.mark.parametrize(
+    "word_tokenizer_type, subword_tokenizer_type, vocab_file",
+    [
+        ("mecab", "wordpiece", "wordpiece/vocab.txt"),
+        ("none", "wordpiece", "wordpiece/vocab.txt"),
+        ("mecab", "character", "character/vocab.txt"),
+        ("mecab", "sentencepiece", "sentencepiece/spiece.model"),
+        ("none", "sentencepiece", "sentencepiece/spiece.model"),
+    ],
+)
+@pytest.mark.parametrize("do_subword_by_word", [True, False])
+def test_japanesetransformertokenizer_encode_batch(
+    word_tokenizer_type: str,
+    subword_tokenizer_type: str,
+    vocab_file: str,
+    do_subword_by_word: bool,
+) -> None:
+    tokenizer = JapaneseTransformerTokenizer(
+        vocab_file=os.path.join(DATA_DIR, vocab_file),
+        word_tokenizer_type=word_tokenizer_type,
+        subword_tokenizer_type=subword_tokenizer_type,
+        do_subword_by_word=do_subword_by_word,
+    )
+    texts: List[str] = [
+        "今日も晴れです。",
+        "",
+        " ",
+        "[CLS] 国境の[MASK]トンネルを抜けると雪国であった。[SEP]",
+        "Example: ① is 1．",
+        "売上は1,000円、2,500,000ドルと3,4,",
+        "𠮷野家の①,②とｶﾀｶﾅ",
+    ]
+    # Ids are looked up directly, and they are the same as converting tokens
+    assert tokenizer._can_encode_ids()
+    expected: List[List[int]] = [
+        tokenizer.convert_tokens_to_ids(tokens)
+        for tokens in tokenizer.tokenize_batch(texts)
+    ]
+    assert tokenizer.encode_batch(texts, add_special_tokens=False) == expected
+    assert tokenizer.encode_batch(texts) == [
+        tokenizer.build_inputs_with_special_tokens(ids) for ids in expected
+    ]
+    assert [tokenizer.encode(text) for text in texts] == tokenizer(texts)["input_ids"]
+    assert tokenizer(texts)["input_ids"] == tokenizer.encode_batch(texts)
+
+
+@pytest.mark.parametrize(
+    "kwargs",
+    [
+        {},
+        {"skip_special_tokens": True},
+        {"spaces_between_special_tokens": False},
+        {"clean_up_tokenization_spaces": False},
+    ],
+)
+def test_japanesetransformertokenizer_decode_sentencepiece(kwargs: dict) -> None:
+    tokenizer = JapaneseTransformerTokenizer(
+        vocab_file=os.path.join(DATA_DIR, "sentencepiece/spiece.model"),
+        word_tokenizer_type="mecab",
+        subword_tokenizer_type="sentencepiece",
+    )
+    tokenizer.add_tokens(["<extra_id_0>", "ほげ"])
+    tokenizer.add_special_tokens({"additional_special_tokens": ["<extra_id_1>"]})
+    texts: List[str] = [
+        "今日も晴れです。",
+        "",
+        "[CLS] 国境の[MASK]トンネルを抜けると<extra_id_0>雪国であった。[SEP]",
+        "ほげ<extra_id_1> ほげ [SEP][SEP] a , b",
+        "売上は1,000円、2,500,000ドル",
+    ]
+    batch_ids: List[List[int]] = tokenizer(texts)["input_ids"] + [
+        [tokenizer.cls_token_id, 5, 100, tokenizer.pad_token_id, 7, 8, 32769]
+    ]
+    # Runs of ids are decoded at once, which is the same as decoding through tokens
+    expected: List[str] = [
+        PreTrainedTokenizer._decode(tokenizer, ids, **kwargs) for ids in batch_ids
+    ]
+    assert [tokenizer.decode(ids, **kwargs) for ids in batch_ids] == expected
+    assert tokenizer.batch_decode(batch_ids, **kwargs) == expected
+    with pytest.raises(IndexError):
+        tokenizer.decode([5, len(tokenizer) + 10])
+    # The table of special and added tokens is reused until they change
+    table = tokenizer._sentencepiece_decode_table()
+    assert tokenizer._sentencepiece_decode_table() is table
+    tokenizer.add_tokens(["ふが"])
+    assert tokenizer._sentencepiece_decode_table() is not table
+    table = tokenizer._sentencepiece_decode_table()
+    tokenizer.pad_token = "<pad>"
+    assert tokenizer._sentencepiece_decode_table() is not table
+    ids: List[int] = tokenizer.encode("ふが<pad>今日", add_special_tokens=False)
+    assert tokenizer.decode(ids, **kwargs) == PreTrainedTokenizer._decode(
+        tokenizer, ids, **kwargs
+    )
+
+
+@pytest.mark.parametrize(
+    "word_tokenizer_type, subword_tokenizer_type, vocab_file",
+    [
+        ("mecab", "wordpiece", "wordpiece/vocab.txt"),
+        ("sudachi", "sentencepiece", "sentencepiece/spiece.model"),
+    ],
+)
+def test_japanesetransformertokenizer_parallel(
+    word_tokenizer_type: str, subword_tokenizer_type: str, vocab_file: str
+) -> None:
+    tokenizer = JapaneseTransformerTokenizer(
+        vocab_file=os.path.join(DATA_DIR, vocab_file),
+        word_tokenizer_type=word_tokenizer_type,
+        subword_tokenizer_type=subword_tokenizer_type,
+    )
+    texts: List[str] = ["今日も晴れです。", "", "国境の[MASK]トンネルを抜ける" * 10] * 20
+    unpickled = pickle.loads(pickle.dumps(tokenizer))
+    assert unpickled.tokenize_batch(texts) == tokenizer.tokenize_batch(texts)
+    expected: List[List[int]] = tokenizer(texts)["input_ids"]
+    assert tokenizer(texts, n_jobs=2, chunk_size=3)["input_ids"] == expected
+    with ProcessPoolExecutor(max_workers=2) as executor:
+        assert tokenizer(texts, executor=executor)["input_ids"] == expected
+
+
+@pytest.mark.parametrize(
+    "word_tokenizer_type, subword_tokenizer_type, vocab_file",
+    [
+        ("mecab", "wordpiece", "wordpiece/vocab.txt"),
+        ("juman", "wordpiece", "wordpiece/vocab.txt"),
+        ("sudachi", "sentencepiece", "sentencepiece/spiece.model"),
+        ("none", "character", "character/vocab.txt"),
+    ],
+)
+def test_japanesetransformertokenizer_threads(
+    tmp_path, word_tokenizer_type: str, subword_tokenizer_type: str, vocab_file: str
+) -> None:
+    tokenizer = JapaneseTransformerTokenizer(
+        vocab_file=os.path.join(DATA_DIR, vocab_file),
+        word_tokenizer_type=word_tokenizer_type,
+        subword_tokenizer_type=subword_tokenizer_type,
+        word_cache_path=os.path.join(tmp_path, "word_cache.sqlite"),
+        juman_max_workers=2,
+    )
+    tokenizer.enable_subword_cache(maxsize=16)
+    texts: List[str] = [
+        f"{i}番目の国境の長い[MASK]トンネルを抜けると雪国であった。" * (i % 5 + 1) for i in range(64)
+    ]
+    expected: List[List[int]] = [tokenizer.encode(text) for text in texts]
+
+    def encode(offset: int) -> List[List[int]]:
+        # Each thread encodes the texts in a different order and in batches
+        order: List[int] = [(offset + i) % len(texts) for i in range(len(texts))]
+        results: List[List[int]] = tokenizer([texts[i] for i in order])["input_ids"]
+        results += [tokenizer.encode(texts[i]) for i in order]
+        return [results[order.index(i)] for i in range(len(texts))] + [
+            results[len(texts) + order.index(i)] for i in range(len(texts))
+        ]
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        for results in executor.map(encode, range(0, 64, 4)):
+            assert results == expected * 2
+
+
+@pytest.mark.parametrize("word_tokenizer_type", ["mecab", "juman", "sudachi"])
+def test_japanesetransformertokenizer_async(word_tokenizer_type: str) -> None:
+    tokenizer = JapaneseTransformerTokenizer(
+        vocab_file=os.path.join(DATA_DIR, "wordpiece/vocab.txt"),
+        word_tokenizer_type=word_tokenizer_type,
+        subword_tokenizer_type="wordpiece",
+        juman_max_workers=2,
+    )
+    texts: List[str] = [f"{i}番目の国境の長い[MASK]トンネルを抜けると雪国であった。" for i in range(20)] + [
+        "",
+        "Example: ① is 1．",
+    ]
+
+    async def run():
+        try:
+            return (
+                await asyncio.gather(*[tokenizer.aencode(text) for text in texts]),
+                await tokenizer.abatch_encode(texts, padding=True),
+                await tokenizer.atokenize_batch(texts),
+                await tokenizer.atokenize(texts[0]),
+            )
+        finally:
+            await tokenizer.aclose()
+
+    input_ids, encodings, batch_tokens, tokens = asyncio.run(run())
+    assert input_ids == [tokenizer.encode(text) for text in texts]
+    assert encodings["input_ids"] == tokenizer(texts, padding=True)["input_ids"]
+    assert batch_tokens == tokenizer.tokenize_batch(texts)
+    assert tokens == tokenizer.tokenize(texts[0])
+
+
+def test_japanesetransformertokenizer_word_cache(tmp_path) -> None:
+    cache_path: str = os.path.join(tmp_path, "word_cache.sqlite")
+    texts: List[str] = ["今日も晴れです。", "明日も晴れです。"]
+    expected: List[List[str]] = JapaneseTransformerTokenizer(
+        vocab_file=os.path.join(DATA_DIR, "wordpiece/vocab.txt"),
+        word_tokenizer_type="sudachi",
+    ).tokenize_batch(texts)
+    for _ in range(2):
+        tokenizer = JapaneseTransformerTokenizer(
+            vocab_file=os.path.join(DATA_DIR, "wordpiece/vocab.txt"),
+            word_tokenizer_type="sudachi",
+            word_cache_path=cache_path,
+        )
+        assert tokenizer.tokenize_batch(texts) == expected
+        unpickled = pickle.loads(pickle.dumps(tokenizer))
+        assert unpickled.tokenize_batch(texts) == expected
+
+
+@pytest.mark.parametrize(
+    "subword_tokenizer_type, vocab_file",
+    [
+        ("wordpiece", "wordpiece/vocab.txt"),
+        ("character", "character/vocab.txt"),
+        ("sentencepiece", "sentencepiece/spiece.model"),
+    ],
+)
+def test_japanesetransformertokenizer_compact_vocab(
+    tmp_path, subword_tokenizer_type: str, vocab_file: str
+) -> None:
+    kwargs = dict(
+        vocab_file=os.path.join(DATA_DIR, vocab_file),
+        word_tokenizer_type="mecab",
+        subword_tokenizer_type=subword_tokenizer_type,
+    )
+    tokenizer = JapaneseTransformerTokenizer(**kwargs)
+    compact_tokenizer = JapaneseTransformerTokenizer(
+        compact_vocab_file=os.path.join(tmp_path, "vocab.bin"), **kwargs
+    )
+    texts: List[str] = ["外国人参政権", "今日はｲｲ天気ですね。[SEP]"]
+    encodings = tokenizer(texts)
+    assert compact_tokenizer(texts) == encodings
+    assert compact_tokenizer.get_vocab() == tokenizer.get_vocab()
+    assert dict(compact_tokenizer.ids_to_tokens) == dict(tokenizer.ids_to_tokens)
+    assert compact_tokenizer.batch_decode(
+        encodings["input_ids"]
+    ) == tokenizer.batch_decode(encodings["input_ids"])
+    unpickled = pickle.loads(pickle.dumps(compact_tokenizer))
+    assert unpickled.vocab.path == compact_tokenizer.vocab.path
+    assert unpickled(texts) == encodings
+
+
+def test_japanesetransformertokenizer_subword_cache(tmp_path) -> None:
+    vocab_file: str = os.path.join(DATA_DIR, "wordpiece/vocab.txt")
+    cache_file: str = os.path.join(tmp_path, "subword_cache.json")
+    tokenizer = JapaneseTransformerTokenizer(
+        vocab_file=vocab_file, word_tokenizer_type="mecab"
+    )
+    cached_tokenizer = JapaneseTransformerTokenizer(
+        vocab_file=vocab_file, word_tokenizer_type="mecab", subword_cache_size=100
+    )
+    texts: List[str] = ["今日も晴れです。", "明日も晴れです。"]
+    for text in texts:
+        assert cached_tokenizer.tokenize(text) == tokenizer.tokenize(text)
+    info = cached_tokenizer.subword_cache.cache_info()
+    assert info["hits"] == 4
+    assert info["misses"] == 6
+    cached_tokenizer.save_subword_cache(cache_file)
+
+    warm_tokenizer = JapaneseTransformerTokenizer(
+        vocab_file=vocab_file,
+        word_tokenizer_type="mecab",
+        subword_cache_size=100,
+        subword_cache_file=cache_file,
+    )
+    assert len(warm_tokenizer.subword_cache) == 6
+    assert warm_tokenizer.tokenize(texts[0]) == tokenizer.tokenize(texts[0])
+    assert warm_tokenizer.subword_cache.misses == 0
+
+
+@pytest.mark.parametrize(
+    "word_tokenizer_type, subword_tokenizer_type, vocab_file, kwargs",
+    [
+        ("mecab", "wordpiece", "wordpiece/vocab.txt", {"do_lower_case": True}),
+        ("mecab", "character", "character/vocab.txt", {}),
+        ("sudachi", "sentencepiece", "sentencepiece/spiece.model", {}),
+        (
+            "mecab",
+            "sentencepiece",
+            "sentencepiece/spiece.model",
+            {"do_subword_by_word": False},
+        ),
+        (
+            "none",
+            "sentencepiece",
+            "sentencepiece/spiece.model",
+            {"do_word_tokenize": False},
+        ),
+    ],
+)
+def test_japanesetransformertokenizer_offsets(
+    word_tokenizer_type: str, subword_tokenizer_type: str, vocab_file: str, kwargs
+) -> None:
+    tokenizer = JapaneseTransformerTokenizer(
+        vocab_file=os.path.join(DATA_DIR, vocab_file),
+        word_tokenizer_type=word_tokenizer_type,
+        subword_tokenizer_type=subword_tokenizer_type,
+        **kwargs,
+    )
+    text: str = "今日はｲｲ天気ですね。[SEP] ＡＢＣ abc ｶﾞｷﾞ㍻"
+    tokens, offsets = tokenizer.tokenize_with_offsets(text)
+    assert tokens == tokenizer.tokenize(text)
+    surfaces: List[str] = [text[start:end] for start, end in offsets]
+    assert surfaces[0].startswith("今")
+    assert surfaces[tokens.index("[SEP]")] == "[SEP]"
+    assert surfaces[-1] == "㍻"
+    assert "".join(text[start:end] for start, end in dict.fromkeys(offsets)) == (
+        text.replace(" ", "")
+    )
+
+    texts: List[str] = ["外国人参政権", "今日はｲｲ天気ですね。"]
+    encoding = tokenizer(
+        texts,
+        texts[::-1],
+        return_offsets_mapping=True,
+        padding="max_length",
+        truncation=True,
+        max_length=12,
+    )
+    for ids, offsets in zip(encoding["input_ids"], encoding["offset_mapping"]):
+        assert len(ids) == len(offsets) == 12
+        for token, offset in zip(tokenizer.convert_ids_to_tokens(ids), offsets):
+            if token in tokenizer.all_special_tokens:
+                assert offset == (0, 0)
+    single = tokenizer(texts[0], return_offsets_mapping=True)
+    assert single["input_ids"] == tokenizer(texts[0])["input_ids"]
+    assert (
+        single["offset_mapping"][1:-1] == tokenizer.tokenize_with_offsets(texts[0])[1]
+    )
+
+
+def test_japanesetransformertokenizer_offsets_zero_width_end() -> None:
+    tokenizer = JapaneseTransformerTokenizer(
+        vocab_file=os.path.join(DATA_DIR, "sentencepiece/spiece.model"),
+        word_tokenizer_type="none",
+        subword_tokenizer_type="sentencepiece",
+        do_word_tokenize=False,
+    )
+    # "ﬁ" is normalized into "fi", and the last token (the combining accent) has no span
+    text: str = "ﬁ\u0301"
+    tokens, offsets = tokenizer.tokenize_with_offsets(text)
+    assert tokens == tokenizer.tokenize(text)
+    assert offsets[-1] == (len(text), len(text))
+    encoding = tokenizer(text, return_offsets_mapping=True)
+    assert encoding["offset_mapping"][1:-1] == offsets
+
+
+def test_japanesetransformertokenizer_offsets_same_as_fast() -> None:
+    tokenizer = JapaneseTransformerTokenizer(
+        vocab_file=os.path.join(DATA_DIR, "wordpiece/vocab.txt"),
+        word_tokenizer_type="mecab",
+    )
+    texts: List[str] = ["今日はｲｲ天気ですね。", "ＡＢＣ abc [SEP] ①"]
+    assert (
+        tokenizer(texts, return_offsets_mapping=True)["offset_mapping"]
+        == tokenizer.to_fast()(texts, return_offsets_mapping=True)["offset_mapping"]
+    )
+
+
 @pytest.mark.parametrize(
     "tokenizer_class, vocab_dir, word_tokenizer_type, expectation",
     [
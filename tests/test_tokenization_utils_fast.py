@@ -0,0 +1,152 @@
+import io
+import os
+import pickle
+from typing import List
+
+import pytest
+
+from src.jptranstokenizer.tokenization_utils import JapaneseTransformerTokenizer
+from src.jptranstokenizer.tokenization_utils_fast import (
+    JapaneseTransformerTokenizerFast,
+)
+
+DATA_DIR: str = os.path.join(os.path.dirname(__file__), "data")
+TEXTS: List[str] = [
+    "外国人参政権",
+    "今日はいい天気ですね。ＡＢＣ abc",
+    "吾輩は猫である。[SEP]名前はまだ無い。",
+    "1,000円です",
+    "  空白  あり ",
+]
+
+
+@pytest.mark.parametrize(
+    "vocab_file, word_tokenizer_type, subword_tokenizer_type, kwargs",
+    [
+        ("wordpiece/vocab.txt", "mecab", "wordpiece", {}),
+        ("wordpiece/vocab.txt", "mecab", "wordpiece", {"do_lower_case": True}),
+        ("character/vocab.txt", "mecab", "character", {}),
+        ("wordpiece/vocab.txt", "basic", "wordpiece", {}),
+        ("wordpiece/vocab.txt", "sudachi", "wordpiece", {}),
+        ("sentencepiece/spiece.model", "sudachi", "sentencepiece", {}),
+        (
+            "sentencepiece/spiece.model",
+            "mecab",
+            "sentencepiece",
+            {"do_subword_by_word": False},
+        ),
+        ("sentencepiece/spiece.model", "none", "sentencepiece", {}),
+        (
+            "sentencepiece/spiece.model",
+            "",
+            "sentencepiece",
+            {"do_word_tokenize": False},
+        ),
+    ],
+)
+def test_to_fast(
+    vocab_file: str, word_tokenizer_type: str, subword_tokenizer_type: str, kwargs
+) -> None:
+    slow = JapaneseTransformerTokenizer(
+        vocab_file=os.path.join(DATA_DIR, vocab_file),
+        word_tokenizer_type=word_tokenizer_type,
+        subword_tokenizer_type=subword_tokenizer_type,
+        **kwargs,
+    )
+    fast = slow.to_fast()
+    assert isinstance(fast, JapaneseTransformerTokenizerFast)
+    for text in TEXTS:
+        assert fast.tokenize(text) == slow.tokenize(text)
+    expected = slow(TEXTS[:3], TEXTS[2:], padding=True)
+    assert dict(fast(TEXTS[:3], TEXTS[2:], padding=True)) == dict(expected)
+    assert dict(fast(TEXTS, truncation=True, max_length=6)) == dict(
+        slow(TEXTS, truncation=True, max_length=6)
+    )
+    for ids in expected["input_ids"]:
+        assert fast.decode(ids) == slow.decode(ids)
+        assert fast.decode(ids, skip_special_tokens=True) == slow.decode(
+            ids, skip_special_tokens=True
+        )
+
+
+def test_to_fast_bpe(tmp_path) -> None:
+    sentencepiece = pytest.importorskip("sentencepiece")
+    model = io.BytesIO()
+    sentencepiece.SentencePieceTrainer.train(
+        sentence_iterator=iter(TEXTS * 20),
+        model_writer=model,
+        model_type="bpe",
+        # Pieces such as "1," can't be converted
+        user_defined_symbols=[","],
+        vocab_size=60,
+        character_coverage=1.0,
+    )
+    vocab_file = tmp_path / "spiece.model"
+    vocab_file.write_bytes(model.getvalue())
+    slow = JapaneseTransformerTokenizer(
+        vocab_file=str(vocab_file),
+        word_tokenizer_type="mecab",
+        subword_tokenizer_type="sentencepiece",
+    )
+    fast = slow.to_fast()
+    for text in TEXTS:
+        assert fast.tokenize(text) == slow.tokenize(text)
+
+
+def test_to_fast_digit_comma(tmp_path) -> None:
+    sentencepiece = pytest.importorskip("sentencepiece")
+    model = io.BytesIO()
+    sentencepiece.SentencePieceTrainer.train(
+        sentence_iterator=iter(
+            [f"約{i * 7919 % 1000},{i % 1000:03d}人と{i % 99}," for i in range(3000)]
+        ),
+        model_writer=model,
+        vocab_size=150,
+        hard_vocab_limit=False,
+        character_coverage=1.0,
+    )
+    vocab_file = tmp_path / "spiece.model"
+    vocab_file.write_bytes(model.getvalue())
+    slow = JapaneseTransformerTokenizer(
+        vocab_file=str(vocab_file),
+        word_tokenizer_type="none",
+        subword_tokenizer_type="sentencepiece",
+    )
+    # The comma is split from pieces such as "86," only in the slow tokenizer
+    assert any(piece[-2:-1].isdigit() and piece[-1] == "," for piece in slow.vocab)
+    with pytest.raises(NotImplementedError):
+        slow.to_fast()
+
+
+@pytest.fixture(scope="module")
+def fast_tokenizer() -> JapaneseTransformerTokenizerFast:
+    return JapaneseTransformerTokenizerFast.from_pretrained(
+        os.path.join(DATA_DIR, "sentencepiece/"),
+        tokenizer_class="AlbertTokenizer",
+        word_tokenizer_type="sudachi",
+    )
+
+
+def test_fast_offsets(fast_tokenizer: JapaneseTransformerTokenizerFast) -> None:
+    text: str = "今日はいい天気ですね。ＡＢＣ"
+    encoding = fast_tokenizer(text, return_offsets_mapping=True)
+    tokens: List[str] = fast_tokenizer.convert_ids_to_tokens(encoding["input_ids"])
+    for token, (start, end) in zip(tokens, encoding["offset_mapping"]):
+        if token in fast_tokenizer.all_special_tokens:
+            assert start == end == 0
+        else:
+            assert token.lstrip("▁") == text[start:end].replace("ＡＢＣ", "ABC")
+
+
+def test_fast_pickle(fast_tokenizer: JapaneseTransformerTokenizerFast) -> None:
+    restored = pickle.loads(pickle.dumps(fast_tokenizer))
+    assert restored(TEXTS)["input_ids"] == fast_tokenizer(TEXTS)["input_ids"]
+
+
+def test_fast_save_pretrained(
+    fast_tokenizer: JapaneseTransformerTokenizerFast, tmp_path
+) -> None:
+    fast_tokenizer.save_pretrained(str(tmp_path))
+    loaded = JapaneseTransformerTokenizerFast.from_pretrained(str(tmp_path))
+    assert loaded.word_tokenizer_type == "sudachi"
+    assert loaded(TEXTS)["input_ids"] == fast_tokenizer(TEXTS)["input_ids"]